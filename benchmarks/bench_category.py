@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 카테고리 분류 처리량 비교: 예전 if/elif + any() 방식 vs 컴파일한 분류기 (초당 상품명 수)
+#
+# 사용법: python benchmarks/bench_category.py --count 1000000
+#         python benchmarks/bench_category.py --titles titles.txt --taxonomy taxonomy.json
+# - 기본 분류표에서는 두 방식의 결과가 모두 같은지도 확인합니다
+# - --extended: 키워드가 많은 분류표(카테고리 40개 x 키워드 15개)로도 비교
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'zigzag'))
+from zigzag_category import DEFAULT_CATEGORY, DEFAULT_TAXONOMY, CategoryClassifier, load_taxonomy
+
+DEFAULT_COUNT = 200000
+FILLER_WORDS = [
+    '여성', '남성', '오버핏', '루즈핏', '데일리', '린넨', '코튼', '니트', '봄', '여름', '가을', '겨울',
+    '베이직', '빈티지', '스트라이프', '체크', '와이드', '슬림', '크롭', '롱', 'basic', 'oversize', '1+1', '[당일출고]',
+]
+
+
+def legacy_guess(title):
+    """예전 guess_category_from_title (기준)"""
+    title_lower = title.lower()
+    if any(word in title_lower for word in ['셔츠', '블라우스', 'shirt']):
+        return '의류-상의'
+    elif any(word in title_lower for word in ['바지', '팬츠', 'pants']):
+        return '의류-하의'
+    elif any(word in title_lower for word in ['신발', 'shoes']):
+        return '신발'
+    elif any(word in title_lower for word in ['가방', 'bag']):
+        return '가방'
+    else:
+        return '기타'
+
+
+def chain_classifier(taxonomy):
+    """분류표를 예전 방식(카테고리마다 any() 검사)으로 돌리는 함수"""
+    entries = [(entry['category'], [word.lower() for word in entry['keywords']]) for entry in taxonomy]
+
+    def classify(title):
+        title_lower = title.lower()
+        for category, words in entries:
+            if any(word in title_lower for word in words):
+                return category
+        return DEFAULT_CATEGORY
+    return classify
+
+
+def extended_taxonomy(categories=40, keywords=15, seed=7):
+    rng = random.Random(seed)
+    syllables = '가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허'
+    taxonomy = []
+    for c in range(categories):
+        words = {''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(keywords)}
+        taxonomy.append({'category': f'카테고리-{c:02d}', 'keywords': sorted(words)})
+    return taxonomy
+
+
+def synthetic_titles(count, taxonomy, seed=42):
+    """분류표 키워드를 섞은 가짜 상품명 (30% 는 키워드 없음)"""
+    rng = random.Random(seed)
+    keywords = [word for entry in taxonomy for word in entry['keywords']]
+    titles = []
+    for _ in range(count):
+        words = rng.sample(FILLER_WORDS, rng.randint(3, 7))
+        if rng.random() < 0.7:
+            for _ in range(rng.randint(1, 2)):
+                words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        titles.append(' '.join(words))
+    return titles
+
+
+def measure(classify_many, titles):
+    started = time.perf_counter()
+    results = classify_many(titles)
+    elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+def compare(label, taxonomy, titles, baseline=None):
+    baseline = baseline or chain_classifier(taxonomy)
+    classifier = CategoryClassifier(taxonomy)
+    expected, chain_sec = measure(lambda items: [baseline(title) for title in items], titles)
+    actual, compiled_sec = measure(classifier.classify_many, titles)
+    mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+    row = {
+        'taxonomy': label,
+        'keywords': len(classifier.keyword_priority),
+        'titles': len(titles),
+        'chain_titles_per_sec': round(len(titles) / chain_sec),
+        'compiled_titles_per_sec': round(len(titles) / compiled_sec),
+        'speedup': round(chain_sec / compiled_sec, 2),
+        'mismatches': mismatches,
+    }
+    print(f"{label:<10}{row['keywords']:>8}{row['titles']:>10}{row['chain_titles_per_sec']:>14,}"
+          f"{row['compiled_titles_per_sec']:>14,}{row['speedup']:>8.2f}x{mismatches:>8}")
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카테고리 분류 처리량 비교")
+    parser.add_argument('--count', type=int, default=DEFAULT_COUNT, help="가짜 상품명 개수")
+    parser.add_argument('--titles', help="상품명 파일 (한 줄에 하나, 주면 가짜 상품명 대신 사용)")
+    parser.add_argument('--taxonomy', help="분류표 JSON (주면 기본 분류표 대신 사용)")
+    parser.add_argument('--extended', action='store_true', help="키워드가 많은 분류표로도 비교")
+    parser.add_argument('--save', help="결과를 JSON으로 저장")
+    args = parser.parse_args()
+
+    taxonomy = load_taxonomy(args.taxonomy) if args.taxonomy else DEFAULT_TAXONOMY
+    if args.titles:
+        with open(args.titles, encoding='utf-8') as f:
+            titles = [line.strip() for line in f if line.strip()]
+    else:
+        titles = synthetic_titles(args.count, taxonomy)
+
+    print(f"{'분류표':<10}{'키워드':>8}{'상품명':>10}{'예전(개/초)':>14}{'컴파일(개/초)':>14}{'배':>9}{'불일치':>8}")
+    rows = [compare('custom' if args.taxonomy else 'default', taxonomy, titles,
+                    None if args.taxonomy else legacy_guess)]
+    if args.extended:
+        big = extended_taxonomy()
+        rows.append(compare('extended', big, synthetic_titles(len(titles), big)))
+
+    if any(row['mismatches'] for row in rows):
+        print("❌ 예전 방식과 결과가 다른 상품명이 있습니다")
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.save}")
+    return 1 if any(row['mismatches'] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
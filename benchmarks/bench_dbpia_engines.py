@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# DBPIA 상세 수집 엔진 비교: Selenium 스레드 풀 vs asyncio + Playwright 컨텍스트
+#
+# 사용법: python benchmarks/bench_dbpia_engines.py --query "패션" --limit 64 [--levels 4 16 32]
+#         python benchmarks/bench_dbpia_engines.py --links links.txt
+# 동시 페이지 수별로 두 엔진의 처리량(논문/초)과 최대 메모리(크롬 포함)를 측정합니다.
+# 메모리는 psutil 이 있어야 크롬 자식 프로세스까지 정확히 잽니다.
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 저장소 루트
+from playwright.async_api import async_playwright
+
+from dbpia import iter_paper_details
+from dbpia_async import iter_paper_details_async
+from dbpia_browser import BrowserPool, PeakRssSampler, psutil
+from dbpia_fast import create_http_pool, fetch_html
+from dbpia_pagination import collect_search_links
+from dbpia_parser import FAILED_TEXT
+
+DEFAULT_LEVELS = [4, 16, 32]
+DEFAULT_LIMIT = 64
+
+
+def load_links(args):
+    if args.links:
+        with open(args.links, encoding='utf-8') as f:
+            links = [line.strip() for line in f if line.strip()]
+    else:
+        http = create_http_pool()
+        links = collect_search_links(args.query, lambda url: fetch_html(http, url))
+    return links[:args.limit]
+
+
+def summarize(engine, level, results, elapsed, peak_bytes):
+    failed = sum(1 for paper in results if paper['제목'] == FAILED_TEXT)
+    return {
+        'engine': engine,
+        'concurrency': level,
+        'papers': len(results),
+        'failed': failed,
+        'elapsed_sec': round(elapsed, 2),
+        'papers_per_sec': round(len(results) / elapsed, 3) if elapsed > 0 else 0.0,
+        'peak_rss_mb': round(peak_bytes / 1024 / 1024, 1),
+    }
+
+
+def run_thread_engine(link_data_list, level):
+    """Selenium: 스레드마다 크롬 프로세스 하나"""
+    pool = BrowserPool(level)
+    sampler = PeakRssSampler(interval=0.2).start()
+    started = time.perf_counter()
+    try:
+        results = list(iter_paper_details(link_data_list, level, pool))
+    finally:
+        pool.close()
+    elapsed = time.perf_counter() - started
+    return summarize('selenium-threads', level, results, elapsed, sampler.stop())
+
+
+async def run_async_engine(link_data_list, level):
+    """Playwright: 크롬 하나에 컨텍스트 여러 개"""
+    sampler = PeakRssSampler(interval=0.2).start()
+    started = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            results = [paper async for paper in iter_paper_details_async(browser, link_data_list, level)]
+        finally:
+            await browser.close()
+    elapsed = time.perf_counter() - started
+    return summarize('playwright-contexts', level, results, elapsed, sampler.stop())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DBPIA 엔진 처리량/메모리 비교")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--query', help="검색어 (검색 결과 링크 사용)")
+    source.add_argument('--links', help="논문 링크 파일 (한 줄에 하나)")
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help="측정에 쓸 논문 수")
+    parser.add_argument('--levels', type=int, nargs='+', default=DEFAULT_LEVELS, help="동시 페이지 수")
+    parser.add_argument('--save', help="결과를 JSON으로 저장")
+    args = parser.parse_args()
+
+    if psutil is None:
+        print("⚠️ psutil 이 없어 메모리는 ru_maxrss(누적 최대값)로만 표시됩니다.")
+
+    links = load_links(args)
+    if not links:
+        print("❌ 측정할 링크가 없습니다.")
+        return 1
+    link_data_list = [(link, idx) for idx, link in enumerate(links, 1)]
+    print(f"📄 논문 {len(link_data_list)}개로 측정 (동시 페이지 {args.levels})")
+
+    rows = []
+    for level in args.levels:
+        rows.append(run_thread_engine(link_data_list, level))
+        rows.append(asyncio.run(run_async_engine(link_data_list, level)))
+
+    print(f"\n{'엔진':<22}{'동시':>6}{'논문/초':>10}{'시간(초)':>10}{'실패':>6}{'최대 메모리(MB)':>16}")
+    for row in rows:
+        print(f"{row['engine']:<22}{row['concurrency']:>6}{row['papers_per_sec']:>10.2f}"
+              f"{row['elapsed_sec']:>10.1f}{row['failed']:>6}{row['peak_rss_mb']:>16.1f}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.save}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# DBPIA 상세 페이지 파서 오프라인 벤치마크 (사이트 접속 없음)
+#
+# 사용법: python benchmarks/bench_dbpia_parser.py [--iterations 200] [--save 결과.json] [--baseline 이전.json]
+# - fixtures/dbpia/*.html 을 extract_paper_record 로 파싱
+# - 같은 이름의 .expected.json 이 있으면 결과가 맞는지 먼저 확인
+# - 초당 처리 레코드 수, 단계/필드별 비용, 메모리 할당 횟수를 출력
+# - --baseline 과 비교해서 허용치보다 느려지면 종료 코드 1
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 저장소 루트
+from dbpia_parser import (
+    FIELD_EXTRACTORS, collect_class_texts, extract_paper_record, fields_from_json_ld,
+    needed_classes, parse_json_ld,
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'dbpia')
+DEFAULT_ITERATIONS = 200
+REGRESSION_TOLERANCE = 0.20  # 기준보다 20% 넘게 느려지면 회귀로 판단
+MIN_STAGE_US = 5.0  # 이보다 짧은 단계는 측정 오차가 커서 비교하지 않음
+
+
+def load_corpus(fixture_dir):
+    """(이름, HTML, 기대 결과 또는 None) 목록"""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '*.html'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        expected = None
+        expected_path = os.path.join(fixture_dir, name + '.expected.json')
+        if os.path.exists(expected_path):
+            with open(expected_path, encoding='utf-8') as f:
+                expected = json.load(f)
+        corpus.append((name, html, expected))
+    return corpus
+
+
+def check_corpus(corpus):
+    """기대 결과와 다른 필드 목록 [(페이지, 필드, 기대값, 실제값)]"""
+    mismatches = []
+    for name, html, expected in corpus:
+        if expected is None:
+            continue
+        record = extract_paper_record(html, name, 1)
+        for field, value in expected.items():
+            if record.get(field) != value:
+                mismatches.append((name, field, value, record.get(field)))
+    return mismatches
+
+
+def time_call(func, iterations):
+    """함수 한 번 호출에 걸리는 평균 시간 (마이크로초)"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def measure_throughput(corpus, iterations):
+    """전체 코퍼스 반복 파싱 → 초당 레코드 수"""
+    started = time.perf_counter()
+    count = 0
+    for _ in range(iterations):
+        for name, html, _expected in corpus:
+            extract_paper_record(html, name, 1)
+            count += 1
+    elapsed = time.perf_counter() - started
+    return count / elapsed if elapsed > 0 else 0.0
+
+
+def measure_stage_costs(corpus, iterations):
+    """단계/필드별 평균 비용 (마이크로초, 코퍼스 평균)"""
+    costs = {}
+    for name, html, _expected in corpus:
+        json_ld = parse_json_ld(html)
+        fields = fields_from_json_ld(json_ld)
+        classes = needed_classes(fields)
+        texts = collect_class_texts(html, classes)
+        stage_costs = {
+            'parse_json_ld': time_call(lambda: parse_json_ld(html), iterations),
+            'fields_from_json_ld': time_call(lambda: fields_from_json_ld(json_ld), iterations),
+            'collect_class_texts': time_call(lambda: collect_class_texts(html, classes), iterations),
+        }
+        for field, extractor in FIELD_EXTRACTORS:
+            stage_costs[f'field:{field}'] = time_call(lambda: extractor(fields, texts), iterations)
+        for stage, value in stage_costs.items():
+            costs.setdefault(stage, []).append(value)
+    return {stage: sum(values) / len(values) for stage, values in costs.items()}
+
+
+def measure_allocations(corpus):
+    """레코드 하나 만들 때 메모리 할당 횟수/최대 사용량 (코퍼스 평균)"""
+    blocks = []
+    peaks = []
+    for name, html, _expected in corpus:
+        extract_paper_record(html, name, 1)  # 첫 호출의 캐시(정규식 등) 제외
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        record = extract_paper_record(html, name, 1)
+        after = tracemalloc.take_snapshot()
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats = after.compare_to(before, 'filename')
+        blocks.append(sum(max(stat.count_diff, 0) for stat in stats))
+        peaks.append(peak)
+        del record
+    return {
+        'alloc_blocks_per_record': sum(blocks) / len(blocks),
+        'peak_bytes_per_record': sum(peaks) / len(peaks),
+    }
+
+
+def compare_with_baseline(result, baseline_path, tolerance):
+    """기준 결과와 비교해서 회귀 항목 목록 반환"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = []
+    if result['records_per_sec'] < baseline['records_per_sec'] * (1 - tolerance):
+        regressions.append(f"records/sec {baseline['records_per_sec']:.0f} → {result['records_per_sec']:.0f}")
+    for stage, cost in result['stage_cost_us'].items():
+        base = baseline.get('stage_cost_us', {}).get(stage)
+        if base and base >= MIN_STAGE_US and cost > base * (1 + tolerance):
+            regressions.append(f"{stage} {base:.1f}µs → {cost:.1f}µs")
+    base_blocks = baseline.get('alloc_blocks_per_record')
+    if base_blocks and result['alloc_blocks_per_record'] > base_blocks * (1 + tolerance):
+        regressions.append(f"할당 {base_blocks:.0f} → {result['alloc_blocks_per_record']:.0f} blocks")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DBPIA 파서 오프라인 벤치마크")
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help="저장된 상세 페이지 폴더")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS, help="반복 횟수")
+    parser.add_argument('--save', help="결과를 JSON으로 저장 (다음 비교의 기준)")
+    parser.add_argument('--baseline', help="비교할 이전 결과 JSON")
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE, help="허용 성능 저하 비율")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.fixtures)
+    if not corpus:
+        print(f"❌ 페이지가 없습니다: {args.fixtures}")
+        return 1
+    total_kb = sum(len(html.encode('utf-8')) for _name, html, _expected in corpus) / 1024
+    print(f"📂 페이지 {len(corpus)}개 ({total_kb:.0f} KB), 반복 {args.iterations}회")
+
+    mismatches = check_corpus(corpus)
+    for name, field, expected, actual in mismatches:
+        print(f"❌ {name}: {field} 기대 {expected!r} / 실제 {actual!r}")
+
+    result = {
+        'pages': len(corpus),
+        'iterations': args.iterations,
+        'records_per_sec': measure_throughput(corpus, args.iterations),
+        'stage_cost_us': measure_stage_costs(corpus, args.iterations),
+    }
+    result.update(measure_allocations(corpus))
+
+    print(f"⚡ 처리 속도: {result['records_per_sec']:.0f} 레코드/초")
+    print("⏱️ 단계/필드별 평균 비용:")
+    for stage, cost in sorted(result['stage_cost_us'].items(), key=lambda item: -item[1]):
+        print(f"   {stage:<24} {cost:10.1f} µs")
+    print(f"🧠 레코드당 할당: {result['alloc_blocks_per_record']:.0f} blocks, 최대 {result['peak_bytes_per_record'] / 1024:.1f} KB")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.save}")
+
+    regressions = []
+    if args.baseline:
+        regressions = compare_with_baseline(result, args.baseline, args.tolerance)
+        for item in regressions:
+            print(f"🐢 성능 저하: {item}")
+        if not regressions:
+            print("✅ 기준 대비 성능 저하 없음")
+
+    return 1 if mismatches or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 재생 서버로 크롤러 전체를 돌려서 처리량/지연/메모리 비교 (실제 사이트에 요청하지 않음)
+#
+# 사용법: python benchmarks/record_replay.py dbpia --query 인공지능      # 먼저 한 번 녹화
+#         python benchmarks/record_replay.py zigzag https://zigzag.kr/catalog/products/150012796
+#         python benchmarks/bench_e2e.py --latency 0.05 --jitter 0.02 --error-rate 0.02
+#         python benchmarks/bench_e2e.py --crawlers zigzag_text --products 5 --save e2e.json
+# - 재생 서버(replay_server)를 같은 프로세스에서 띄우고, 크롤러마다 새 프로세스(빈 임시 폴더)에서
+#   CRAWLER_REPLAY_URL 을 주고 실행합니다. (캐시/워터마크/작업 기록이 다른 실행에 섞이지 않음)
+#   - dbpia: crawl_dbpia_papers (녹화한 검색어, 작업 기록 없이)
+#   - zigzag_img: crawl_zigzag_review_images, zigzag_text: complete_crawl (녹화한 상품마다 한 번씩)
+# - 초당 항목 수(논문 / 후기 이미지 / 리뷰), 지연 p50/p99, 최대 메모리, 재생 서버 요청/누락/넣은 오류 수를 보여 줍니다.
+#   지연은 dbpia 는 논문 페이지 로딩 단계(브라우저면 navigation, --dbpia-fast 면 http_fetch), 지그재그는 상품 하나 전체 시간입니다.
+#   메모리는 psutil 이 있으면 크롬을 포함한 프로세스 트리 합계, 없으면 ru_maxrss 입니다.
+# - 크롤러 출력은 --log-dir 아래 <크롤러>.log 에 남습니다.
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)  # 저장소 루트 (common, dbpia_*)
+sys.path.append(os.path.join(ROOT, 'zigzag'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from common.metrics import LatencyHistogram
+from common.replay import REPLAY_ENV
+from replay_server import DEFAULT_ARCHIVE, ReplayArchive, ReplayServer, start_replay
+
+CRAWLERS = ('dbpia', 'zigzag_img', 'zigzag_text')
+ITEM_NAMES = {'dbpia': '논문', 'zigzag_img': '이미지', 'zigzag_text': '리뷰'}
+DEFAULT_PRODUCTS = 10  # 지그재그는 녹화한 상품 중 앞에서부터 몇 개
+DEFAULT_LOG_DIR = 'data/replay/logs'
+CHILD_TIMEOUT_SEC = 1800
+
+
+def run_dbpia(query, fast):
+    from dbpia import crawl_dbpia_papers
+
+    metrics_path = os.path.abspath('metrics_dbpia.json')
+    _filename, papers = crawl_dbpia_papers(fast=fast, output_format='jsonl', journal_path=None,
+                                           metrics_path=metrics_path, search_word=query)
+    stages = {}
+    if os.path.exists(metrics_path):  # 검색 결과가 없으면 요약 없이 끝남
+        with open(metrics_path, encoding='utf-8') as f:
+            stages = json.load(f)['stages']
+    stage = 'http_fetch' if fast else 'navigation'
+    latency = stages.get(stage, LatencyHistogram().summary())
+    failures = 0 if papers else 1
+    return len(papers), failures, latency, stage
+
+
+def run_zigzag(name, product_urls):
+    from zigzag_img import crawl_zigzag_review_images
+    from zigzag_text import complete_crawl
+
+    items = failures = 0
+    latencies = LatencyHistogram()
+    for i, product_url in enumerate(product_urls):
+        metrics_path = os.path.abspath(f'metrics_{name}_{i}.json')
+        started = time.perf_counter()
+        try:
+            if name == 'zigzag_img':
+                result = asyncio.run(crawl_zigzag_review_images(product_url, metrics_path=metrics_path))
+                items += result['imageCount']
+            else:
+                result = asyncio.run(complete_crawl(product_url, metrics_path=metrics_path))
+                items += result['reviewCount']
+        except Exception as e:
+            failures += 1
+            print(f"❌ {product_url}: {e}")
+        latencies.observe(time.perf_counter() - started)
+    return items, failures, latencies.summary(), 'product'
+
+
+def run_child(name, archive_path, result_path, products, dbpia_fast):
+    """(자식 프로세스) 크롤러 하나 실행 → result_path 에 결과 JSON"""
+    from dbpia_browser import PeakRssSampler
+
+    archive = ReplayArchive(archive_path)
+    query = archive.get_meta('dbpia_query')
+    product_urls = archive.get_meta('zigzag_products', [])[:products]
+    archive.close()
+
+    sampler = PeakRssSampler().start()
+    started = time.perf_counter()
+    if name == 'dbpia':
+        if not query:
+            raise SystemExit("녹화 파일에 DBPIA 검색어가 없습니다 (record_replay.py dbpia 로 녹화)")
+        items, failures, latency, latency_of = run_dbpia(query, dbpia_fast)
+    else:
+        if not product_urls:
+            raise SystemExit("녹화 파일에 지그재그 상품이 없습니다 (record_replay.py zigzag 로 녹화)")
+        items, failures, latency, latency_of = run_zigzag(name, product_urls)
+    elapsed = time.perf_counter() - started
+    peak_bytes = sampler.stop()
+
+    result = {
+        'crawler': name,
+        'items': items,
+        'failures': failures,
+        'elapsed_sec': round(elapsed, 3),
+        'items_per_sec': round(items / elapsed, 2) if elapsed > 0 else 0.0,
+        'latency_of': latency_of,
+        'p50_sec': latency['p50_sec'],
+        'p99_sec': latency['p99_sec'],
+        'peak_rss_mb': round(peak_bytes / 1024 / 1024, 1) if peak_bytes else None,
+    }
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False)
+
+
+async def bench_crawler(name, server, base, args):
+    """크롤러 하나를 새 프로세스로 실행하고 결과 + 재생 서버 통계 반환"""
+    server.reset()
+    os.makedirs(args.log_dir, exist_ok=True)
+    log_path = os.path.join(args.log_dir, f'{name}.log')
+    with tempfile.TemporaryDirectory(prefix=f'bench_e2e_{name}_') as workdir:
+        result_path = os.path.join(workdir, 'result.json')
+        command = [sys.executable, os.path.abspath(__file__), '--child', name, '--archive', args.archive,
+                   '--result', result_path, '--products', str(args.products)]
+        if args.dbpia_fast:
+            command.append('--dbpia-fast')
+        with open(log_path, 'w', encoding='utf-8') as log:
+            process = await asyncio.create_subprocess_exec(
+                *command, cwd=workdir, env=dict(os.environ, **{REPLAY_ENV: base}),
+                stdin=asyncio.subprocess.DEVNULL, stdout=log, stderr=asyncio.subprocess.STDOUT)
+            try:
+                exit_code = await asyncio.wait_for(process.wait(), CHILD_TIMEOUT_SEC)
+            except asyncio.TimeoutError:
+                process.kill()
+                exit_code = await process.wait()
+        if os.path.exists(result_path):
+            with open(result_path, encoding='utf-8') as f:
+                row = json.load(f)
+        else:
+            row = {'crawler': name, 'items': 0, 'failures': None, 'elapsed_sec': None, 'items_per_sec': 0.0,
+                   'latency_of': None, 'p50_sec': None, 'p99_sec': None, 'peak_rss_mb': None}
+    row['exit_code'] = exit_code
+    row['log'] = log_path
+    row['server'] = server.stats()
+    return row
+
+
+async def run_all(args):
+    archive = ReplayArchive(args.archive)
+    server = ReplayServer(archive, args.latency, args.jitter, args.error_rate, args.error_status, args.seed)
+    runner, base = await start_replay(server)
+    summary = archive.summary()
+    print(f"📼 재생 서버 {base} (응답 {summary['responses']}개, 지연 {args.latency}±{args.jitter}초, "
+          f"오류 {args.error_rate * 100:.0f}%)")
+    rows = []
+    try:
+        for name in args.crawlers:
+            print(f"🚀 {name} 실행 중... (로그: {os.path.join(args.log_dir, name + '.log')})")
+            rows.append(await bench_crawler(name, server, base, args))
+    finally:
+        await runner.cleanup()
+        archive.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="재생 서버로 크롤러 전체 성능 비교")
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE, help="녹화 파일 (record_replay.py 로 만듦)")
+    parser.add_argument('--crawlers', nargs='+', choices=CRAWLERS, default=list(CRAWLERS), help="실행할 크롤러")
+    parser.add_argument('--products', type=int, default=DEFAULT_PRODUCTS, help="지그재그 상품 수 (녹화한 것 중 앞에서부터)")
+    parser.add_argument('--dbpia-fast', action='store_true', help="DBPIA 상세 페이지를 HTTP 로 먼저 (빠른 모드)")
+    parser.add_argument('--latency', type=float, default=0.0, help="재생 서버 응답 지연 (초)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="지연 흔들림 (± 초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="재생 서버 오류 비율 (0~1)")
+    parser.add_argument('--error-status', type=int, default=503, help="넣을 오류 상태 코드")
+    parser.add_argument('--seed', type=int, default=1, help="지연/오류 난수 시드")
+    parser.add_argument('--log-dir', default=DEFAULT_LOG_DIR, help="크롤러 출력 로그 폴더")
+    parser.add_argument('--save', help="결과를 JSON으로 저장")
+    parser.add_argument('--child', choices=CRAWLERS, help=argparse.SUPPRESS)  # 크롤러 하나 실행 (내부용)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.archive = os.path.abspath(args.archive)
+    args.log_dir = os.path.abspath(args.log_dir)
+
+    if args.child:
+        run_child(args.child, args.archive, args.result, args.products, args.dbpia_fast)
+        return 0
+    if not os.path.exists(args.archive):
+        print(f"❌ 녹화 파일이 없습니다: {args.archive} (benchmarks/record_replay.py 로 먼저 녹화)")
+        return 1
+
+    rows = asyncio.run(run_all(args))
+    print(f"{'크롤러':<12}{'항목':>8}{'항목/초':>10}{'p50(초)':>10}{'p99(초)':>10}{'메모리MB':>10}"
+          f"{'요청':>8}{'누락':>6}{'오류':>6}{'실패':>6}")
+    for r in rows:
+        server = r['server']
+        p50 = f"{r['p50_sec']:.3f}" if r['p50_sec'] is not None else '-'
+        p99 = f"{r['p99_sec']:.3f}" if r['p99_sec'] is not None else '-'
+        memory = f"{r['peak_rss_mb']:.0f}" if r['peak_rss_mb'] is not None else '-'
+        failures = r['failures'] if r['failures'] is not None else '-'
+        print(f"{r['crawler']:<12}{r['items']:>8}{r['items_per_sec']:>10.2f}{p50:>10}{p99:>10}{memory:>10}"
+              f"{server['requests']:>8}{server['misses']:>6}{server['errors']:>6}{failures:>6}")
+    for r in rows:
+        if r['exit_code'] != 0:
+            print(f"❌ {r['crawler']} 이(가) 비정상 종료했습니다 (코드 {r['exit_code']}, 로그: {r['log']})")
+        elif r['server']['misses']:
+            print(f"⚠️ {r['crawler']}: 녹화되지 않은 요청 {r['server']['misses']}개 "
+                  f"(예: {r['server']['top_misses'][0]['key']}) - 다시 녹화가 필요할 수 있습니다")
+    print("   항목: " + ", ".join(f"{name}={ITEM_NAMES[name]}" for name in CRAWLERS)
+          + " / 지연: dbpia=논문 페이지 로딩, 지그재그=상품 하나 전체")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.save}")
+    return 1 if any(r['exit_code'] != 0 for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 이미지 후처리 벤치마크: pHash 인덱스 검색 속도 + 프로세스 풀 후처리 처리량
+#
+# 사용법: python benchmarks/bench_image_index.py --size 300000 --queries 1000
+#         python benchmarks/bench_image_index.py --images downloads/images --workers 1 4 8
+# - 검색: 무작위 64비트 해시 N개로 인덱스를 만들고, 해밍 거리 검색 한 번에 걸리는 시간
+# - 후처리(--images): 폴더의 이미지로 썸네일 + pHash 를 만들 때 프로세스 수별 초당 처리 장수
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 저장소 루트
+from common.image_index import DEFAULT_MAX_DISTANCE, ImagePostProcessor, PerceptualIndex
+
+DEFAULT_SIZE = 300000
+DEFAULT_QUERIES = 1000
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def bench_queries(size, queries, max_distance):
+    """무작위 해시 인덱스에서 검색 (쿼리의 절반은 인덱스 안 해시를 몇 비트 바꾼 것)"""
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = PerceptualIndex(os.path.join(tmp, 'index.npz'))
+        started = time.perf_counter()
+        for i in range(size):
+            index.add(f'{i:064x}', rng.getrandbits(64))
+        index.save()
+        build_sec = time.perf_counter() - started
+
+        targets = []
+        for q in range(queries):
+            if q % 2 == 0:
+                value = index.phash(f'{rng.randrange(size):064x}')
+                for _ in range(rng.randint(0, max_distance)):
+                    value ^= 1 << rng.randrange(64)
+            else:
+                value = rng.getrandbits(64)
+            targets.append(value)
+
+        started = time.perf_counter()
+        found = sum(len(index.near(value, max_distance)) for value in targets)
+        query_sec = time.perf_counter() - started
+    return {
+        'index_size': size,
+        'queries': queries,
+        'build_sec': round(build_sec, 3),
+        'avg_query_ms': round(query_sec / queries * 1000, 3),
+        'queries_per_sec': round(queries / query_sec, 1),
+        'matches': found,
+    }
+
+
+def collect_images(directory, limit):
+    manifest = {}
+    for root, _dirs, files in os.walk(directory):
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                path = os.path.join(root, name)
+                # 파일 경로를 내용 해시 대신 키로 사용 (벤치마크용)
+                manifest[path] = {'hash': f'{len(manifest):064x}', 'path': path}
+                if len(manifest) >= limit:
+                    return manifest
+    return manifest
+
+
+def bench_postprocess(manifest, workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        processor = ImagePostProcessor(index_path=os.path.join(tmp, 'index.npz'),
+                                       thumb_dir=os.path.join(tmp, 'thumbs'), workers=workers)
+        try:
+            started = time.perf_counter()
+            processor.process_all(manifest)
+            elapsed = time.perf_counter() - started
+        finally:
+            processor.close()
+    return {
+        'workers': workers,
+        'images': len(manifest),
+        'failed': processor.failed,
+        'elapsed_sec': round(elapsed, 3),
+        'images_per_sec': round(len(manifest) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pHash 인덱스 검색 / 이미지 후처리 벤치마크")
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help="인덱스 크기 (해시 개수)")
+    parser.add_argument('--queries', type=int, default=DEFAULT_QUERIES, help="검색 횟수")
+    parser.add_argument('--max-distance', type=int, default=DEFAULT_MAX_DISTANCE, help="해밍 거리 기준")
+    parser.add_argument('--images', help="후처리 처리량을 잴 이미지 폴더")
+    parser.add_argument('--limit', type=int, default=500, help="후처리에 쓸 최대 이미지 수")
+    parser.add_argument('--workers', type=int, nargs='*', default=[1, os.cpu_count()], help="비교할 프로세스 수")
+    parser.add_argument('--save', help="결과를 JSON으로 저장")
+    args = parser.parse_args()
+
+    results = {'query': bench_queries(args.size, args.queries, args.max_distance)}
+    query = results['query']
+    print(f"🔍 인덱스 {query['index_size']}개: 만들기 {query['build_sec']:.2f}초, "
+          f"검색 평균 {query['avg_query_ms']:.3f}ms ({query['queries_per_sec']:.0f}회/초), 찾은 항목 {query['matches']}개")
+
+    if args.images:
+        manifest = collect_images(args.images, args.limit)
+        if not manifest:
+            print(f"❌ 이미지가 없습니다: {args.images}")
+        else:
+            results['postprocess'] = []
+            print(f"\n{'프로세스':>8}{'이미지':>8}{'시간(초)':>10}{'장/초':>10}")
+            for workers in args.workers:
+                row = bench_postprocess(manifest, workers)
+                results['postprocess'].append(row)
+                print(f"{row['workers']:>8}{row['images']:>8}{row['elapsed_sec']:>10.2f}{row['images_per_sec']:>10.1f}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.save}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 요청 차단 켬/끔 비교: 페이지당 전송량과 로딩 시간
+#
+# 사용법: python benchmarks/bench_resource_blocking.py --dbpia-links links.txt
+#         python benchmarks/bench_resource_blocking.py --zigzag https://zigzag.kr/review/list/150012796 ...
+# - DBPIA 상세: Selenium + CDP 차단 (이미지/폰트/CSS/광고), 상세 페이지 준비 완료까지의 시간
+# - 지그재그: Playwright + page.route 차단 (이미지/폰트/광고), load 이벤트까지의 시간
+# Selenium 전송량은 Resource Timing API 기준이라 다른 도메인 응답은 일부 빠질 수 있습니다.
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 저장소 루트
+from common.blocking import (
+    TEXT_ONLY_BLOCKED_TYPES, BlockingPolicy, PageTraffic, install_route_blocking, selenium_transfer_bytes,
+)
+from common.readiness import PAPER_DETAIL_READY, wait_for_selenium
+
+DEFAULT_LIMIT = 20
+
+
+def summarize(target, blocking, loads):
+    """[(초, 바이트, 막은 요청 수)] → 페이지당 평균"""
+    pages = len(loads)
+    return {
+        'target': target,
+        'blocking': blocking,
+        'pages': pages,
+        'avg_load_sec': round(sum(load[0] for load in loads) / pages, 3) if pages else 0.0,
+        'avg_kb': round(sum(load[1] for load in loads) / pages / 1024, 1) if pages else 0.0,
+        'avg_blocked': round(sum(load[2] for load in loads) / pages, 1) if pages else 0.0,
+    }
+
+
+def run_dbpia(links, blocked):
+    from dbpia_browser import create_chrome_browser
+
+    browser = create_chrome_browser(BlockingPolicy(TEXT_ONLY_BLOCKED_TYPES) if blocked else None)
+    loads = []
+    try:
+        for link in links:
+            started = time.perf_counter()
+            browser.get(link)
+            wait_for_selenium(browser, 'paper_detail', PAPER_DETAIL_READY)
+            elapsed = time.perf_counter() - started
+            loads.append((elapsed, selenium_transfer_bytes(browser), 0))  # Selenium 은 막은 개수를 알 수 없음
+    finally:
+        browser.quit()
+    return summarize('dbpia', blocked, loads)
+
+
+async def run_zigzag(urls, blocked):
+    from playwright.async_api import async_playwright
+
+    loads = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            for url in urls:
+                # 캐시 영향을 없애려고 페이지마다 새 컨텍스트
+                context = await browser.new_context(locale='ko-KR')
+                policy = BlockingPolicy()
+                if blocked:
+                    await install_route_blocking(context, policy)
+                page = await context.new_page()
+                traffic = PageTraffic().attach(page)
+                started = time.perf_counter()
+                await page.goto(url, wait_until='load')
+                elapsed = time.perf_counter() - started
+                loads.append((elapsed, await traffic.settle(), policy.blocked_total))
+                await context.close()
+        finally:
+            await browser.close()
+    return summarize('zigzag', blocked, loads)
+
+
+def read_lines(path, limit):
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()][:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="요청 차단 켬/끔 전송량/로딩 시간 비교")
+    parser.add_argument('--dbpia-links', help="DBPIA 상세 페이지 링크 파일 (한 줄에 하나)")
+    parser.add_argument('--zigzag', nargs='*', default=[], help="지그재그 페이지 URL")
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help="대상별 최대 페이지 수")
+    parser.add_argument('--save', help="결과를 JSON으로 저장")
+    args = parser.parse_args()
+
+    if not args.dbpia_links and not args.zigzag:
+        parser.error("--dbpia-links 또는 --zigzag 중 하나는 필요합니다")
+
+    rows = []
+    if args.dbpia_links:
+        links = read_lines(args.dbpia_links, args.limit)
+        for blocked in (False, True):
+            rows.append(run_dbpia(links, blocked))
+    if args.zigzag:
+        urls = args.zigzag[:args.limit]
+        for blocked in (False, True):
+            rows.append(asyncio.run(run_zigzag(urls, blocked)))
+
+    print(f"\n{'대상':<8}{'차단':>6}{'페이지':>8}{'평균 로딩(초)':>14}{'평균 전송(KB)':>14}{'막은 요청':>10}")
+    for row in rows:
+        print(f"{row['target']:<8}{'켬' if row['blocking'] else '끔':>6}{row['pages']:>8}"
+              f"{row['avg_load_sec']:>14.2f}{row['avg_kb']:>14.1f}{row['avg_blocked']:>10.1f}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.save}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
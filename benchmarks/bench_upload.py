@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 서버 전송 처리량 비교: 상품마다 POST(send_images_to_server) vs 모아서 보내기(BatchUploader)
+#
+# 사용법: python benchmarks/bench_upload.py --products 5000 --latency 0.01
+#         python benchmarks/bench_upload.py --error-rate 0.1 --batch-items 50 200
+# - 가짜 서버(upload_stub_server)를 같은 프로세스에서 띄우고, 가짜 상품(이미지 URL 5~20개)을 보냅니다.
+# - 초당 상품 수, 초당 요청 수, 보낸 바이트(압축 후)와, 서버가 받은 항목 수가 맞는지 확인합니다.
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)  # 저장소 루트 (common)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from common.uploader import BatchUploader
+from upload_stub_server import UploadStub, start_stub
+
+DEFAULT_PRODUCTS = 2000
+DEFAULT_LATENCY = 0.005  # 가짜 서버 응답 지연 (초, 실제 서버 왕복 시간 흉내)
+SINGLE_CONCURRENCY = 8  # 상품마다 보낼 때 동시 요청 수
+
+
+def synthetic_products(count, seed=42):
+    rng = random.Random(seed)
+    products = []
+    for i in range(count):
+        product_id = str(100000000 + i)
+        urls = [f'https://cf.image-zigzag.kr/original/review/2024/{rng.getrandbits(48):012x}.jpeg'
+                for _ in range(rng.randint(5, 20))]
+        # zigzag_img.image_upload_record 와 같은 모양
+        products.append({'product_id': product_id, 'source': 'zigzag', 'image_urls': urls})
+    return products
+
+
+async def bench_single(products, latency, error_rate):
+    """예전 방식 (send_images_to_server): 상품마다 압축 없이 POST 한 번, 실패하면 그대로 실패 (세션은 같이 씀)"""
+    stub = UploadStub(latency, error_rate, seed=1)
+    runner, url = await start_stub(stub)
+    semaphore = asyncio.Semaphore(SINGLE_CONCURRENCY)
+    failed = 0
+    try:
+        connector = aiohttp.TCPConnector(limit=SINGLE_CONCURRENCY)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async def run(record):
+                nonlocal failed
+                async with semaphore:
+                    async with session.post(url, json=record) as response:
+                        await response.read()
+                        if response.status != 200:
+                            failed += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(run(record) for record in products))
+            elapsed = time.perf_counter() - started
+    finally:
+        await runner.cleanup()
+    stats = stub.stats()
+    return row('single', len(products), elapsed, stats, failed=failed)
+
+
+async def bench_batched(products, latency, error_rate, batch_items, compress=True):
+    stub = UploadStub(latency, error_rate, seed=1)
+    runner, url = await start_stub(stub)
+    try:
+        uploader = BatchUploader(url, max_batch_items=batch_items, compress=compress)
+        started = time.perf_counter()
+        async with uploader:
+            for record in products:
+                await uploader.put(record)
+        elapsed = time.perf_counter() - started
+    finally:
+        await runner.cleanup()
+    stats = stub.stats()
+    label = f'batch{batch_items}' + ('' if compress else '-raw')
+    return row(label, len(products), elapsed, stats, failed=len(uploader.report.dead_letters),
+               blocked_sec=uploader.blocked_sec)
+
+
+def row(label, products, elapsed, stats, failed=0, blocked_sec=0.0):
+    return {
+        'mode': label,
+        'products': products,
+        'elapsed_sec': round(elapsed, 3),
+        'products_per_sec': round(products / elapsed, 1),
+        'requests': stats['requests'],
+        'requests_per_sec': round(stats['requests'] / elapsed, 1),
+        'bytes_received': stats['bytes_received'],
+        'server_items': stats['items'],
+        'injected_errors': stats['errors'],
+        'duplicates': stats['duplicates'],
+        'failed': failed,
+        'blocked_sec': round(blocked_sec, 3),
+    }
+
+
+async def run_all(args):
+    products = synthetic_products(args.products)
+    rows = [await bench_single(products, args.latency, args.error_rate)]
+    for batch_items in args.batch_items:
+        rows.append(await bench_batched(products, args.latency, args.error_rate, batch_items))
+    rows.append(await bench_batched(products, args.latency, args.error_rate, args.batch_items[-1], compress=False))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 전송 처리량 비교 (가짜 서버)")
+    parser.add_argument('--products', type=int, default=DEFAULT_PRODUCTS, help="보낼 가짜 상품 수")
+    parser.add_argument('--latency', type=float, default=DEFAULT_LATENCY, help="가짜 서버 응답 지연 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="가짜 서버 503 비율 (0~1)")
+    parser.add_argument('--batch-items', type=int, nargs='+', default=[50, 200], help="배치 크기 (여러 개 비교)")
+    parser.add_argument('--save', help="결과를 JSON으로 저장")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run_all(args))
+    print(f"{'방식':<12}{'상품/초':>10}{'요청':>8}{'요청/초':>10}{'보낸 KB':>10}{'서버 항목':>10}{'실패':>6}{'대기(초)':>10}")
+    for r in rows:
+        print(f"{r['mode']:<12}{r['products_per_sec']:>10,.1f}{r['requests']:>8}{r['requests_per_sec']:>10,.1f}"
+              f"{r['bytes_received'] / 1024:>10,.0f}{r['server_items']:>10}{r['failed']:>6}{r['blocked_sec']:>10.2f}")
+
+    # 최종 실패로 보고되지 않았는데 서버에 안 간 항목이 있으면 문제
+    lost = [r['mode'] for r in rows if not r['failed'] and r['server_items'] < r['products']]
+    if lost:
+        print(f"❌ 서버가 받은 항목 수가 모자랍니다: {', '.join(lost)}")
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.save}")
+    return 1 if lost else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 실제 사이트 응답을 재생 서버(replay_server.py)용 녹화 파일에 저장
+#
+# 사용법: python benchmarks/record_replay.py dbpia --query 인공지능 --max-papers 40
+#         python benchmarks/record_replay.py zigzag https://zigzag.kr/catalog/products/150012796 ...
+# - DBPIA: 검색 결과 페이지와 상세 페이지를 HTTP 로 받아서 저장합니다. (빠른 모드/HTTP 링크 수집이 그대로 재생됨)
+#   브라우저 모드는 상세 페이지 HTML 은 재생되고, 녹화하지 않은 부속 파일(JS 등)은 404 가 됩니다.
+# - 지그재그: Playwright 로 후기 목록(API/화면 모드 둘 다), 상품 페이지를 열면서 오간 응답을 모두 저장하고,
+#   후기 이미지는 상품마다 --max-images 장까지 HTTP 로 받아서 저장합니다.
+#   (이미지/폰트/동영상 응답은 크롤러가 막으므로 --with-assets 일 때만 저장)
+# 녹화한 검색어/상품 목록은 녹화 파일에 같이 남겨서 bench_e2e.py 가 그대로 사용합니다.
+import argparse
+import asyncio
+import math
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)  # 저장소 루트 (common, dbpia_*)
+sys.path.append(os.path.join(ROOT, 'zigzag'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from common.concurrency import HttpStatusError
+from common.replay import REPLAY_ENV
+from replay_server import DEFAULT_ARCHIVE, ReplayArchive
+
+DEFAULT_MAX_PAPERS = 40
+DEFAULT_MAX_IMAGES = 50  # zigzag_img 의 IMAGE_LIMIT 과 같게 (재생할 때 모두 받을 수 있도록)
+RECORD_WORKERS = 8  # DBPIA 상세 페이지를 동시에 받을 수
+SKIPPED_RESOURCE_TYPES = ('image', 'media', 'font')
+
+
+def record_dbpia(archive, query, max_papers):
+    from dbpia_fast import create_http_pool
+    from dbpia_pagination import DEFAULT_PAGE_SIZE, collect_search_links
+
+    http = create_http_pool(RECORD_WORKERS)
+
+    def fetch(url):
+        response = http.request('GET', url)
+        archive.put('GET', url, response.status, response.headers.get('Content-Type'), response.data)
+        if response.status != 200:
+            raise HttpStatusError(response.status, url)
+        return response.data.decode('utf-8', errors='replace')
+
+    # 녹화한 검색 결과 페이지의 링크는 모두 받아 둠 (재생할 때 크롤러가 그 링크를 다 열기 때문)
+    max_pages = max(1, math.ceil(max_papers / DEFAULT_PAGE_SIZE))
+    links = collect_search_links(query, fetch, max_pages=max_pages)
+
+    def fetch_detail(link):
+        try:
+            fetch(link)
+            return True
+        except Exception as e:
+            print(f"❌ 상세 페이지 녹화 실패: {link} ({e})")
+            return False
+
+    with ThreadPoolExecutor(max_workers=RECORD_WORKERS) as executor:
+        recorded = sum(executor.map(fetch_detail, links))
+    archive.set_meta('dbpia_query', query)
+    archive.set_meta('dbpia_papers', recorded)
+    print(f"📼 DBPIA: 검색어 '{query}', 논문 {recorded}/{len(links)}개 녹화")
+
+
+class PageRecorder:
+    """Playwright 컨텍스트가 받은 응답을 녹화 파일에 저장"""
+
+    def __init__(self, archive, with_assets=False):
+        self.archive = archive
+        self.with_assets = with_assets
+        self.saved = 0
+        self._tasks = set()
+
+    def attach(self, context):
+        context.on('response', self._on_response)
+        return self
+
+    def _on_response(self, response):
+        if not self.with_assets and response.request.resource_type in SKIPPED_RESOURCE_TYPES:
+            return
+        task = asyncio.ensure_future(self._save(response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _save(self, response):
+        request = response.request
+        headers = await response.all_headers()
+        body = b''
+        if not 300 <= response.status < 400:  # 리디렉션은 본문 없이 Location 만
+            try:
+                body = await response.body()
+            except Exception:
+                return  # 페이지를 떠나서 본문을 못 받은 응답
+        self.archive.put(request.method, response.url, response.status, headers.get('content-type'), body,
+                         request.post_data_buffer, headers.get('location'))
+        self.saved += 1
+
+    async def settle(self):
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+async def record_zigzag(archive, product_urls, max_images, with_assets=False):
+    import aiohttp
+    from playwright.async_api import async_playwright
+    from zigzag_img import extract_title_from_zigzag, image_urls_from_reviews
+    from zigzag_links import ShortLinkResolver, product_id_from_url
+    from zigzag_text import crawl_product_reviews
+
+    products = []
+    images = 0
+    resolver = ShortLinkResolver(os.path.join(os.path.dirname(archive.path), 'short_links.sqlite3'))
+    async with aiohttp.ClientSession() as session, async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(locale='ko-KR')
+        recorder = PageRecorder(archive, with_assets).attach(context)
+        page = await context.new_page()
+        try:
+            for url in product_urls:
+                product_id = await resolver.resolve(url, session) or product_id_from_url(url)
+                if not product_id:
+                    print(f"❌ 상품 ID를 찾지 못해서 건너뜀: {url}")
+                    continue
+                product_url = f"https://zigzag.kr/catalog/products/{product_id}"
+                # 크롤러가 여는 순서대로: 후기 목록(API 모드, 화면 모드) → 상품 페이지
+                crawled = await crawl_product_reviews(page, product_url, mode='api')
+                await crawl_product_reviews(page, product_url, mode='dom')
+                await extract_title_from_zigzag(page, product_url)
+                for image_url in image_urls_from_reviews(crawled['reviews'])[:max_images]:
+                    async with session.get(image_url) as response:
+                        archive.put('GET', image_url, response.status, response.headers.get('Content-Type'),
+                                    await response.read())
+                    images += 1
+                products.append(product_url)
+                print(f"📼 지그재그 상품 {product_id}: 후기 {len(crawled['reviews'])}개, 응답 {recorder.saved}개까지 녹화")
+        finally:
+            await recorder.settle()
+            await browser.close()
+            resolver.close()
+    known = archive.get_meta('zigzag_products', [])
+    archive.set_meta('zigzag_products', list(dict.fromkeys(known + products)))
+    print(f"📼 지그재그: 상품 {len(products)}개, 이미지 {images}장 녹화")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="재생 서버용 응답 녹화")
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE, help="녹화 파일 (있으면 이어서 추가)")
+    sub = parser.add_subparsers(dest='site', required=True)
+    dbpia = sub.add_parser('dbpia', help="DBPIA 검색 결과 + 상세 페이지")
+    dbpia.add_argument('--query', required=True, help="검색어")
+    dbpia.add_argument('--max-papers', type=int, default=DEFAULT_MAX_PAPERS,
+                       help="녹화할 논문 수 (검색 결과 페이지 단위로 올림)")
+    zigzag = sub.add_parser('zigzag', help="지그재그 후기 목록/API/상품 페이지/후기 이미지")
+    zigzag.add_argument('product_urls', nargs='+', help="상품 URL (단축 링크도 가능)")
+    zigzag.add_argument('--max-images', type=int, default=DEFAULT_MAX_IMAGES, help="상품마다 녹화할 후기 이미지 수")
+    zigzag.add_argument('--with-assets', action='store_true', help="이미지/폰트/동영상 응답도 저장")
+    args = parser.parse_args()
+
+    if os.environ.pop(REPLAY_ENV, None):
+        print(f"⚠️ 녹화는 실제 사이트에서 합니다 ({REPLAY_ENV} 무시)")
+    archive = ReplayArchive(args.archive)
+    try:
+        if args.site == 'dbpia':
+            record_dbpia(archive, args.query, args.max_papers)
+        else:
+            asyncio.run(record_zigzag(archive, args.product_urls, args.max_images, args.with_assets))
+        summary = archive.summary()
+        print(f"💾 녹화 파일: {args.archive} (응답 {summary['responses']}개, {summary['bytes'] / 1024 / 1024:.1f} MB)")
+    finally:
+        archive.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
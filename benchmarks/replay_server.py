@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 녹화한 응답(record_replay.py)을 실제 사이트 대신 돌려주는 재생 서버
+#
+# 사용법: python benchmarks/replay_server.py --archive data/replay/archive.sqlite3 --port 8780 \
+#             --latency 0.05 --jitter 0.02 --error-rate 0.02
+#         → CRAWLER_REPLAY_URL=http://127.0.0.1:8780 python dbpia.py --fast ...
+# - 주소는 /<원래 호스트>/<원래 경로>?<쿼리> 모양입니다 (common/replay.py).
+# - HTTP 클라이언트가 받는 HTML/JSON 의 절대 주소와 Location 헤더는 재생 서버 주소로 바꿔서
+#   페이지에서 읽은 링크도 다시 여기로 오게 합니다. (브라우저 요청은 X-Replay-Raw 헤더가 있어서 그대로)
+# - 요청마다 지연(--latency ± --jitter)을 두고, --error-rate 비율로 --error-status(기본 503)를 돌려줍니다.
+# - 녹화되지 않은 요청은 404, GET /__stats 로 지금까지의 요청/적중/누락/오류 수를 확인합니다.
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 저장소 루트 (common)
+from common.metrics import LatencyHistogram
+from common.replay import RAW_HEADER, replay_key
+
+DEFAULT_ARCHIVE = 'data/replay/archive.sqlite3'
+DEFAULT_PORT = 8780
+STATS_PATH = '/__stats'
+
+# 안의 주소를 바꿔 줄 응답 종류
+TEXT_CONTENT_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', '+json', '+xml')
+
+
+class ReplayArchive:
+    """녹화한 응답 저장소 (요청 키 → 상태/종류/본문, SQLite 파일 하나, 여러 스레드에서 녹화 가능)"""
+
+    def __init__(self, path=DEFAULT_ARCHIVE):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                content_type TEXT,
+                location TEXT,
+                body BLOB NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        self.conn.commit()
+        self.recorded = 0
+
+    def put(self, method, url, status, content_type, body, post_data=None, location=None):
+        """응답 하나 기록 (같은 요청은 처음 것을 남김)"""
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR IGNORE INTO responses (key, url, status, content_type, location, body, recorded_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (replay_key(method, url, post_data), url.split('#')[0], status, content_type, location,
+                 body or b'', time.time()),
+            )
+            self.conn.commit()
+            self.recorded += 1
+
+    def get(self, key):
+        row = self.conn.execute(
+            'SELECT status, content_type, location, body FROM responses WHERE key = ?', (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        status, content_type, location, body = row
+        return {'status': status, 'content_type': content_type, 'location': location, 'body': body}
+
+    def hosts(self):
+        """녹화된 호스트 목록"""
+        return sorted({urlsplit(url).netloc for (url,) in self.conn.execute('SELECT url FROM responses')})
+
+    def set_meta(self, name, value):
+        self.conn.execute('INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)',
+                          (name, json.dumps(value, ensure_ascii=False)))
+        self.conn.commit()
+
+    def get_meta(self, name, default=None):
+        row = self.conn.execute('SELECT value FROM meta WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def summary(self):
+        responses, size = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM responses').fetchone()
+        return {'responses': responses, 'bytes': size, 'hosts': self.hosts()}
+
+    def close(self):
+        self.conn.close()
+
+
+class ReplayServer:
+    """녹화한 응답을 지연/오류를 섞어서 돌려주는 서버"""
+
+    def __init__(self, archive, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, seed=None):
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rng = random.Random(seed)
+        self.base = None  # 시작한 뒤에 정해짐 (주소 바꾸기용)
+        hosts = sorted(archive.hosts(), key=len, reverse=True)  # 앞부분이 같은 호스트는 긴 쪽부터
+        # https://호스트, http://호스트, JSON 안의 https:\/\/호스트
+        self._host_pattern = re.compile(
+            r'https?:(?:\\?/){2}(' + '|'.join(re.escape(host) for host in hosts) + r')\b') if hosts else None
+        self.reset()
+
+    def reset(self):
+        """통계 초기화 (크롤러마다 따로 보려고)"""
+        self.requests = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0  # 일부러 낸 오류
+        self.bytes_sent = 0
+        self.service = LatencyHistogram()  # 넣은 지연 포함 응답 시간
+        self.missed_keys = {}
+
+    def rewrite(self, text):
+        """본문/Location 의 원래 주소 → 재생 서버 주소"""
+        if self._host_pattern is None or self.base is None:
+            return text
+        return self._host_pattern.sub(lambda match: f'{self.base}/{match.group(1)}', text)
+
+    async def handle(self, request):
+        if request.path == STATS_PATH:
+            return web.json_response(self.stats())
+        started = time.perf_counter()
+        self.requests += 1
+        try:
+            body = await request.read() if request.can_read_body else None
+            key = replay_key(request.method, 'https://' + request.raw_path.lstrip('/'), body)
+            delay = self.latency + (self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.error_rate and self.rng.random() < self.error_rate:
+                self.errors += 1
+                return web.Response(status=self.error_status, text='injected error')
+            entry = self.archive.get(key)
+            if entry is None:
+                self.misses += 1
+                self.missed_keys[key] = self.missed_keys.get(key, 0) + 1
+                return web.Response(status=404, text=f'not recorded: {key}')
+            self.hits += 1
+            payload = entry['body']
+            headers = {}
+            content_type = entry['content_type']
+            location = entry['location']
+            raw = request.headers.get(RAW_HEADER)
+            if not raw and content_type and any(kind in content_type for kind in TEXT_CONTENT_TYPES):
+                payload = self.rewrite(payload.decode('utf-8', errors='replace')).encode('utf-8')
+            if location:
+                headers['Location'] = location if raw else self.rewrite(location)
+            if content_type:
+                headers['Content-Type'] = content_type
+            self.bytes_sent += len(payload)
+            return web.Response(status=entry['status'], body=payload, headers=headers)
+        finally:
+            self.service.observe(time.perf_counter() - started)
+
+    def stats(self):
+        top_misses = sorted(self.missed_keys.items(), key=lambda item: -item[1])[:10]
+        return {
+            'requests': self.requests,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'bytes_sent': self.bytes_sent,
+            'service': self.service.summary(),
+            'top_misses': [{'key': key, 'count': count} for key, count in top_misses],
+        }
+
+    def app(self):
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_route('*', '/{tail:.*}', self.handle)
+        return app
+
+
+async def start_replay(server, host='127.0.0.1', port=0):
+    """재생 서버 시작 (port=0 이면 빈 포트) - (runner, 재생 서버 주소) 반환"""
+    runner = web.AppRunner(server.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    server.base = f'http://{host}:{port}'
+    return runner, server.base
+
+
+def main():
+    parser = argparse.ArgumentParser(description="녹화한 응답을 돌려주는 재생 서버")
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE, help="녹화 파일 (record_replay.py 로 만듦)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', type=float, default=0.0, help="요청마다 넣을 지연 (초)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="지연 흔들림 (± 초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="오류로 답할 비율 (0~1)")
+    parser.add_argument('--error-status', type=int, default=503, help="넣을 오류 상태 코드")
+    parser.add_argument('--seed', type=int, help="지연/오류 난수 시드 (같은 순서로 재현)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.archive):
+        print(f"❌ 녹화 파일이 없습니다: {args.archive} (benchmarks/record_replay.py 로 먼저 녹화)")
+        return 1
+    archive = ReplayArchive(args.archive)
+    summary = archive.summary()
+    server = ReplayServer(archive, args.latency, args.jitter, args.error_rate, args.error_status, args.seed)
+    server.base = f'http://{args.host}:{args.port}'
+    print(f"📼 응답 {summary['responses']}개 ({summary['bytes'] / 1024 / 1024:.1f} MB), 호스트: {', '.join(summary['hosts'])}")
+    print(f"📼 재생 서버: {server.base} (통계: {STATS_PATH})")
+    print(f"   CRAWLER_REPLAY_URL={server.base} 로 크롤러를 실행하세요")
+    try:
+        web.run_app(server.app(), host=args.host, port=args.port, print=None)
+    finally:
+        print(json.dumps(server.stats(), ensure_ascii=False))
+        archive.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
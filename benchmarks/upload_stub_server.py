@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 서버 전송(BatchUploader / send_images_to_server) 시험용 가짜 서버
+#
+# 사용법: python benchmarks/upload_stub_server.py --port 8765 --latency 0.02 --error-rate 0.05
+#         → 크롤러에 --upload-url http://127.0.0.1:8765/upload 로 지정
+# - gzip 본문을 풀고, 배치 ID(Idempotency-Key)가 이미 받은 것이면 저장하지 않고 200 으로 답합니다.
+# - 응답 지연(--latency)과 일시적 오류 비율(--error-rate, 503)을 넣어서 재시도도 확인할 수 있습니다.
+# - GET /stats 로 지금까지 받은 요청/항목 수를 확인합니다.
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import sys
+
+from aiohttp import web
+
+DEFAULT_PORT = 8765
+
+
+class UploadStub:
+    """받은 요청/항목 수만 세는 서버 (항목 내용은 저장하지 않음)"""
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0  # 일부러 낸 503
+        self.duplicates = 0  # 이미 받은 배치
+        self.batches = set()
+        self.items = 0
+        self.bytes_received = 0
+
+    async def handle_upload(self, request):
+        self.requests += 1
+        body = await request.read()
+        self.bytes_received += request.content_length or len(body)  # 압축된 크기 (aiohttp 가 본문을 풀어도)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response({'error': 'injected'}, status=503)
+        if body[:2] == b'\x1f\x8b':  # aiohttp 가 풀지 않았으면 직접
+            body = gzip.decompress(body)
+        data = json.loads(body)
+        if 'items' not in data:  # send_images_to_server 처럼 상품 하나만 보낸 경우
+            self.items += 1
+            return web.json_response({'ok': True, 'items': 1})
+        batch_id = request.headers.get('Idempotency-Key') or data.get('batch_id')
+        if batch_id in self.batches:
+            self.duplicates += 1
+            return web.json_response({'ok': True, 'duplicate': True})
+        self.batches.add(batch_id)
+        self.items += len(data['items'])
+        return web.json_response({'ok': True, 'items': len(data['items'])})
+
+    async def handle_stats(self, request):
+        return web.json_response(self.stats())
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'duplicates': self.duplicates,
+            'batches': len(self.batches),
+            'items': self.items,
+            'bytes_received': self.bytes_received,
+        }
+
+    def app(self):
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post('/upload', self.handle_upload)
+        app.router.add_get('/stats', self.handle_stats)
+        return app
+
+
+async def start_stub(stub, host='127.0.0.1', port=0):
+    """가짜 서버 시작 (port=0 이면 빈 포트) - (runner, 업로드 주소) 반환"""
+    runner = web.AppRunner(stub.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://{host}:{port}/upload'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 전송 시험용 가짜 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', type=float, default=0.0, help="응답 지연 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="503 으로 답할 비율 (0~1)")
+    args = parser.parse_args()
+
+    stub = UploadStub(args.latency, args.error_rate)
+    print(f"📮 가짜 서버: http://{args.host}:{args.port}/upload (통계: /stats)")
+    web.run_app(stub.app(), host=args.host, port=args.port, print=None)
+    print(json.dumps(stub.stats(), ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# 크롤러들(dbpia, zigzag)이 같이 쓰는 공통 모듈
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+# 필요 없는 요청(이미지, 폰트, 스타일시트, 광고/분석 스크립트)을 막아서
+# 페이지 로딩 시간과 전송량을 줄이는 정책
+#
+# 우리는 텍스트, JSON-LD, img[src] 속성만 읽기 때문에 이미지 파일 자체는 받을 필요가 없습니다.
+# - Playwright: page.route / context.route 로 요청 종류(resource_type)와 도메인을 보고 중단
+# - Selenium: CDP Network.setBlockedURLs 로 확장자/도메인 패턴을 막음 (요청 종류는 알 수 없음)
+import asyncio  # 비동기 처리
+from urllib.parse import urlsplit  # 호스트 추출
+
+# 기본으로 막는 요청 종류 (Playwright resource_type)
+DEFAULT_BLOCKED_TYPES = ('image', 'media', 'font')
+# 레이아웃이 필요 없는 페이지(DBPIA 상세)는 스타일시트까지 막음
+TEXT_ONLY_BLOCKED_TYPES = DEFAULT_BLOCKED_TYPES + ('stylesheet',)
+
+# 광고/분석 도메인 (하위 도메인 포함)
+BLOCKED_DOMAINS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googlesyndication.com',
+    'doubleclick.net',
+    'facebook.net',
+    'facebook.com',
+    'analytics.tiktok.com',
+    'criteo.com',
+    'criteo.net',
+    'wcs.naver.net',
+    'wcs.naver.com',
+    'kakaopixel.kakao.com',
+    'appsflyer.com',
+    'branch.io',
+    'amplitude.com',
+    'braze.com',
+    'hotjar.com',
+    'clarity.ms',
+    'mixpanel.com',
+    'sentry.io',
+)
+
+# Selenium 은 요청 종류를 모르니 확장자로 대신 막음
+RESOURCE_EXTENSIONS = {
+    'image': ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.svg', '.ico', '.bmp'),
+    'media': ('.mp4', '.webm', '.mp3', '.m4a', '.m3u8'),
+    'font': ('.woff', '.woff2', '.ttf', '.otf', '.eot'),
+    'stylesheet': ('.css',),
+}
+
+
+class BlockingPolicy:
+    """막을 요청 종류/도메인 설정과 막은 개수 기록"""
+
+    def __init__(self, resource_types=DEFAULT_BLOCKED_TYPES, domains=BLOCKED_DOMAINS):
+        self.resource_types = frozenset(resource_types)
+        self.domains = tuple(domains)
+        self.blocked = {}  # 종류별로 막은 요청 수 (Playwright 만 집계 가능)
+
+    def is_blocked_host(self, url):
+        host = urlsplit(url).hostname or ''
+        return any(host == domain or host.endswith('.' + domain) for domain in self.domains)
+
+    def should_block(self, url, resource_type=None):
+        if resource_type in self.resource_types:
+            return True
+        return self.is_blocked_host(url)
+
+    def note_blocked(self, resource_type):
+        key = resource_type or 'other'
+        self.blocked[key] = self.blocked.get(key, 0) + 1
+
+    @property
+    def blocked_total(self):
+        return sum(self.blocked.values())
+
+    def url_patterns(self):
+        """CDP Network.setBlockedURLs 용 와일드카드 패턴"""
+        patterns = []
+        for resource_type in sorted(self.resource_types):
+            for extension in RESOURCE_EXTENSIONS.get(resource_type, ()):
+                patterns.append(f'*{extension}')
+                patterns.append(f'*{extension}?*')
+        for domain in self.domains:
+            patterns.append(f'*://{domain}/*')
+            patterns.append(f'*.{domain}/*')
+        return patterns
+
+
+async def install_route_blocking(target, policy):
+    """Playwright page 또는 context 에 차단 규칙 설치"""
+    async def handle(route):
+        request = route.request
+        if policy.should_block(request.url, request.resource_type):
+            policy.note_blocked(request.resource_type)
+            await route.abort()
+        else:
+            await route.fallback()  # 다른 규칙(재생 모드 등)이 없으면 그대로 요청
+
+    await target.route('**/*', handle)
+
+
+def apply_selenium_blocking(browser, policy):
+    """Selenium(크롬)에 CDP 로 차단 패턴 적용 (실패하면 False)"""
+    try:
+        browser.execute_cdp_cmd('Network.enable', {})
+        browser.execute_cdp_cmd('Network.setBlockedURLs', {'urls': policy.url_patterns()})
+        return True
+    except Exception as e:
+        print(f"⚠️ 요청 차단 설정 실패 (차단 없이 진행): {e}")
+        return False
+
+
+# 브라우저가 기록한 이번 페이지의 전송량 (Resource Timing API)
+# 다른 도메인 응답은 Timing-Allow-Origin 이 없으면 0 으로 잡혀서 실제보다 조금 작게 나옴
+TRANSFER_BYTES_JS = '''(
+    performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+        .reduce((total, entry) => total + (entry.transferSize || 0), 0)
+)'''
+
+
+def selenium_transfer_bytes(browser):
+    """Selenium: 현재 페이지가 받은 바이트 수 (측정 실패 시 0)"""
+    try:
+        return int(browser.execute_script(f"return {TRANSFER_BYTES_JS};") or 0)
+    except Exception:
+        return 0
+
+
+class PageTraffic:
+    """Playwright 페이지가 주고받은 요청 수/바이트 수"""
+
+    def __init__(self):
+        self.requests = 0
+        self.failed = 0
+        self.bytes = 0
+        self._pending = set()
+
+    def attach(self, page):
+        page.on('requestfinished', self._on_finished)
+        page.on('requestfailed', self._on_failed)
+        return self
+
+    def _on_finished(self, request):
+        self.requests += 1
+        task = asyncio.ensure_future(self._add_sizes(request))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _on_failed(self, request):
+        self.failed += 1  # 차단한 요청도 여기로 옴
+
+    async def _add_sizes(self, request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.bytes += sizes.get('responseBodySize', 0) + sizes.get('responseHeadersSize', 0)
+
+    async def settle(self):
+        """아직 계산 중인 응답 크기까지 반영"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+        return self.bytes
+
+    def reset(self):
+        self.requests = 0
+        self.failed = 0
+        self.bytes = 0
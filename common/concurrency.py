@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+# 응답 속도와 오류를 보고 동시 요청 수를 자동으로 조절하는 컨트롤러 (AIMD)
+#
+# - 정상 응답이 오면 동시 요청 수를 조금씩 늘리고 (additive increase)
+# - 429 / 5xx / 타임아웃이 나면 절반으로 줄입니다 (multiplicative decrease)
+# - 지연 시간이 평소(최소 지연)보다 크게 늘어나도 조금 줄입니다
+# - 호스트별 초당 요청 수 상한(rps)은 따로 지킵니다
+# 스레드(DBPIA)용 AdaptiveLimiter 와 asyncio(zigzag)용 AsyncAdaptiveLimiter 가 같은 규칙을 씁니다.
+import asyncio  # 비동기 처리
+import threading  # 멀티스레딩
+import time  # 시간 관련 기능
+from urllib.parse import urlsplit  # 호스트 추출
+
+OVERLOAD_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HttpStatusError(Exception):
+    """200 이 아닌 HTTP 응답"""
+
+    def __init__(self, status, url=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.url = url
+
+
+def is_overload_error(error):
+    """서버가 버거워한다는 신호인지 (429, 5xx, 타임아웃)"""
+    status = getattr(error, 'status', None)
+    if status in OVERLOAD_STATUSES or (isinstance(status, int) and status >= 500):
+        return True
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    # urllib3 / selenium / playwright / aiohttp 의 타임아웃 예외는 공통 부모가 없어서 이름으로 확인
+    return 'Timeout' in type(error).__name__
+
+
+def host_of(url):
+    return urlsplit(url).netloc or url
+
+
+class AimdController:
+    """동시 요청 수 계산 (잠금은 호출하는 쪽에서)"""
+
+    def __init__(self, initial=4, min_limit=1, max_limit=32, increase=1.0, decrease=0.5,
+                 latency_tolerance=2.5, cooldown=1.0):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance  # 최소 지연의 몇 배부터 느려졌다고 볼지
+        self.cooldown = cooldown  # 줄인 뒤 다시 줄이기까지 최소 간격 (초)
+        self._ewma = None
+        self._min_latency = None
+        self._last_decrease = 0.0
+        self.successes = 0
+        self.overloads = 0
+        self.errors = 0
+        self.decreases = 0
+        self.peak_limit = float(initial)
+
+    @property
+    def allowed(self):
+        """지금 허용하는 동시 요청 수"""
+        return max(self.min_limit, int(self.limit))
+
+    def _decrease(self, factor):
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * factor)
+        self.decreases += 1
+
+    def on_success(self, latency):
+        self.successes += 1
+        self._ewma = latency if self._ewma is None else self._ewma * 0.8 + latency * 0.2
+        # 기준 지연은 아주 천천히 올라가게 해서 네트워크 상태 변화도 따라감
+        if self._min_latency is None:
+            self._min_latency = latency
+        else:
+            self._min_latency = min(latency, self._min_latency * 1.001)
+
+        if self._ewma > self._min_latency * self.latency_tolerance and self.successes > 10:
+            self._decrease(0.9)
+        else:
+            # 동시 요청 수만큼 성공하면 1 증가 (TCP 혼잡 제어와 같은 방식)
+            self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+            self.peak_limit = max(self.peak_limit, self.limit)
+
+    def on_overload(self):
+        self.overloads += 1
+        self._decrease(self.decrease)
+
+    def on_error(self):
+        # 404 처럼 서버 부하와 상관없는 오류는 동시 요청 수를 바꾸지 않음
+        self.errors += 1
+
+    def record(self, latency, error=None):
+        if error is None:
+            self.on_success(latency)
+        elif is_overload_error(error):
+            self.on_overload()
+        else:
+            self.on_error()
+
+    def summary(self):
+        return {
+            'limit': round(self.limit, 2),
+            'peak_limit': round(self.peak_limit, 2),
+            'successes': self.successes,
+            'overloads': self.overloads,
+            'errors': self.errors,
+            'decreases': self.decreases,
+            'latency_ewma_sec': round(self._ewma, 3) if self._ewma is not None else None,
+        }
+
+
+class HostRateLimiter:
+    """호스트별 초당 요청 수 상한 (요청 간격을 1/rps 로 유지)"""
+
+    def __init__(self, max_rps=None):
+        self.max_rps = max_rps
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url):
+        """요청 순서를 예약하고 기다려야 할 시간(초)을 반환"""
+        if not self.max_rps:
+            return 0.0
+        host = host_of(url)
+        interval = 1.0 / self.max_rps
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + interval
+        return start - now
+
+    def wait(self, url):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url):
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AdaptiveLimiter:
+    """스레드용 동시 요청 수 제한기"""
+
+    def __init__(self, initial=4, min_limit=1, max_limit=32, max_rps=None, rate=None, **options):
+        self.controller = AimdController(initial, min_limit, max_limit, **options)
+        self.rate = rate or HostRateLimiter(max_rps)  # 여러 제한기가 rps 상한을 같이 쓸 수 있음
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    @property
+    def max_limit(self):
+        return self.controller.max_limit
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= self.controller.allowed:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency=None, error=None):
+        """자리 반납 (latency 가 None 이면 중단된 요청이라 동시 요청 수 조절에 반영하지 않음)"""
+        with self._cond:
+            self.in_flight -= 1
+            if latency is not None:
+                self.controller.record(latency, error)
+            self._cond.notify_all()
+
+    def call(self, url, func, *args, **kwargs):
+        """제한 안에서 func 실행 (결과/예외는 그대로 전달)"""
+        self.acquire()
+        feedback = (None, None)  # KeyboardInterrupt 등으로 중단되면 자리만 반납
+        try:
+            self.rate.wait(url)
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                feedback = (time.perf_counter() - started, e)
+                raise
+            feedback = (time.perf_counter() - started, None)
+            return result
+        finally:
+            self.release(*feedback)
+
+    def summary(self):
+        with self._cond:
+            return self.controller.summary()
+
+
+class AsyncAdaptiveLimiter:
+    """asyncio용 동시 요청 수 제한기"""
+
+    def __init__(self, initial=4, min_limit=1, max_limit=32, max_rps=None, rate=None, **options):
+        self.controller = AimdController(initial, min_limit, max_limit, **options)
+        self.rate = rate or HostRateLimiter(max_rps)
+        self.in_flight = 0
+        self._cond = None  # 이벤트 루프 안에서 만들어야 해서 처음 쓸 때 생성
+
+    @property
+    def max_limit(self):
+        return self.controller.max_limit
+
+    def _condition(self):
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def acquire(self):
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self.in_flight < self.controller.allowed)
+            self.in_flight += 1
+
+    async def release(self, latency=None, error=None):
+        """자리 반납 (latency 가 None 이면 취소된 요청이라 동시 요청 수 조절에 반영하지 않음)"""
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            if latency is not None:
+                self.controller.record(latency, error)
+            cond.notify_all()
+
+    async def call(self, url, func, *args, **kwargs):
+        """제한 안에서 코루틴 함수 실행 (결과/예외는 그대로 전달)"""
+        await self.acquire()
+        feedback = (None, None)  # 작업이 취소되면(CancelledError) 자리만 반납
+        try:
+            await self.rate.wait_async(url)
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                feedback = (time.perf_counter() - started, e)
+                raise
+            feedback = (time.perf_counter() - started, None)
+            return result
+        finally:
+            await self.release(*feedback)
+
+    def summary(self):
+        return self.controller.summary()
+
+
+def format_limiter_summary(summary):
+    """제한기 요약 한 줄"""
+    return (f"🎚️ 동시 요청 수: 현재 {summary['limit']:.1f}, 최대 {summary['peak_limit']:.1f} "
+            f"(성공 {summary['successes']}, 과부하 {summary['overloads']}, 감소 {summary['decreases']}회)")
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# Playwright 브라우저 하나 안에서 격리된 컨텍스트(+페이지)를 돌려 쓰는 풀
+#
+# 크롬 프로세스는 하나만 띄우고, 동시에 처리할 작업 수만큼 컨텍스트를 만들어 재사용합니다.
+# 일정 페이지 수마다(또는 오류가 나면) 컨텍스트를 새로 만들어서 메모리가 쌓이지 않게 합니다.
+# (DBPIA 비동기 엔진과 지그재그 배치 크롤러가 같이 사용)
+import asyncio  # 비동기 처리
+
+from common.blocking import install_route_blocking
+from common.metrics import STAGE_BROWSER_LAUNCH, timed
+from common.replay import install_replay_routing
+
+CONTEXT_MAX_PAGES = 50  # 컨텍스트 하나로 처리할 최대 페이지 수
+
+
+class ContextPool:
+    """브라우저 하나 안의 컨텍스트(+페이지) 풀 (N 페이지마다, 또는 오류 시 교체)"""
+
+    def __init__(self, browser, size, max_pages=CONTEXT_MAX_PAGES, metrics=None, blocking=None,
+                 traffic=None):
+        self.browser = browser
+        self.size = size
+        self.max_pages = max_pages
+        self.metrics = metrics
+        self.blocking = blocking  # 요청 차단 정책 (컨텍스트마다 설치)
+        self.traffic = traffic  # 전송량 집계 (PageTraffic, 새 페이지마다 연결)
+        self._idle = asyncio.Queue()
+        self._live = 0
+        self._cond = None
+        self.launched = 0
+        self.recycled = 0
+
+    async def _new_slot(self):
+        with timed(self.metrics, STAGE_BROWSER_LAUNCH):
+            context = await self.browser.new_context(locale='ko-KR')
+            await install_replay_routing(context)  # 재생 모드일 때만 (차단 규칙보다 먼저)
+            if self.blocking is not None:
+                await install_route_blocking(context, self.blocking)
+            page = await context.new_page()
+            if self.traffic is not None:
+                self.traffic.attach(page)
+        self.launched += 1
+        return {'context': context, 'page': page, 'pages': 0}
+
+    def _condition(self):
+        if self._cond is None:
+            self._cond = asyncio.Condition()  # 이벤트 루프 안에서 만들어야 해서 처음 쓸 때 생성
+        return self._cond
+
+    async def checkout(self):
+        """쉬는 컨텍스트를 빌려줌 (없으면 size 까지 새로 만들고, 다 쓰는 중이면 반납/교체될 때까지 대기)"""
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: not self._idle.empty() or self._live < self.size)
+            if not self._idle.empty():
+                return self._idle.get_nowait()
+            self._live += 1
+        try:
+            return await self._new_slot()
+        except BaseException:
+            async with cond:
+                self._live -= 1
+                cond.notify()
+            raise
+
+    async def checkin(self, slot, crashed=False):
+        slot['pages'] += 1
+        cond = self._condition()
+        if crashed or slot['pages'] >= self.max_pages:
+            # 자리를 먼저 비워서 기다리는 쪽이 새 컨텍스트를 만들 수 있게 함
+            async with cond:
+                self._live -= 1
+                cond.notify()
+            self.recycled += 1
+            try:
+                await slot['context'].close()
+            except Exception:
+                pass
+            return
+        async with cond:
+            self._idle.put_nowait(slot)
+            cond.notify()
+
+    async def close(self):
+        while not self._idle.empty():
+            slot = self._idle.get_nowait()
+            try:
+                await slot['context'].close()
+            except Exception:
+                pass
+        self._live = 0
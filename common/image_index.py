@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+# 다운로드한 후기 이미지 후처리: 썸네일 + 지각 해시(pHash) + 유사 이미지 검색 인덱스
+#
+# - 이미지 디코딩/리사이즈는 CPU 작업이라 프로세스 풀(코어 수만큼)에서 돌립니다.
+#   이미지 하나는 한 번만 디코딩하고, 그 결과로 썸네일과 해시를 같이 만듭니다.
+# - 지각 해시는 64비트 pHash (32x32 흑백 → DCT → 왼쪽 위 8x8 이 중앙값보다 큰지)
+#   사진을 다시 압축하거나 크기를 바꿔도 해시가 거의 같아서, 해밍 거리로 비슷한 사진을 찾습니다.
+# - 인덱스는 NumPy uint64 배열 하나(+ 내용 해시 배열)라서, 수십만 장도 XOR + 비트 세기 한 번으로 검색합니다.
+# 같은 내용(sha256)의 이미지는 image_store 에서 이미 합쳐졌으므로 내용 해시마다 한 번만 처리합니다.
+import asyncio  # 비동기 처리
+from concurrent.futures import ProcessPoolExecutor  # 프로세스 풀
+import os  # 파일 시스템 관련 기능
+
+try:
+    import numpy as np  # 해시 인덱스 (선택)
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image, ImageOps  # 이미지 디코딩/썸네일 (선택)
+except ImportError:
+    Image = None
+    ImageOps = None
+
+PHASH_INDEX_PATH = 'downloads/images/phash_index.npz'
+THUMBNAIL_DIR = 'downloads/thumbnails'
+THUMBNAIL_SIZE = 256  # 썸네일 가로/세로 (가운데를 잘라 정사각형)
+THUMBNAIL_QUALITY = 80
+PHASH_IMAGE_SIZE = 32  # DCT 입력 크기
+PHASH_BLOCK = 8  # 해시에 쓰는 저주파 영역 (8x8 = 64비트)
+DEFAULT_MAX_DISTANCE = 6  # 이 거리 이하면 같은 사진으로 봄 (64비트 중)
+
+
+def postprocess_available():
+    """numpy, Pillow 가 모두 설치되어 있는지"""
+    return np is not None and Image is not None
+
+
+def thumbnail_path_for(content_hash, thumb_dir=THUMBNAIL_DIR):
+    return os.path.join(thumb_dir, content_hash[:2], content_hash + '.jpg')
+
+
+_dct_matrix = None
+
+
+def _dct(size):
+    """DCT-II 변환 행렬 (프로세스마다 한 번만 계산)"""
+    global _dct_matrix
+    if _dct_matrix is None or _dct_matrix.shape[0] != size:
+        n = np.arange(size)
+        matrix = np.sqrt(2.0 / size) * np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+        matrix[0, :] /= np.sqrt(2.0)
+        _dct_matrix = matrix.astype(np.float32)
+    return _dct_matrix
+
+
+def phash_of(gray_image):
+    """흑백 이미지 → 64비트 pHash (int)"""
+    small = gray_image.resize((PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE), Image.BILINEAR)
+    pixels = np.asarray(small, dtype=np.float32)
+    matrix = _dct(PHASH_IMAGE_SIZE)
+    coefficients = matrix @ pixels @ matrix.T
+    block = coefficients[:PHASH_BLOCK, :PHASH_BLOCK].flatten()
+    median = np.median(block[1:])  # 전체 밝기(DC)는 빼고 비교
+    bits = np.packbits(block > median)
+    return int.from_bytes(bits.tobytes(), 'big')
+
+
+def process_image(job):
+    """(프로세스 풀에서 실행) 이미지 하나를 한 번 디코딩해서 썸네일 저장 + pHash 계산"""
+    content_hash, path, thumb_path, thumb_size = job
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+            img.draft('RGB', (thumb_size * 2, thumb_size * 2))  # JPEG 는 작게 디코딩 (원본 해상도 불필요)
+            rgb = img.convert('RGB')
+        thumbnail = ImageOps.fit(rgb, (thumb_size, thumb_size), Image.BILINEAR)
+        os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+        thumbnail.save(thumb_path, 'JPEG', quality=THUMBNAIL_QUALITY)
+        return {
+            'hash': content_hash,
+            'phash': phash_of(rgb.convert('L')),
+            'thumbnail': thumb_path,
+            'width': width,
+            'height': height,
+        }
+    except Exception as e:
+        return {'hash': content_hash, 'error': f"{type(e).__name__}: {e}"}
+
+
+_POPCOUNT_TABLE = None
+
+
+def hamming_distances(hashes, value):
+    """uint64 배열의 각 해시와 value 사이의 해밍 거리 (배열)"""
+    global _POPCOUNT_TABLE
+    xor = np.bitwise_xor(hashes, np.uint64(value))
+    if hasattr(np, 'bitwise_count'):  # numpy 2.0+
+        return np.bitwise_count(xor)
+    if _POPCOUNT_TABLE is None:
+        _POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+    return _POPCOUNT_TABLE[xor.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+class PerceptualIndex:
+    """내용 해시(sha256) → pHash 인덱스 (NumPy 배열, .npz 파일로 저장)"""
+
+    def __init__(self, path=PHASH_INDEX_PATH):
+        if np is None:
+            raise ImportError("이미지 해시 인덱스에는 numpy가 필요합니다 (pip install numpy)")
+        self.path = path
+        self.hashes = np.zeros(0, dtype=np.uint64)
+        self.keys = np.zeros(0, dtype='S64')
+        if os.path.exists(path):
+            with np.load(path) as data:
+                self.hashes = data['hashes']
+                self.keys = data['keys']
+        self._positions = {key.decode(): i for i, key in enumerate(self.keys)}
+        self._pending_hashes = []
+        self._pending_keys = []
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, content_hash):
+        return content_hash in self._positions
+
+    def add(self, content_hash, phash):
+        if content_hash in self._positions:
+            return
+        self._positions[content_hash] = len(self._positions)
+        self._pending_hashes.append(phash)
+        self._pending_keys.append(content_hash.encode())
+
+    def _compact(self):
+        """추가분을 배열 뒤에 붙임 (검색/저장 전에 한 번)"""
+        if self._pending_hashes:
+            self.hashes = np.concatenate([self.hashes, np.array(self._pending_hashes, dtype=np.uint64)])
+            self.keys = np.concatenate([self.keys, np.array(self._pending_keys, dtype='S64')])
+            self._pending_hashes = []
+            self._pending_keys = []
+
+    def phash(self, content_hash):
+        """저장된 pHash (없으면 None)"""
+        position = self._positions.get(content_hash)
+        if position is None:
+            return None
+        self._compact()
+        return int(self.hashes[position])
+
+    def near(self, phash, max_distance=DEFAULT_MAX_DISTANCE, limit=None):
+        """pHash 와 비슷한 이미지 [(내용 해시, 거리)] (가까운 순서)"""
+        self._compact()
+        if not len(self.hashes):
+            return []
+        distances = hamming_distances(self.hashes, phash)
+        matches = np.nonzero(distances <= max_distance)[0]
+        matches = matches[np.argsort(distances[matches], kind='stable')]
+        if limit is not None:
+            matches = matches[:limit]
+        return [(self.keys[i].decode(), int(distances[i])) for i in matches]
+
+    def duplicates_of(self, content_hash, max_distance=DEFAULT_MAX_DISTANCE, limit=None):
+        """이미지(내용 해시)와 비슷한 다른 이미지 목록"""
+        phash = self.phash(content_hash)
+        if phash is None:
+            return []
+        return [match for match in self.near(phash, max_distance, limit) if match[0] != content_hash]
+
+    def save(self):
+        """임시 파일에 쓰고 교체 (쓰는 중에 죽어도 기존 인덱스는 남음)"""
+        self._compact()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, hashes=self.hashes, keys=self.keys)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+
+class ImagePostProcessor:
+    """download_images 결과(URL → {hash, path, bytes})를 프로세스 풀에서 후처리해서 인덱스에 추가"""
+
+    def __init__(self, index_path=PHASH_INDEX_PATH, thumb_dir=THUMBNAIL_DIR, workers=None,
+                 thumb_size=THUMBNAIL_SIZE):
+        if not postprocess_available():
+            raise ImportError("이미지 후처리에는 numpy, Pillow가 필요합니다 (pip install numpy pillow)")
+        self.index = PerceptualIndex(index_path)
+        self.thumb_dir = thumb_dir
+        self.thumb_size = thumb_size
+        self.executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+        self.processed = 0
+        self.skipped = 0  # 이미 인덱스에 있던 이미지
+        self.failed = 0
+
+    def _jobs(self, manifest):
+        jobs = {}
+        for entry in manifest.values():
+            content_hash = entry['hash']
+            if content_hash in self.index:
+                self.skipped += 1
+                continue
+            if content_hash in jobs:
+                continue
+            jobs[content_hash] = (content_hash, entry['path'],
+                                  thumbnail_path_for(content_hash, self.thumb_dir), self.thumb_size)
+        return list(jobs.values())
+
+    def _collect(self, results):
+        for result in results:
+            if 'error' in result:
+                self.failed += 1
+                print(f"🖼️ 이미지 후처리 실패 ({result['hash'][:12]}): {result['error']}")
+                continue
+            self.index.add(result['hash'], result['phash'])
+            self.processed += 1
+
+    def _describe(self, manifest):
+        """URL → {phash(16진수), thumbnail} (후처리에 실패한 이미지는 빠짐)"""
+        described = {}
+        for url, entry in manifest.items():
+            phash = self.index.phash(entry['hash'])
+            if phash is not None:
+                described[url] = {
+                    'phash': f'{phash:016x}',
+                    'thumbnail': thumbnail_path_for(entry['hash'], self.thumb_dir),
+                }
+        return described
+
+    async def process(self, manifest):
+        """(asyncio) 새 이미지만 프로세스 풀에서 처리 - 크롤링 이벤트 루프는 막지 않음"""
+        loop = asyncio.get_running_loop()
+        jobs = self._jobs(manifest)
+        results = await asyncio.gather(*(loop.run_in_executor(self.executor, process_image, job) for job in jobs))
+        self._collect(results)
+        return self._describe(manifest)
+
+    def process_all(self, manifest, chunksize=16):
+        """(동기) 한꺼번에 처리 - 이미 받아 둔 이미지를 다시 색인할 때"""
+        self._collect(self.executor.map(process_image, self._jobs(manifest), chunksize=chunksize))
+        return self._describe(manifest)
+
+    def summary(self):
+        return {
+            'processed': self.processed,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'indexed': len(self.index),
+        }
+
+    def print_summary(self):
+        stats = self.summary()
+        print(f"🧮 이미지 후처리: 새로 처리 {stats['processed']}개, 이미 있음 {stats['skipped']}개, "
+              f"실패 {stats['failed']}개 (인덱스 {stats['indexed']}개)")
+
+    def close(self):
+        self.executor.shutdown()
+        self.index.save()
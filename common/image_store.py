@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+# 내용 해시(sha256)로 이름을 붙이는 이미지 저장소
+#
+# - 응답을 조각(chunk) 단위로 받아서 해시를 계산하며 바로 임시 파일에 씁니다 (전체를 메모리에 두지 않음)
+# - 파일 이름은 내용 해시라서, 여러 상품에 같은 사진이 올라와도 한 번만 저장됩니다
+#   downloads/images/ab/abcdef....jpg
+# - 공용 인덱스(SQLite)에 URL → 해시를 기록해서, 이미 받은 URL은 다운로드도 하지 않습니다
+# - 상품마다 manifest.json 에 URL → 해시/경로를 남깁니다
+from datetime import datetime  # 기록 시각
+import hashlib  # 내용 해시
+import json  # manifest 저장
+import os  # 파일 시스템 관련 기능
+import sqlite3  # 공용 해시 인덱스
+import uuid  # 임시 파일 이름
+from urllib.parse import urlsplit  # 확장자 추출
+
+import aiofiles  # 비동기 파일 쓰기
+
+from common.concurrency import HttpStatusError
+from common.replay import site_url
+
+IMAGE_STORE_DIR = 'downloads/images'
+MANIFEST_NAME = 'manifest.json'
+CHUNK_SIZE = 64 * 1024
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.avif')
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'image/avif': '.avif',
+}
+DEFAULT_EXTENSION = '.jpg'
+
+
+def guess_extension(url, content_type=None):
+    """URL 확장자 → Content-Type → 기본값(.jpg) 순서로 확장자 결정"""
+    path = urlsplit(url).path.lower()
+    for extension in IMAGE_EXTENSIONS:
+        if path.endswith(extension):
+            return '.jpg' if extension == '.jpeg' else extension
+    if content_type:
+        return CONTENT_TYPE_EXTENSIONS.get(content_type.split(';')[0].strip().lower(), DEFAULT_EXTENSION)
+    return DEFAULT_EXTENSION
+
+
+class ImageStore:
+    """내용 해시 기반 이미지 저장소 + URL/해시 인덱스"""
+
+    def __init__(self, root=IMAGE_STORE_DIR, index_path=None):
+        self.root = root
+        self.tmp_dir = os.path.join(root, '.tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self.conn = sqlite3.connect(index_path or os.path.join(root, 'index.sqlite3'))
+        self.conn.execute('PRAGMA journal_mode=WAL')  # 여러 크롤러 프로세스가 같이 사용
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                fetched_at TEXT NOT NULL
+            );
+        ''')
+        self.conn.commit()
+        self.downloaded = 0  # 실제로 받은 이미지 수
+        self.url_hits = 0  # 이미 받은 URL이라 건너뛴 수
+        self.content_hits = 0  # 받았지만 같은 내용이 있어서 저장하지 않은 수
+        self.bytes_written = 0
+        self.bytes_saved = 0  # 중복이라 디스크에 쓰지 않은 바이트
+
+    def path_for(self, digest, extension):
+        return os.path.join(self.root, digest[:2], digest + extension)
+
+    def lookup_url(self, url):
+        """이미 받은 URL이면 {hash, path, bytes}, 아니면 None"""
+        row = self.conn.execute(
+            'SELECT b.hash, b.path, b.size FROM urls u JOIN blobs b ON b.hash = u.hash WHERE u.url = ?', (url,),
+        ).fetchone()
+        if row is None or not os.path.exists(row[1]):
+            return None
+        self.url_hits += 1
+        self.bytes_saved += row[2]
+        return {'hash': row[0], 'path': row[1], 'bytes': row[2]}
+
+    def new_temp_path(self):
+        return os.path.join(self.tmp_dir, uuid.uuid4().hex)
+
+    def commit(self, url, tmp_path, digest, size, extension):
+        """임시 파일을 해시 이름으로 옮기고 인덱스에 기록 (같은 내용이 있으면 임시 파일만 삭제)"""
+        now = datetime.now().isoformat(timespec='seconds')
+        row = self.conn.execute('SELECT path FROM blobs WHERE hash = ?', (digest,)).fetchone()
+        if row is not None and os.path.exists(row[0]):
+            os.remove(tmp_path)
+            path = row[0]
+            self.content_hits += 1
+            self.bytes_saved += size
+        else:
+            path = self.path_for(digest, extension)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+            self.conn.execute(
+                'INSERT OR REPLACE INTO blobs (hash, path, size, created_at) VALUES (?, ?, ?, ?)',
+                (digest, path, size, now),
+            )
+            self.bytes_written += size
+        self.conn.execute(
+            'INSERT OR REPLACE INTO urls (url, hash, fetched_at) VALUES (?, ?, ?)', (url, digest, now),
+        )
+        self.conn.commit()
+        self.downloaded += 1
+        return {'hash': digest, 'path': path, 'bytes': size}
+
+    def summary(self):
+        return {
+            'downloaded': self.downloaded,
+            'url_hits': self.url_hits,
+            'content_hits': self.content_hits,
+            'bytes_written': self.bytes_written,
+            'bytes_saved': self.bytes_saved,
+        }
+
+    def print_summary(self):
+        stats = self.summary()
+        print(f"🗂️ 이미지 저장소: 새로 받음 {stats['downloaded']}개, URL 중복 {stats['url_hits']}개, "
+              f"내용 중복 {stats['content_hits']}개, 저장 {stats['bytes_written'] / 1024 / 1024:.1f} MB, "
+              f"절약 {stats['bytes_saved'] / 1024 / 1024:.1f} MB")
+
+    def close(self):
+        self.conn.close()
+
+
+async def stream_to_store(session, url, store, chunk_size=CHUNK_SIZE):
+    """이미지를 조각 단위로 받아서 저장소에 저장 ({hash, path, bytes} 반환)"""
+    tmp_path = store.new_temp_path()
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with session.get(site_url(url)) as response:
+            if response.status != 200:
+                raise HttpStatusError(response.status, url)
+            extension = guess_extension(url, response.headers.get('Content-Type'))
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    await f.write(chunk)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return store.commit(url, tmp_path, digest.hexdigest(), size, extension)
+
+
+def write_manifest(product_dir, entries):
+    """상품 폴더의 manifest.json 에 URL → {hash, path, bytes} 기록 (기존 내용과 합침)"""
+    os.makedirs(product_dir, exist_ok=True)
+    path = os.path.join(product_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+    manifest.update(entries)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+# 크롤링 한 번(run)의 단계별 시간/카운터 기록
+#
+# - 단계(브라우저 실행, 페이지 이동, 요소 대기, 추출, 이미지 다운로드, 파일 쓰기 ...)마다
+#   지연 시간 히스토그램을 쌓고
+# - 페이지 수, 바이트 수, 재시도, 실패 같은 카운터를 셉니다.
+# 끝나면 JSON 요약을 data/metrics/ 에 남기고, 원하면 Prometheus textfile 도 씁니다.
+# (node_exporter 의 textfile collector 가 읽을 수 있는 형식)
+from contextlib import contextmanager, nullcontext  # with 문 지원
+from datetime import datetime  # 실행 시각
+import json  # 요약 저장
+import os  # 파일 시스템 관련 기능
+import random  # 표본 추출
+import threading  # 여러 스레드에서 같이 기록
+import time  # 시간 관련 기능
+
+METRICS_DIR = 'data/metrics'
+
+# 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+MAX_SAMPLES = 10000  # 백분위 계산용으로 단계마다 보관하는 최대 표본 수
+
+# 자주 쓰는 단계/카운터 이름
+STAGE_BROWSER_LAUNCH = 'browser_launch'
+STAGE_NAVIGATION = 'navigation'
+STAGE_HTTP_FETCH = 'http_fetch'
+STAGE_READINESS_WAIT = 'readiness_wait'
+STAGE_EXTRACTION = 'extraction'
+STAGE_IMAGE_DOWNLOAD = 'image_download'
+STAGE_IMAGE_POSTPROCESS = 'image_postprocess'
+STAGE_FILE_WRITE = 'file_write'
+STAGE_UPLOAD = 'upload'
+
+
+class LatencyHistogram:
+    """지연 시간 히스토그램 (+ 백분위용 표본)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples = []
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+        else:
+            self.bucket_counts[-1] += 1
+        # 표본이 꽉 차면 같은 확률로 교체 (reservoir sampling)
+        if len(self._samples) < MAX_SAMPLES:
+            self._samples.append(seconds)
+        else:
+            slot = random.randrange(self.count)
+            if slot < MAX_SAMPLES:
+                self._samples[slot] = seconds
+
+    def percentile(self, q):
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def cumulative_counts(self):
+        """Prometheus 형식 (구간 이하 누적 개수)"""
+        counts = []
+        running = 0
+        for value in self.bucket_counts:
+            running += value
+            counts.append(running)
+        return counts
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total_sec': round(self.total, 3),
+            'avg_sec': round(self.total / self.count, 4) if self.count else 0.0,
+            'p50_sec': round(self.percentile(0.50), 4),
+            'p95_sec': round(self.percentile(0.95), 4),
+            'p99_sec': round(self.percentile(0.99), 4),
+            'max_sec': round(self.max, 4),
+        }
+
+
+class RunMetrics:
+    """크롤링 한 번의 단계별 시간과 카운터"""
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def incr(self, counter, amount=1):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    @contextmanager
+    def stage(self, name):
+        """with 문 안의 시간을 단계로 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def elapsed(self):
+        return time.perf_counter() - self._started
+
+    def summary(self, extra=None):
+        """JSON 으로 저장할 실행 요약"""
+        elapsed = self.elapsed()
+        with self._lock:
+            stages = {name: histogram.summary() for name, histogram in self.stages.items()}
+            counters = dict(self.counters)
+        pages = counters.get('pages', 0)
+        result = {
+            'crawler': self.crawler,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'elapsed_sec': round(elapsed, 3),
+            'pages_per_sec': round(pages / elapsed, 3) if elapsed > 0 else 0.0,
+            'stages': stages,
+            'counters': counters,
+        }
+        if extra:
+            result.update(extra)
+        return result
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식"""
+        crawler = self.crawler
+        lines = [
+            '# HELP crawler_stage_seconds Time spent per crawl stage.',
+            '# TYPE crawler_stage_seconds histogram',
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self.stages.items()):
+                labels = f'crawler="{crawler}",stage="{stage}"'
+                bounds = [str(bound) for bound in histogram.buckets] + ['+Inf']
+                for bound, count in zip(bounds, histogram.cumulative_counts()):
+                    lines.append(f'crawler_stage_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'crawler_stage_seconds_sum{{{labels}}} {histogram.total:.6f}')
+                lines.append(f'crawler_stage_seconds_count{{{labels}}} {histogram.count}')
+            counters = sorted(self.counters.items())
+        lines.append('# HELP crawler_events_total Crawl counters (pages, bytes, retries, failures).')
+        lines.append('# TYPE crawler_events_total counter')
+        for name, value in counters:
+            lines.append(f'crawler_events_total{{crawler="{crawler}",event="{name}"}} {value}')
+        lines.append('# HELP crawler_run_seconds Wall time of the last run.')
+        lines.append('# TYPE crawler_run_seconds gauge')
+        lines.append(f'crawler_run_seconds{{crawler="{crawler}"}} {self.elapsed():.3f}')
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path=None, extra=None):
+        """JSON 요약 저장 (경로가 없으면 data/metrics/<crawler>_<시각>.json)"""
+        if path is None:
+            timestamp = self.started_at.strftime('%Y%m%d_%H%M%S')
+            path = os.path.join(METRICS_DIR, f'{self.crawler}_{timestamp}.json')
+        _write_atomic(path, json.dumps(self.summary(extra), ensure_ascii=False, indent=2))
+        return path
+
+    def write_prometheus(self, path):
+        """Prometheus textfile 저장 (수집기가 반쯤 쓴 파일을 읽지 않도록 이름 바꾸기로 교체)"""
+        _write_atomic(path, self.to_prometheus())
+        return path
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"📊 단계별 시간 (총 {summary['elapsed_sec']:.1f}초, {summary['pages_per_sec']:.2f} 페이지/초)")
+        for stage, stats in sorted(summary['stages'].items(), key=lambda item: -item[1]['total_sec']):
+            print(f"   {stage:<16} {stats['count']:>6}회  합계 {stats['total_sec']:>8.2f}초  "
+                  f"p50 {stats['p50_sec']:.3f}  p95 {stats['p95_sec']:.3f}  최대 {stats['max_sec']:.3f}")
+        if summary['counters']:
+            print("   " + ", ".join(f"{name}={value}" for name, value in sorted(summary['counters'].items())))
+
+    def report(self, json_path=None, prom_path=None, extra=None):
+        """요약 출력 + JSON 저장 (+ Prometheus textfile)"""
+        self.print_summary()
+        try:
+            saved = self.write_json(json_path, extra)
+            print(f"📈 실행 요약 저장: {saved}")
+            if prom_path:
+                self.write_prometheus(prom_path)
+                print(f"📈 Prometheus textfile 저장: {prom_path}")
+        except OSError as e:
+            print(f"⚠️ 실행 요약 저장 실패: {e}")
+
+
+def _write_atomic(path, text):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def timed(metrics, stage):
+    """metrics 가 없어도 쓸 수 있는 단계 기록 (with timed(metrics, 'navigation'): ...)"""
+    if metrics is None:
+        return nullcontext()
+    return metrics.stage(stage)
+
+
+def count(metrics, counter, amount=1):
+    """metrics 가 없어도 쓸 수 있는 카운터 증가"""
+    if metrics is not None:
+        metrics.incr(counter, amount)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+# 고정 sleep 대신 "필요한 요소가 나타날 때까지" 기다리는 공통 대기 레이어
+#
+# 조건은 자바스크립트 식 하나로 표현해서 Selenium(execute_script)과
+# Playwright(wait_for_function) 양쪽에서 그대로 씁니다.
+# 단계별로 실제로 기다린 시간을 기록해서 얼마나 빨라졌는지 볼 수 있습니다.
+from collections import defaultdict  # 단계별 기록
+import threading  # 여러 스레드에서 같이 기록
+import time  # 시간 관련 기능
+
+try:
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+except ImportError:  # dbpia(Selenium)만 쓸 때는 playwright 가 없어도 됨
+    PlaywrightTimeoutError = TimeoutError
+
+# 단계별 최대 대기 시간 (초)
+STEP_TIMEOUTS = {
+    'search_results': 10.0,
+    'paper_detail': 8.0,
+    'review_list': 15.0,
+    'review_scroll': 1.0,
+    'product_title': 10.0,
+    'redirect': 10.0,
+}
+DEFAULT_TIMEOUT = 10.0
+POLL_INTERVAL = 0.1  # Selenium 확인 간격 (초)
+
+# DBPIA 검색 결과: 논문 링크가 있거나 "검색결과 없음" 문구가 보이면 준비 완료
+SEARCH_RESULTS_READY = '''(
+    !!document.querySelector('.thesis__pageLink')
+    || (!!document.body && document.body.innerText.indexOf('검색결과가 없습니다') !== -1)
+)'''
+
+# DBPIA 상세: 본문(JSON-LD 또는 thesis__* 요소)과 초록이 있으면 준비 완료 (초록이 없는 논문은 로딩 완료 시점)
+# JSON-LD 가 없는 페이지도 파서가 thesis__* 클래스로 읽으므로 그것만으로 기다리지 않음
+PAPER_DETAIL_READY = '''(
+    (!!document.querySelector('script[type="application/ld+json"]')
+     || !!document.querySelector('.thesis__title, .thesis__pageLink, .abstractTxt'))
+    && (!!document.querySelector('.abstractTxt') || document.readyState === 'complete')
+)'''
+
+
+class ReadinessTracker:
+    """단계별 실제 대기 시간 기록 (metrics 를 주면 readiness_wait 단계로도 기록)"""
+
+    def __init__(self, metrics=None):
+        self._lock = threading.Lock()
+        self.waits = defaultdict(list)
+        self.timeouts = defaultdict(int)
+        self.metrics = metrics
+
+    def record(self, step, seconds, ready):
+        with self._lock:
+            self.waits[step].append(seconds)
+            if not ready:
+                self.timeouts[step] += 1
+        if self.metrics is not None:
+            self.metrics.observe('readiness_wait', seconds)
+            if not ready:
+                self.metrics.incr('readiness_timeouts')
+
+    def summary(self):
+        """{단계: {횟수, 합계, 평균, 최대, 타임아웃}}"""
+        with self._lock:
+            result = {}
+            for step, values in self.waits.items():
+                result[step] = {
+                    'count': len(values),
+                    'total_sec': round(sum(values), 3),
+                    'avg_sec': round(sum(values) / len(values), 3),
+                    'max_sec': round(max(values), 3),
+                    'timeouts': self.timeouts[step],
+                }
+            return result
+
+    def print_summary(self):
+        for step, stats in self.summary().items():
+            print(f"⏳ 대기[{step}]: {stats['count']}회, 평균 {stats['avg_sec']:.2f}초, "
+                  f"최대 {stats['max_sec']:.2f}초, 타임아웃 {stats['timeouts']}회")
+
+
+def _timeout_for(step, timeout):
+    if timeout is not None:
+        return timeout
+    return STEP_TIMEOUTS.get(step, DEFAULT_TIMEOUT)
+
+
+def wait_for_selenium(browser, step, js_condition, timeout=None, tracker=None):
+    """Selenium: 조건이 참이 될 때까지 대기 (준비되면 True, 타임아웃이면 False)"""
+    timeout = _timeout_for(step, timeout)
+    script = f"return {js_condition};"
+    started = time.perf_counter()
+    ready = False
+    while True:
+        try:
+            ready = bool(browser.execute_script(script))
+        except Exception:
+            ready = False  # 페이지 전환 중에는 스크립트가 실패할 수 있음
+        elapsed = time.perf_counter() - started
+        if ready or elapsed >= timeout:
+            break
+        time.sleep(POLL_INTERVAL)
+    if tracker is not None:
+        tracker.record(step, time.perf_counter() - started, ready)
+    return ready
+
+
+async def wait_for_page(page, step, js_condition, timeout=None, tracker=None, arg=None):
+    """Playwright: 조건 함수/식이 참이 될 때까지 대기 (준비되면 True, 타임아웃이면 False)"""
+    timeout = _timeout_for(step, timeout)
+    started = time.perf_counter()
+    try:
+        await page.wait_for_function(js_condition, arg=arg, timeout=timeout * 1000)
+        ready = True
+    except PlaywrightTimeoutError:
+        ready = False
+    if tracker is not None:
+        tracker.record(step, time.perf_counter() - started, ready)
+    return ready
+
+
+async def wait_for_selector(page, step, selector, timeout=None, tracker=None):
+    """Playwright: 선택자가 DOM에 붙을 때까지 대기"""
+    timeout = _timeout_for(step, timeout)
+    started = time.perf_counter()
+    try:
+        await page.wait_for_selector(selector, state='attached', timeout=timeout * 1000)
+        ready = True
+    except PlaywrightTimeoutError:
+        ready = False
+    if tracker is not None:
+        tracker.record(step, time.perf_counter() - started, ready)
+    return ready
+
+
+async def wait_for_more_items(page, step, selector, previous_count, timeout=None, tracker=None):
+    """Playwright: 선택자 요소 개수가 previous_count 보다 많아질 때까지 대기 (스크롤 후)"""
+    return await wait_for_page(
+        page, step,
+        '(args) => document.querySelectorAll(args.selector).length > args.count',
+        timeout=timeout, tracker=tracker,
+        arg={'selector': selector, 'count': previous_count},
+    )
+
+
+async def count_items(page, selector):
+    """선택자에 맞는 요소 개수"""
+    return await page.evaluate('(selector) => document.querySelectorAll(selector).length', selector)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+# 녹화해 둔 응답으로 크롤러를 돌리는 재생 모드 (크롤러 쪽)
+#
+# 환경 변수 CRAWLER_REPLAY_URL 에 재생 서버 주소(benchmarks/replay_server.py)를 주면
+# 실제 사이트 대신 그 서버에 요청합니다. 주소 모양은
+#   https://www.dbpia.co.kr/search/topSearch?query=...  →  http://127.0.0.1:8780/www.dbpia.co.kr/search/topSearch?query=...
+# - HTTP 클라이언트(urllib3/aiohttp/Selenium)는 site_url() 로 바꾼 주소로 요청합니다.
+#   재생 서버는 HTML 안의 절대 주소도 같은 모양으로 바꿔 주므로, 페이지에서 읽은 링크도 그대로 재생 서버로 갑니다.
+# - Playwright 는 install_replay_routing() 이 컨텍스트의 모든 요청을 가로채서 재생 서버 응답으로 채웁니다.
+#   (페이지 주소는 원래 주소 그대로라서 크롤러 코드는 바뀌지 않음)
+# 환경 변수가 없으면 둘 다 아무것도 하지 않습니다.
+import hashlib  # POST 본문 해시
+import os  # 환경 변수
+from urllib.parse import urlsplit  # 주소 나누기
+
+REPLAY_ENV = 'CRAWLER_REPLAY_URL'
+RAW_HEADER = 'X-Replay-Raw'  # 브라우저 요청: 본문/Location 의 주소를 바꾸지 말라는 표시
+
+
+def replay_base():
+    """재생 서버 주소 (재생 모드가 아니면 None)"""
+    base = os.environ.get(REPLAY_ENV)
+    return base.rstrip('/') if base else None
+
+
+def to_replay_url(url, base):
+    """원래 주소 → 재생 서버 주소 (이미 재생 서버 주소거나 http(s) 가 아니면 그대로)"""
+    if url.startswith(base + '/'):
+        return url
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return url
+    return f"{base}/{parts.netloc}{parts.path or '/'}" + (f'?{parts.query}' if parts.query else '')
+
+
+def site_url(url):
+    """재생 모드면 재생 서버 주소로, 아니면 그대로"""
+    base = replay_base()
+    return to_replay_url(url, base) if base else url
+
+
+def replay_key(method, url, body=None):
+    """녹화/재생에서 같은 요청을 찾는 키 (스킴과 #조각은 무시, POST 는 본문 해시 포함)"""
+    parts = urlsplit(url)
+    key = f"{method.upper()} {parts.netloc}{parts.path or '/'}" + (f'?{parts.query}' if parts.query else '')
+    if body and method.upper() not in ('GET', 'HEAD'):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        key += ' ' + hashlib.sha1(body).hexdigest()[:16]
+    return key
+
+
+async def install_replay_routing(target):
+    """Playwright context(또는 page)의 모든 요청을 재생 서버로 보냄 (재생 모드가 아니면 False)
+
+    차단 규칙(install_route_blocking)보다 먼저 설치해야 차단하지 않은 요청만 여기로 옴
+    """
+    base = replay_base()
+    if base is None:
+        return False
+
+    async def handle(route):
+        request = route.request
+        if not request.url.startswith(('http://', 'https://')):
+            await route.fallback()
+            return
+        headers = dict(request.headers)
+        headers[RAW_HEADER] = '1'
+        try:
+            # 리디렉션은 브라우저가 따라가도록 그대로 돌려줌
+            response = await route.fetch(url=to_replay_url(request.url, base), headers=headers, max_redirects=0)
+        except Exception:
+            await route.abort()
+            return
+        await route.fulfill(response=response)
+
+    await target.route('**/*', handle)
+    return True
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+# 실패한 작업 재시도 (지수 백오프 + 지터) 와 최종 실패 보고서
+#
+# - 오류를 일시적(transient: 타임아웃, 429/5xx, 연결 끊김)과 영구적(permanent: 404 등)으로 나누고
+# - 일시적 오류만 RetryQueue 에 넣어서, 다른 작업이 다 끝난 뒤(백오프 시간이 지나면) 다시 처리합니다.
+#   실패한 스레드/코루틴이 그 자리에서 sleep 하지 않으므로 정상 작업은 막히지 않습니다.
+# - 횟수를 다 써도 실패하면 dead letter 로 모아서 data/dead_letters/ 에 JSONL 로 남깁니다.
+from datetime import datetime  # 실패 시각
+import json  # 보고서 저장
+import os  # 파일 시스템 관련 기능
+import random  # 지터
+import threading  # 여러 스레드에서 같이 사용
+import time  # 시간 관련 기능
+
+from common.concurrency import is_overload_error
+
+DEAD_LETTER_DIR = 'data/dead_letters'
+
+TRANSIENT = 'transient'
+PERMANENT = 'permanent'
+
+# 다시 해도 결과가 같은 HTTP 상태
+PERMANENT_STATUSES = {400, 401, 403, 404, 410, 451}
+
+# 이름으로 구분하는 일시적 오류 (라이브러리마다 공통 부모가 없음)
+TRANSIENT_ERROR_NAMES = (
+    'Timeout', 'Connection', 'ProtocolError', 'MaxRetryError', 'RemoteDisconnected',
+    'ClientPayloadError', 'ServerDisconnected', 'WebDriverException', 'InvalidSessionId',
+)
+# 브라우저 오류 메시지 중 일시적인 것 (net::ERR_CONNECTION_RESET 등)
+TRANSIENT_MESSAGES = ('net::ERR_', 'timed out', 'Target closed', 'disconnected', 'crashed')
+
+
+def classify_error(error):
+    """오류 종류 ('transient' 또는 'permanent')"""
+    status = getattr(error, 'status', None)
+    if isinstance(status, int) and status in PERMANENT_STATUSES:
+        return PERMANENT
+    if is_overload_error(error):
+        return TRANSIENT
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return TRANSIENT
+    name = type(error).__name__
+    if any(part in name for part in TRANSIENT_ERROR_NAMES):
+        return TRANSIENT
+    message = str(error)
+    if any(part in message for part in TRANSIENT_MESSAGES):
+        return TRANSIENT
+    # 파싱 오류처럼 코드/페이지 문제는 다시 해도 같음
+    return PERMANENT
+
+
+class RetryPolicy:
+    """재시도 횟수와 백오프 시간"""
+
+    def __init__(self, max_attempts=3, base_delay=1.0, max_delay=30.0):
+        self.max_attempts = max_attempts  # 첫 시도 포함
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        """attempt 번째 실패 후 기다릴 시간 (full jitter: 0 ~ base * 2^(attempt-1))"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** max(0, attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def should_retry(self, kind, attempt):
+        return kind == TRANSIENT and attempt < self.max_attempts
+
+
+class RetryQueue:
+    """실패한 작업을 모아서 백오프 후 다시 꺼내주는 큐 (스레드 안전)"""
+
+    def __init__(self, policy=None):
+        self.policy = policy or RetryPolicy()
+        self._lock = threading.Lock()
+        self._attempts = {}  # 작업 키 → 지금까지 시도 횟수
+        self._waiting = []  # (다시 할 시각, 키, 작업)
+        self.dead_letters = []
+        self.retried = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._waiting)
+
+    def schedule(self, key, item, kind, message):
+        """실패 기록 (다시 할 거면 True, 최종 실패면 False)"""
+        with self._lock:
+            attempt = self._attempts.get(key, 0) + 1
+            self._attempts[key] = attempt
+            if self.policy.should_retry(kind, attempt):
+                self._waiting.append((time.monotonic() + self.policy.delay(attempt), key, item))
+                self.retried += 1
+                return True
+            self.dead_letters.append({
+                'key': key,
+                'attempts': attempt,
+                'kind': kind,
+                'error': message,
+                'failed_at': datetime.now().isoformat(timespec='seconds'),
+            })
+            return False
+
+    def pop_due(self):
+        """백오프 시간이 지난 작업 목록"""
+        now = time.monotonic()
+        with self._lock:
+            due = [entry for entry in self._waiting if entry[0] <= now]
+            self._waiting = [entry for entry in self._waiting if entry[0] > now]
+        return [item for _ready_at, _key, item in due]
+
+    def next_delay(self):
+        """가장 먼저 다시 할 작업까지 남은 시간 (없으면 None)"""
+        with self._lock:
+            if not self._waiting:
+                return None
+            return max(0.0, min(entry[0] for entry in self._waiting) - time.monotonic())
+
+    def attempts(self, key):
+        with self._lock:
+            return self._attempts.get(key, 0)
+
+    def write_report(self, crawler, path=None):
+        """최종 실패 목록을 JSONL 로 저장 (없으면 저장하지 않고 None)"""
+        if not self.dead_letters:
+            return None
+        if path is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            path = os.path.join(DEAD_LETTER_DIR, f'{crawler}_{timestamp}.jsonl')
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for entry in self.dead_letters:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return path
+
+    def print_summary(self, crawler, path=None):
+        """재시도/최종 실패 요약 출력 + 보고서 저장"""
+        print(f"🔁 재시도 {self.retried}회, 최종 실패 {len(self.dead_letters)}개")
+        saved = self.write_report(crawler, path)
+        if saved:
+            print(f"💀 최종 실패 목록 저장: {saved}")
+        return saved
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# 무한 스크롤 페이지를 "더 이상 안 늘어날 때까지"만 스크롤하는 적응형 스크롤러
+#
+# 고정 횟수 대신 스크롤할 때마다 항목 개수(선택자)와 문서 높이를 보고,
+# 조용한 시간(quiet window) 안에 아무것도 늘지 않으면 바로 멈춥니다.
+# 후기가 3개인 상품은 한두 번 만에 끝나고, 2,000개인 상품은 끝까지(또는 한도까지) 불러옵니다.
+# until 을 주면 스크롤 전마다 확인해서, 참이면 바로 멈춥니다 (증분 크롤링: 이미 본 후기에 도달).
+import time  # 시간 관련 기능
+
+from common.readiness import wait_for_page
+
+DEFAULT_QUIET_WINDOW = 1.0  # 이 시간 안에 새 항목이 없으면 끝으로 판단 (초)
+DEFAULT_TIME_BUDGET = 120.0  # 상품 하나에 쓸 최대 스크롤 시간 (초)
+DEFAULT_MAX_SCROLLS = 1000  # 안전장치
+
+# 항목 개수와 문서 높이를 한 번에 읽기
+MEASURE_JS = '''(selector) => ({
+    count: document.querySelectorAll(selector).length,
+    height: document.documentElement.scrollHeight,
+})'''
+
+# 항목이 늘었거나 문서가 길어졌으면 참
+GREW_JS = '''(args) => (
+    document.querySelectorAll(args.selector).length > args.count
+    || document.documentElement.scrollHeight > args.height
+)'''
+
+
+async def scroll_until_idle(page, selector, quiet_window=DEFAULT_QUIET_WINDOW, max_items=None,
+                            time_budget=DEFAULT_TIME_BUDGET, max_scrolls=DEFAULT_MAX_SCROLLS,
+                            tracker=None, step='review_scroll', until=None):
+    """새 항목이 더 안 붙을 때까지 스크롤 (스크롤 횟수/대기 시간/항목 수/멈춘 이유 반환)
+
+    until: async (page, state) → 참이면 멈춤 (state 는 {count, height})
+    """
+    started = time.perf_counter()
+    waited = 0.0
+    scrolls = 0
+    state = await page.evaluate(MEASURE_JS, selector)
+    stopped_by = 'max_scrolls'
+
+    while scrolls < max_scrolls:
+        if max_items is not None and state['count'] >= max_items:
+            stopped_by = 'max_items'
+            break
+        if time_budget is not None and time.perf_counter() - started >= time_budget:
+            stopped_by = 'time_budget'
+            break
+        if until is not None and await until(page, state):
+            stopped_by = 'caught_up'
+            break
+
+        await page.evaluate('() => window.scrollTo(0, document.documentElement.scrollHeight)')
+        scrolls += 1
+        wait_started = time.perf_counter()
+        grew = await wait_for_page(page, step, GREW_JS, timeout=quiet_window, tracker=tracker,
+                                   arg={'selector': selector, 'count': state['count'], 'height': state['height']})
+        waited += time.perf_counter() - wait_started
+        if not grew:
+            stopped_by = 'quiet'
+            break
+        state = await page.evaluate(MEASURE_JS, selector)
+
+    return {
+        'scrolls': scrolls,
+        'items': state['count'],
+        'wait_sec': round(waited, 3),
+        'elapsed_sec': round(time.perf_counter() - started, 3),
+        'stopped_by': stopped_by,
+    }
+
+
+def format_scroll_stats(stats, label=''):
+    """스크롤 결과 한 줄"""
+    prefix = f"[{label}] " if label else ''
+    return (f"📜 {prefix}스크롤 {stats['scrolls']}회, 항목 {stats['items']}개, "
+            f"대기 {stats['wait_sec']:.1f}초 / 전체 {stats['elapsed_sec']:.1f}초 (멈춘 이유: {stats['stopped_by']})")
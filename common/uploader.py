@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+# 크롤링 결과를 서버로 모아서 보내는 업로더 (배치 + gzip + 재시도 + 백프레셔)
+#
+# - 크롤러는 put() 으로 상품 하나씩 넣고, 업로더가 개수/크기/시간 기준으로 묶어서 한 번에 POST 합니다.
+#   (max_batch_items 개, 또는 JSON 이 max_batch_bytes 를 넘기 전, 또는 첫 항목 후 max_delay 초)
+# - 큐 크기가 정해져 있어서, 서버가 느리면 put() 이 기다리며 크롤러 속도가 자연스럽게 줄어듭니다.
+# - 배치 ID 는 내용의 해시라서 같은 배치를 다시 보내도 ID 가 같습니다 (Idempotency-Key 헤더).
+#   서버는 이미 받은 ID 면 저장하지 않고 성공(200/409)으로 답하면 됩니다.
+# - 일시적 오류(429/5xx/타임아웃/연결 끊김)만 백오프 후 다시 보내고, 끝내 실패한 배치는
+#   내용과 함께 dead letter 보고서로 남겨서 나중에 다시 보낼 수 있게 합니다.
+import asyncio  # 비동기 처리
+import gzip  # 본문 압축
+import hashlib  # 배치 ID
+import json  # JSON 데이터 처리
+import time  # 시간 관련 기능
+from datetime import datetime  # 실패 시각
+
+import aiohttp
+
+from common.concurrency import HttpStatusError
+from common.metrics import STAGE_UPLOAD, count, timed
+from common.retry import RetryPolicy, RetryQueue, classify_error
+
+UPLOAD_BATCH_ITEMS = 200  # 배치 하나의 최대 항목 수
+UPLOAD_BATCH_BYTES = 1024 * 1024  # 배치 하나의 최대 JSON 크기 (압축 전)
+UPLOAD_MAX_DELAY = 1.0  # 첫 항목이 들어오고 이 시간(초)이 지나면 덜 찼어도 보냄
+UPLOAD_QUEUE_SIZE = 1000  # 보내기를 기다리는 항목 수 상한 (넘으면 put() 이 기다림)
+UPLOAD_CONCURRENCY = 2  # 동시에 보내는 배치 수
+UPLOAD_MAX_ATTEMPTS = 4
+UPLOAD_TIMEOUT_SEC = 30
+GZIP_LEVEL = 5  # 속도/압축률 절충
+ACCEPTED_STATUSES = {200, 201, 202, 204, 409}  # 409: 이미 받은 배치
+
+_CLOSE = object()  # 큐 종료 표시
+# 본문 {"batch_id":"<32자>","items":[...]} 에서 항목 배열을 뺀 고정 길이
+_ENVELOPE_BYTES = len(b'{"batch_id":"","items":}') + 32
+
+
+def batch_id_of(body):
+    """배치 본문(JSON bytes) → 배치 ID (같은 내용이면 같은 ID)"""
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def _encode(item):
+    """배치에 넣을 항목 하나 → JSON bytes (공백 없이)"""
+    return json.dumps(item, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class BatchUploader:
+    """항목(dict)을 모아서 서버로 보내는 업로더 (async with 로 사용)"""
+
+    def __init__(self, url, session=None, max_batch_items=UPLOAD_BATCH_ITEMS, max_batch_bytes=UPLOAD_BATCH_BYTES,
+                 max_delay=UPLOAD_MAX_DELAY, queue_size=UPLOAD_QUEUE_SIZE, concurrency=UPLOAD_CONCURRENCY,
+                 max_attempts=UPLOAD_MAX_ATTEMPTS, compress=True, metrics=None):
+        self.url = url
+        self.session = session  # 주면 그 연결 풀을 같이 씀
+        self.max_batch_items = max_batch_items
+        self.max_batch_bytes = max_batch_bytes
+        self.max_delay = max_delay
+        self.compress = compress
+        self.metrics = metrics
+        self.policy = RetryPolicy(max_attempts=max_attempts)
+        self.report = RetryQueue(self.policy)  # 최종 실패 보고서 (배치 단위)
+        self.timeout = aiohttp.ClientTimeout(total=UPLOAD_TIMEOUT_SEC)
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self.concurrency = concurrency
+        self._slots = asyncio.Semaphore(concurrency)
+        self._sending = set()
+        self._collector = None
+        self._own_session = None
+        self.items_queued = 0
+        self.items_sent = 0
+        self.batches_sent = 0
+        self.requests = 0
+        self.retries = 0
+        self.bytes_raw = 0
+        self.bytes_sent = 0
+        self.blocked_sec = 0.0  # put() 이 큐가 차서 기다린 시간 합계
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self._own_session = self.session = aiohttp.ClientSession(connector=connector)
+        self._collector = asyncio.create_task(self._collect())
+
+    async def put(self, item):
+        """항목 하나 넣기 (큐가 차 있으면 자리가 날 때까지 기다림)"""
+        if self._collector is None:
+            raise RuntimeError("업로더를 먼저 시작하세요 (start() 또는 async with)")
+        if self._collector.done():
+            self._collector.result()  # 수집 작업이 죽었으면 그 예외를 그대로
+        if self._queue.full():
+            started = time.perf_counter()
+            await self._queue.put(item)
+            self.blocked_sec += time.perf_counter() - started
+        else:
+            self._queue.put_nowait(item)
+        self.items_queued += 1
+
+    async def _collect(self):
+        """큐에서 항목을 모아 배치를 만들고 보내기 작업을 띄움"""
+        loop = asyncio.get_running_loop()
+        closing = False
+        carry = None  # 앞 배치에 넣으면 max_batch_bytes 를 넘어서 다음 배치 첫 항목으로 넘긴 것 (인코딩됨)
+        while not closing:
+            if carry is None:
+                item = await self._queue.get()
+                if item is _CLOSE:
+                    break
+                carry = _encode(item)
+            # 첫 항목은 혼자서 max_batch_bytes 를 넘어도 그대로 보냄 (나눌 수 없으므로)
+            batch = [carry]
+            size = _ENVELOPE_BYTES + 2 + len(carry)  # 봉투 + "[" + 항목 + "]"
+            carry = None
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch_items:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _CLOSE:
+                    closing = True
+                    break
+                encoded = _encode(item)
+                if size + 1 + len(encoded) > self.max_batch_bytes:  # "," + 항목
+                    carry = encoded
+                    break
+                batch.append(encoded)
+                size += 1 + len(encoded)
+            # 보내는 배치 수가 다 차 있으면 여기서 기다림 → 큐가 차고 → put() 이 기다림
+            await self._slots.acquire()
+            task = asyncio.create_task(self._send(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch):
+        try:
+            items = b'[' + b','.join(batch) + b']'
+            batch_id = batch_id_of(items)
+            body = b'{"batch_id":"' + batch_id.encode() + b'","items":' + items + b'}'
+            headers = {'Content-Type': 'application/json', 'Idempotency-Key': batch_id}
+            payload = body
+            if self.compress:
+                payload = gzip.compress(body, compresslevel=GZIP_LEVEL)
+                headers['Content-Encoding'] = 'gzip'
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    with timed(self.metrics, STAGE_UPLOAD):
+                        await self._post(payload, headers)
+                    break
+                except Exception as e:
+                    kind = classify_error(e)
+                    if not self.policy.should_retry(kind, attempt):
+                        self.report.dead_letters.append({
+                            'key': batch_id,
+                            'attempts': attempt,
+                            'kind': kind,
+                            'error': str(e),
+                            'failed_at': datetime.now().isoformat(timespec='seconds'),
+                            'items': json.loads(items),
+                        })
+                        count(self.metrics, 'upload_failures')
+                        print(f"📮 배치 전송 실패 ({batch_id[:12]}, {len(batch)}개): {e}")
+                        return
+                    self.retries += 1
+                    await asyncio.sleep(self.policy.delay(attempt))
+            self.items_sent += len(batch)
+            self.batches_sent += 1
+            self.bytes_raw += len(body)
+            self.bytes_sent += len(payload)
+            count(self.metrics, 'upload_batches')
+            count(self.metrics, 'upload_items', len(batch))
+        finally:
+            self._slots.release()
+
+    async def _post(self, payload, headers):
+        self.requests += 1
+        async with self.session.post(self.url, data=payload, headers=headers, timeout=self.timeout) as response:
+            await response.read()
+            if response.status not in ACCEPTED_STATUSES:
+                raise HttpStatusError(response.status, self.url)
+
+    async def close(self):
+        """남은 항목을 모두 보내고 정리"""
+        if self._collector is not None:
+            if not self._collector.done():
+                await self._queue.put(_CLOSE)
+            await self._collector
+            if self._sending:
+                await asyncio.gather(*list(self._sending))
+            self._collector = None
+        if self._own_session is not None:
+            await self._own_session.close()
+            self._own_session = self.session = None
+
+    def summary(self):
+        return {
+            'items_queued': self.items_queued,
+            'items_sent': self.items_sent,
+            'batches_sent': self.batches_sent,
+            'requests': self.requests,
+            'retries': self.retries,
+            'failed_batches': len(self.report.dead_letters),
+            'bytes_raw': self.bytes_raw,
+            'bytes_sent': self.bytes_sent,
+            'blocked_sec': round(self.blocked_sec, 3),
+        }
+
+    def print_summary(self, crawler):
+        stats = self.summary()
+        ratio = stats['bytes_sent'] / stats['bytes_raw'] * 100 if stats['bytes_raw'] else 0.0
+        print(f"📮 서버 전송: {stats['items_sent']}/{stats['items_queued']}개를 배치 {stats['batches_sent']}개로 "
+              f"(요청 {stats['requests']}회, 재시도 {stats['retries']}회, 압축 {ratio:.0f}%, "
+              f"대기 {stats['blocked_sec']:.1f}초)")
+        if self.report.dead_letters:
+            saved = self.report.write_report(f'{crawler}_upload')
+            print(f"💀 전송 실패 배치 {len(self.report.dead_letters)}개 저장: {saved}")
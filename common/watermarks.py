@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+# 증분 크롤링용 상품별 워터마크 (이미 본 후기/이미지 키를 SQLite 에 저장)
+#
+# 매일 같은 상품을 다시 돌리면 새 후기는 몇 개뿐인데 전부 다시 불러오고 있었습니다.
+# 상품마다 최근에 본 키(API 후기는 ID, 화면에서 읽은 후기는 내용 해시, 이미지는 URL)와
+# 가장 최근 후기 날짜를 저장해 두고, 다음 크롤링에서는
+# - 이미 본 후기가 나오면 스크롤/다음 페이지 요청을 멈추고
+# - 새로 나온 것(델타)만 결과로 내보냅니다.
+# 워터마크는 결과를 저장한 뒤에 commit() 으로 반영합니다 (저장에 실패하면 다음에 다시 델타로 나옴).
+# 후기 목록이 최신순이라고 가정하므로, FULL_REFRESH_DAYS 마다 한 번은 끝까지 읽어서 놓친 것을 보정합니다.
+import hashlib  # 내용 해시
+import json  # 키 목록 저장
+import os  # 파일 시스템 관련 기능
+import sqlite3  # 워터마크 저장
+import time  # 시간 관련 기능
+
+WATERMARK_PATH = 'data/watermarks.sqlite3'
+WATERMARK_KEEP = 2000  # 상품마다 기억하는 최근 키 수
+FULL_REFRESH_DAYS = 7  # 이 기간이 지나면 한 번은 끝까지 읽음 (0 이면 항상 증분)
+# 목록 끝까지 읽었다고 볼 멈춘 이유 (scroll_until_idle / capture_reviews_from_api 의 stopped_by)
+# time_budget/max_items/max_scrolls/max_pages/timeout 으로 중간에 끊긴 경우는 오래된 후기를 못 봤으므로
+# 전체 갱신으로 치지 않음 (멈춘 이유를 모를 때도 마찬가지)
+END_OF_LIST_STOPS = ('quiet',)
+
+
+def content_key(*parts):
+    """내용 해시 키 (공백 차이는 무시)"""
+    text = '\x1f'.join(' '.join(str(part).split()) for part in parts if part is not None)
+    return 'h:' + hashlib.sha1(text.encode('utf-8')).hexdigest()[:20]
+
+
+class Watermark:
+    """상품 하나의 워터마크 (이번 크롤링 동안 이미 본 키인지 확인)"""
+
+    def __init__(self, scope, product_id, keys=(), newest_date=None, full_at=None, refresh_due=False):
+        self.scope = scope
+        self.product_id = product_id
+        self.previous = list(keys)  # 최근 것부터
+        self.known = set(self.previous)
+        self.newest_date = newest_date
+        self.full_at = full_at
+        # 처음 보는 상품이거나 전체 갱신할 때가 되면 끝까지 읽음 (델타 계산은 그대로)
+        self.stop_early = bool(self.known) and not refresh_due
+        self.caught_up = False  # 이미 본 키에 도달해서 일찍 멈췄는지
+
+    def seen(self, key):
+        return key in self.known
+
+    def should_stop(self, key):
+        """이미 본 키라서 더 읽을 필요가 없는지 (증분일 때만)"""
+        if self.stop_early and key in self.known:
+            self.caught_up = True
+            return True
+        return False
+
+    def summary(self, new_count, seen_count):
+        return {
+            'known': len(self.known),
+            'new': new_count,
+            'seen': seen_count,
+            'caught_up': self.caught_up,
+            'full': not self.stop_early,
+        }
+
+
+class WatermarkStore:
+    """scope(예: zigzag_reviews) + 상품 ID → 워터마크 (SQLite, 여러 크롤러 프로세스가 같이 사용)"""
+
+    def __init__(self, path=WATERMARK_PATH, keep=WATERMARK_KEEP, full_refresh_days=FULL_REFRESH_DAYS):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.keep = keep
+        self.full_refresh_sec = full_refresh_days * 24 * 3600
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS watermarks (
+                scope TEXT NOT NULL,
+                product_id TEXT NOT NULL,
+                newest_key TEXT,
+                newest_date TEXT,
+                keys TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                full_at REAL,
+                PRIMARY KEY (scope, product_id)
+            )
+        ''')
+        self.conn.commit()
+        self._pending = {}  # (scope, 상품 ID) → 저장할 내용
+        self.incremental = 0  # 이미 본 후기에서 일찍 멈춘 상품 수
+        self.full = 0  # 끝까지 읽은 상품 수
+        self.cut_short = 0  # 시간/개수 제한으로 중간에 멈춘 상품 수 (다음에 다시 끝까지 읽음)
+        self.new_items = 0
+        self.seen_items = 0
+
+    def load(self, scope, product_id):
+        row = self.conn.execute(
+            'SELECT keys, newest_date, full_at FROM watermarks WHERE scope = ? AND product_id = ?',
+            (scope, str(product_id)),
+        ).fetchone()
+        if row is None:
+            return Watermark(scope, str(product_id))
+        keys, newest_date, full_at = row
+        refresh_due = bool(self.full_refresh_sec) and (full_at is None or time.time() - full_at > self.full_refresh_sec)
+        return Watermark(scope, str(product_id), json.loads(keys), newest_date, full_at, refresh_due)
+
+    def stage(self, watermark, keys, newest_date=None, new_count=0, seen_count=0):
+        """이번에 본 키(최근 것부터) 기록 예약 - 결과를 저장한 뒤 commit() 해야 반영됨
+
+        (결과 저장에 실패했는데 워터마크만 앞으로 가면 그 델타는 다시 나오지 않으므로)
+        """
+        pending_key = (watermark.scope, watermark.product_id)
+        if pending_key in self._pending:  # 같은 상품을 여러 번 나눠서 기록 (예: 후기 키 + 이미지 URL)
+            _watermark, old_keys, old_date, old_new, old_seen = self._pending[pending_key]
+            dates = [date for date in (old_date, newest_date) if date]
+            self._pending[pending_key] = (watermark, old_keys + list(keys), max(dates) if dates else None,
+                                          old_new + new_count, old_seen + seen_count)
+        else:
+            self._pending[pending_key] = (watermark, list(keys), newest_date, new_count, seen_count)
+
+    def track(self, watermark, items, key, newest_date=None):
+        """항목(최근 것부터) 중 새 것만 골라내고 워터마크 기록 예약 - (새 항목 목록, 요약) 반환
+
+        key 는 항목 → 키 함수
+        """
+        keys = [key(item) for item in items]
+        fresh = [item for item, item_key in zip(items, keys) if item_key not in watermark.known]
+        seen_count = len(items) - len(fresh)
+        self.stage(watermark, keys, newest_date, len(fresh), seen_count)
+        return fresh, watermark.summary(len(fresh), seen_count)
+
+    def commit(self, product_id=None, scroll=None):
+        """예약한 워터마크 저장 (product_id 를 주면 그 상품 것만)
+
+        scroll 은 후기 목록을 읽은 요약 (stopped_by 가 목록 끝이 아니면 전체 갱신 시각을 바꾸지 않음)
+        """
+        stopped_by = scroll.get('stopped_by') if scroll else None
+        for pending_key in list(self._pending):
+            if product_id is None or pending_key[1] == str(product_id):
+                self._save(*self._pending.pop(pending_key), stopped_by=stopped_by)
+        self.conn.commit()
+
+    def discard(self, product_id=None):
+        """예약 취소 (결과를 저장하지 못했을 때)"""
+        for pending_key in list(self._pending):
+            if product_id is None or pending_key[1] == str(product_id):
+                del self._pending[pending_key]
+
+    def _save(self, watermark, keys, newest_date, new_count, seen_count, stopped_by=None):
+        """이번에 본 키를 앞에 붙여서 저장 (오래된 키는 keep 개만 남김)"""
+        merged = list(dict.fromkeys(keys + watermark.previous))[:self.keep]
+        if not merged:
+            return
+        now = time.time()
+        # 끝까지 읽었으면 전체 갱신 시각도 바꿈
+        complete = not watermark.caught_up and stopped_by in END_OF_LIST_STOPS
+        dates = [date for date in (newest_date, watermark.newest_date) if date]
+        self.conn.execute(
+            'INSERT OR REPLACE INTO watermarks (scope, product_id, newest_key, newest_date, keys, updated_at, full_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (watermark.scope, watermark.product_id, merged[0], max(dates) if dates else None,
+             json.dumps(merged), now, now if complete else watermark.full_at),
+        )
+        if watermark.caught_up:
+            self.incremental += 1
+        elif complete:
+            self.full += 1
+        else:
+            self.cut_short += 1
+        self.new_items += new_count
+        self.seen_items += seen_count
+
+    def summary(self):
+        return {
+            'incremental': self.incremental,
+            'full': self.full,
+            'cut_short': self.cut_short,
+            'new_items': self.new_items,
+            'seen_items': self.seen_items,
+        }
+
+    def print_summary(self):
+        stats = self.summary()
+        print(f"🔖 증분 크롤링: 일찍 멈춤 {stats['incremental']}개 상품, 끝까지 {stats['full']}개 상품, "
+              f"제한으로 중간에 멈춤 {stats['cut_short']}개 상품, "
+              f"새 항목 {stats['new_items']}개 (이미 본 항목 {stats['seen_items']}개 제외)")
+
+    def close(self):
+        self.conn.close()  # commit 하지 않은 예약은 버림
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+# 결과를 한 줄씩 이어 쓰는 스트리밍 저장기 (CSV / JSON Lines / Parquet)
+#
+# - 한 줄은 write() 한 번으로 쓰고 바로 OS로 넘기므로, 프로세스가 죽어도
+#   잃는 것은 쓰던 중인 한 줄뿐입니다 (다시 열 때 잘린 줄은 잘라냄).
+# - flush_interval 초마다 fsync 해서 디스크에 확실히 기록합니다.
+import csv  # CSV 파일 처리
+from datetime import datetime  # 날짜 파티션
+import io  # 한 줄짜리 CSV 문자열 만들기
+import json  # JSON 데이터 처리
+import os  # 파일 시스템 관련 기능
+import time  # 시간 관련 기능
+
+try:
+    import pyarrow as pa  # Parquet 저장 (선택)
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+DEFAULT_FLUSH_INTERVAL = 1.0  # 초
+PARQUET_ROW_GROUP_SIZE = 5000
+
+FORMAT_EXTENSIONS = {
+    'csv': '.csv',
+    'jsonl': '.jsonl',
+    'parquet': '.parquet',
+}
+
+
+def partition_path(root, name, partition=None, ext='.jsonl'):
+    """항목별 출력 파일 경로
+
+    partition=None 이면 root/name.jsonl, 'date' 면 root/dt=YYYY-MM-DD/name.jsonl (날짜별 폴더)
+    """
+    if partition == 'date':
+        root = os.path.join(root, f"dt={datetime.now().strftime('%Y-%m-%d')}")
+    elif partition is not None:
+        raise ValueError(f"지원하지 않는 파티션: {partition} (None, 'date' 중 선택)")
+    return os.path.join(root, f'{name}{ext}')
+
+
+def truncate_partial_line(path, quote=None):
+    """비정상 종료로 잘린 마지막 줄 제거 (남은 바이트 수 반환)
+
+    quote 를 주면 (CSV의 '"') 따옴표 안의 줄바꿈은 줄 경계로 보지 않음
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb+') as f:
+        data = f.read()
+        keep = len(data)
+        if quote is None:
+            if data.endswith(b'\n'):
+                return keep
+            keep = data.rfind(b'\n') + 1
+        else:
+            # 뒤에서부터 따옴표 개수가 짝수인 줄바꿈(= 진짜 줄 끝)을 찾음
+            quote_byte = quote.encode()
+            quotes_before = data.count(quote_byte)
+            pos = len(data)
+            keep = 0
+            while pos > 0:
+                newline = data.rfind(b'\n', 0, pos)
+                if newline == -1:
+                    break
+                quotes_before -= data.count(quote_byte, newline, pos)
+                if newline + 1 == len(data) and quotes_before % 2 == 0:
+                    return len(data)
+                if quotes_before % 2 == 0:
+                    keep = newline + 1
+                    break
+                pos = newline
+        f.truncate(keep)
+        return keep
+
+
+class StreamWriter:
+    """스트리밍 저장기 기본 클래스"""
+
+    quote = None  # 줄 복구 시 따옴표 안 줄바꿈을 무시할 문자
+
+    def __init__(self, path, columns, flush_interval=DEFAULT_FLUSH_INTERVAL, append=False):
+        self.path = path
+        self.columns = list(columns)
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self._last_sync = time.monotonic()
+
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+
+        resumed = append and truncate_partial_line(path, self.quote) > 0
+        self._file = self._open(resumed)
+
+    def _open(self, resumed):
+        raise NotImplementedError
+
+    def _format_row(self, row):
+        raise NotImplementedError
+
+    def write(self, row):
+        """한 줄 쓰기"""
+        self._file.write(self._format_row(row))
+        self._file.flush()  # 프로세스가 죽어도 OS 버퍼에는 남도록
+        self.rows_written += 1
+        if time.monotonic() - self._last_sync >= self.flush_interval:
+            self.sync()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def sync(self):
+        """디스크까지 기록 (fsync)"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.sync()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CsvStreamWriter(StreamWriter):
+    """CSV 저장기 (엑셀 호환 utf-8-sig)"""
+
+    quote = '"'
+
+    def _open(self, resumed):
+        if resumed:
+            # 이어 쓸 때는 BOM/헤더를 다시 쓰지 않음
+            return open(self.path, 'a', encoding='utf-8', newline='')
+        f = open(self.path, 'w', encoding='utf-8-sig', newline='')
+        f.write(self._format_header())
+        f.flush()
+        return f
+
+    def _format_header(self):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(self.columns)
+        return buffer.getvalue()
+
+    def _format_row(self, row):
+        buffer = io.StringIO()
+        csv.DictWriter(buffer, fieldnames=self.columns, extrasaction='ignore').writerow(row)
+        return buffer.getvalue()
+
+
+class JsonlStreamWriter(StreamWriter):
+    """JSON Lines 저장기 (한 줄에 JSON 하나)"""
+
+    def _open(self, resumed):
+        return open(self.path, 'a' if resumed else 'w', encoding='utf-8')
+
+    def _format_row(self, row):
+        record = {column: row.get(column) for column in self.columns} if self.columns else row
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+
+
+class ParquetStreamWriter:
+    """Parquet 저장기
+
+    Parquet 파일은 끝에 footer가 있어야 읽을 수 있으므로, 작업 중에는
+    JSON Lines 임시 파일(.spool.jsonl)에 이어 쓰고 close() 때 열 단위로 변환합니다.
+    """
+
+    def __init__(self, path, columns, flush_interval=DEFAULT_FLUSH_INTERVAL, append=False,
+                 row_group_size=PARQUET_ROW_GROUP_SIZE):
+        if pa is None:
+            raise ImportError("Parquet 저장에는 pyarrow가 필요합니다 (pip install pyarrow)")
+        self.path = path
+        self.columns = list(columns)
+        self.row_group_size = row_group_size
+        self.spool_path = path + '.spool.jsonl'
+        self._spool = JsonlStreamWriter(self.spool_path, columns, flush_interval, append=append)
+
+    @property
+    def rows_written(self):
+        return self._spool.rows_written
+
+    def write(self, row):
+        self._spool.write(row)
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def sync(self):
+        self._spool.sync()
+
+    def close(self):
+        if self._spool._file.closed:
+            return
+        self._spool.close()
+        convert_jsonl_to_parquet(self.spool_path, self.path, self.columns, self.row_group_size)
+        os.remove(self.spool_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def convert_jsonl_to_parquet(jsonl_path, parquet_path, columns, row_group_size=PARQUET_ROW_GROUP_SIZE):
+    """JSON Lines 파일을 row group 단위로 Parquet 변환 (메모리 일정)"""
+    schema = pa.schema([(column, pa.string()) for column in columns])
+    writer = pq.ParquetWriter(parquet_path, schema)
+    try:
+        batch = {column: [] for column in columns}
+        count = 0
+        with open(jsonl_path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                for column in columns:
+                    value = record.get(column)
+                    batch[column].append(None if value is None else str(value))
+                count += 1
+                if count >= row_group_size:
+                    writer.write_table(pa.table(batch, schema=schema))
+                    batch = {column: [] for column in columns}
+                    count = 0
+        if count:
+            writer.write_table(pa.table(batch, schema=schema))
+    finally:
+        writer.close()
+
+
+WRITERS = {
+    'csv': CsvStreamWriter,
+    'jsonl': JsonlStreamWriter,
+    'parquet': ParquetStreamWriter,
+}
+
+
+def open_writer(path, columns, fmt=None, flush_interval=DEFAULT_FLUSH_INTERVAL, append=False):
+    """확장자(또는 fmt)에 맞는 스트리밍 저장기 생성"""
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower()
+        fmt = next((name for name, value in FORMAT_EXTENSIONS.items() if value == ext), 'csv')
+    if fmt not in WRITERS:
+        raise ValueError(f"지원하지 않는 저장 형식: {fmt} (csv, jsonl, parquet 중 선택)")
+    return WRITERS[fmt](path, columns, flush_interval=flush_interval, append=append)
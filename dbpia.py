@@ -2,176 +2,218 @@
 # -*- coding: utf-8 -*-
 
 # 필요한 라이브러리들을 가져옵니다 (import = 가져오기)
-from selenium import webdriver  # 웹 브라우저를 자동으로 조작하는 도구
-from selenium.webdriver.chrome.service import Service  # 크롬 브라우저 서비스
-from selenium.webdriver.chrome.options import Options  # 크롬 브라우저 옵션 설정
-from selenium.webdriver.common.by import By  # 웹페이지에서 요소를 찾는 방법들
-from webdriver_manager.chrome import ChromeDriverManager  # 크롬 드라이버 자동 설치
 import time  # 시간 관련 기능 (대기시간 등)
-import csv  # CSV 파일 처리
-import pandas as pd  # 데이터 처리 및 엑셀 파일 생성
 from datetime import datetime  # 현재 날짜/시간 가져오기
 import os  # 파일 시스템 관련 기능
 import logging  # 로그(기록) 관리
-import json  # JSON 데이터 처리
 import threading  # 멀티스레딩
 from concurrent.futures import ThreadPoolExecutor  # 스레드 풀
 import queue  # 스레드 간 데이터 전달
+import argparse  # 명령행 옵션
+from dbpia_browser import (  # 브라우저 생성 및 세션 풀
+    BrowserPool, PeakRssSampler, SESSION_MAX_PAGES, create_chrome_browser, format_throughput,
+)
+from dbpia_parser import FAILED_TEXT, PAPER_COLUMNS, build_paper_info, extract_paper_record  # HTML/JSON-LD 파싱
+from dbpia_journal import JOURNAL_PATH, CrawlJournal  # 이어서 크롤링하기 위한 작업 기록
+from common.readiness import PAPER_DETAIL_READY, SEARCH_RESULTS_READY, ReadinessTracker, wait_for_selenium  # 요소 대기
+from common.writers import DEFAULT_FLUSH_INTERVAL, FORMAT_EXTENSIONS, open_writer  # 결과 스트리밍 저장
+from dbpia_fast import FAST_MAX_WORKERS, create_http_pool, extract_paper_from_html, fetch_html  # HTTP 빠른 경로
+from dbpia_pagination import build_search_url, collect_search_links  # 검색 결과 페이지네이션
+from common.concurrency import AdaptiveLimiter, HostRateLimiter, format_limiter_summary  # 동시 요청 수 자동 조절
+from common.blocking import TEXT_ONLY_BLOCKED_TYPES, BlockingPolicy, selenium_transfer_bytes  # 요청 차단
+from common.retry import RetryPolicy, RetryQueue, classify_error  # 실패한 논문 재시도
+from common.metrics import (  # 단계별 시간/카운터 기록
+    STAGE_BROWSER_LAUNCH, STAGE_EXTRACTION, STAGE_FILE_WRITE, STAGE_HTTP_FETCH, STAGE_NAVIGATION,
+    RunMetrics, count, timed,
+)
 
-def process_single_paper(link_data, thread_id, results_queue, filename):
+BROWSER_MAX_WORKERS = 8  # 자동 조절 시 최대 브라우저 수
+DEFAULT_MAX_RPS = 10  # 사이트별 초당 최대 요청 수
+
+def process_single_paper(link_data, thread_id, results_queue, filename, pool=None, tracker=None, limiter=None,
+                         metrics=None, blocking=None):
     """단일 논문 처리 함수 (병렬 처리용)"""
     link, idx = link_data
     
-    # 각 스레드마다 독립적인 브라우저 인스턴스 생성
-    chrome_options = Options()
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--disable-extensions')
-    chrome_options.add_argument('--disable-logging')
-    chrome_options.add_argument('--disable-web-security')
-    chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-    chrome_options.add_argument('--log-level=3')
-    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
+    # 풀이 있으면 세션을 빌리고, 없으면 논문마다 브라우저를 새로 띄움
+    session = None
+    if pool is not None:
+        session = pool.checkout()
+        browser = session.browser
+    else:
+        with timed(metrics, STAGE_BROWSER_LAUNCH):
+            browser = create_chrome_browser(blocking)
+    crashed = False
     
-    service = Service(ChromeDriverManager().install())
-    service.log_path = os.devnull
-    browser = webdriver.Chrome(service=service, options=chrome_options)
+    def navigate():
+        with timed(metrics, STAGE_NAVIGATION):
+            browser.get(link)
     
     try:
         print(f"🔄 스레드 {thread_id}: 논문 {idx} 처리 중...")
-        browser.get(link)
-        time.sleep(2)
-        
-        # JSON-LD 데이터에서 정보 추출
-        json_ld_data = None
-        try:
-            json_ld_script = browser.find_element(By.XPATH, "//script[@type='application/ld+json']")
-            json_ld_data = json.loads(json_ld_script.get_attribute('innerHTML'))
-        except:
-            pass
-        
-        # 논문 제목
-        title = "제목 없음"
-        if json_ld_data and 'headline' in json_ld_data:
-            title = json_ld_data['headline']
-        else:
-            try:
-                title = browser.find_element(By.CLASS_NAME, 'thesis__title').text.strip()
-            except:
-                pass
-        
-        # 논문 저자
-        author = "저자 없음"
-        if json_ld_data and 'author' in json_ld_data:
-            if isinstance(json_ld_data['author'], list):
-                author = ', '.join([author_item.get('name', '') if isinstance(author_item, dict) else str(author_item) for author_item in json_ld_data['author']])
-            elif isinstance(json_ld_data['author'], dict):
-                author = json_ld_data['author'].get('name', '')
-            else:
-                author = str(json_ld_data['author'])
+        if limiter is not None:
+            limiter.call(link, navigate)  # 동시 요청 수/초당 요청 수 제한 안에서 로딩
         else:
-            try:
-                author = browser.find_element(By.CLASS_NAME, 'thesis__author').text.strip()
-            except:
-                pass
-        
-        # 논문 초록
-        abstract = "초록 없음"
-        try:
-            abstract = browser.find_element(By.CLASS_NAME, 'abstractTxt').text.strip()
-        except:
-            pass
-        
-        # 발행년도
-        year = "년도 없음"
-        if json_ld_data and 'datePublished' in json_ld_data:
-            year = json_ld_data['datePublished'][:4]
-        else:
-            try:
-                year_element = browser.find_element(By.CLASS_NAME, 'thesis__year')
-                year = year_element.text.strip()
-            except:
-                pass
-        
-        # 학술지명
-        journal = "학술지 없음"
-        if json_ld_data and 'isPartOf' in json_ld_data:
-            if isinstance(json_ld_data['isPartOf'], dict):
-                journal = json_ld_data['isPartOf'].get('name', '')
-            else:
-                journal = str(json_ld_data['isPartOf'])
-        else:
-            try:
-                journal = browser.find_element(By.CLASS_NAME, 'thesis__journal').text.strip()
-            except:
-                pass
-        
-        # 수록면 정보
-        page_info = "수록면 정보 없음"
-        if json_ld_data and 'pagination' in json_ld_data:
-            if isinstance(json_ld_data['pagination'], dict):
-                page_start = json_ld_data['pagination'].get('pageStart', '')
-                page_end = json_ld_data['pagination'].get('pageEnd', '')
-                if page_start:
-                    page_info = page_start
-                    if page_end:
-                        page_info += f"-{page_end}"
-            else:
-                page_info = str(json_ld_data['pagination'])
-        else:
-            try:
-                page_selectors = ['thesis__page', 'thesis__pages', 'page-info', 'thesis__volume', 'thesis__issue']
-                for selector in page_selectors:
-                    try:
-                        page_element = browser.find_element(By.CLASS_NAME, selector)
-                        page_info = page_element.text.strip()
-                        if page_info:
-                            break
-                    except:
-                        continue
-            except:
-                pass
-        
-        # 데이터 정리
-        paper_info = {
-            '번호': idx,
-            '제목': title,
-            '저자': author,
-            '학술지': journal,
-            '발행년도': year,
-            '수록면': page_info,
-            '초록': abstract,
-            '링크': link,
-            '크롤링날짜': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+            navigate()
+        wait_for_selenium(browser, 'paper_detail', PAPER_DETAIL_READY, tracker=tracker)
+        
+        # 렌더링된 HTML에서 정보 추출 (HTTP 빠른 경로와 같은 파서)
+        with timed(metrics, STAGE_EXTRACTION):
+            html = browser.page_source
+            paper_info = extract_paper_record(html, link, idx)
+        count(metrics, 'pages')
+        count(metrics, 'bytes', len(html.encode('utf-8')))
+        if metrics is not None:
+            count(metrics, 'bytes_transferred', selenium_transfer_bytes(browser))  # 이미지/CSS 등 포함 전송량
         
         # 결과를 큐에 전달
         results_queue.put(paper_info)
-        print(f"✅ 스레드 {thread_id}: {title[:30]}... 완료!")
+        print(f"✅ 스레드 {thread_id}: {paper_info['제목'][:30]}... 완료!")
         
     except Exception as e:
+        crashed = True
+        count(metrics, 'failures')
         print(f"❌ 스레드 {thread_id}: 논문 {idx} 처리 실패: {e}")
         # 오류 발생 시 기본 정보 저장
-        paper_info = {
-            '번호': idx,
-            '제목': '처리 실패',
-            '저자': '처리 실패',
-            '학술지': '처리 실패',
-            '발행년도': '처리 실패',
-            '수록면': '처리 실패',
-            '초록': '처리 실패',
-            '링크': link,
-            '크롤링날짜': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        failed = FAILED_TEXT
+        paper_info = build_paper_info(idx, link, failed, failed, failed, failed, failed, failed)
+        paper_info['오류'] = str(e)  # 작업 기록용 (결과 파일 열에는 포함되지 않음)
+        paper_info['오류종류'] = classify_error(e)  # 다시 시도할지 판단
         results_queue.put(paper_info)
         
     finally:
-        browser.quit()
+        if session is not None:
+            pool.checkin(session, crashed=crashed)  # 오류 난 세션은 교체
+        else:
+            browser.quit()
+
+def process_single_paper_fast(link_data, thread_id, results_queue, filename, pool, http, tracker=None,
+                              limiter=None, http_limiter=None, metrics=None, blocking=None):
+    """HTTP 빠른 경로로 논문 처리 (필수 정보가 없으면 Selenium 경로로 재시도)"""
+    link, idx = link_data
+    
+    def fetch():
+        with timed(metrics, STAGE_HTTP_FETCH):
+            return fetch_html(http, link)
+    
+    try:
+        html = http_limiter.call(link, fetch) if http_limiter is not None else fetch()
+        with timed(metrics, STAGE_EXTRACTION):
+            paper_info, missing = extract_paper_from_html(html, link, idx)
+    except Exception as e:
+        print(f"⚠️ 스레드 {thread_id}: 논문 {idx} HTTP 요청 실패: {e}")
+        paper_info, missing = None, ['HTML']
+    
+    if not missing:
+        count(metrics, 'pages')
+        count(metrics, 'bytes', len(html.encode('utf-8')))
+        count(metrics, 'bytes_transferred', len(html.encode('utf-8')))
+        results_queue.put(paper_info)
+        print(f"⚡ 스레드 {thread_id}: {paper_info['제목'][:30]}... 완료!")
+        return
+    
+    print(f"🔁 스레드 {thread_id}: 논문 {idx} 누락 필드 {missing} → 브라우저로 재시도")
+    count(metrics, 'browser_fallbacks')
+    process_single_paper(link_data, thread_id, results_queue, filename, pool, tracker, limiter, metrics, blocking)
 
-def crawl_dbpia_papers():
-    """DBPIA 논문 크롤링 메인 함수"""
+def iter_paper_details(link_data_list, max_workers, pool=None, http=None, fast=False, tracker=None, filename=None,
+                       limiter=None, http_limiter=None, metrics=None, blocking=None, retry_queue=None):
+    """논문 상세 정보를 병렬로 수집하고, 끝나는 순서대로 하나씩 돌려줌
+    
+    limiter(브라우저) / http_limiter(HTTP) 를 주면 실제 동시 요청 수는 그 안에서 자동 조절됨
+    (max_workers 는 스레드 수 = 동시 요청 수의 상한)
+    blocking 은 풀 없이 브라우저를 띄울 때 쓰는 요청 차단 정책 (풀은 BrowserPool(blocking=...) 으로 설정)
+    retry_queue 를 주면 일시적인 오류로 실패한 논문은 백오프 후 작업 목록 맨 뒤로 다시 넣고,
+    횟수를 다 쓴 논문만 실패 레코드('처리 실패')로 돌려줌
+    """
+    results_queue = queue.Queue()
+    
+    # ThreadPoolExecutor로 병렬 처리
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        
+        def submit(link_data, thread_id):
+            if fast:
+                future = executor.submit(process_single_paper_fast, link_data, thread_id, results_queue, filename, pool, http, tracker,
+                                         limiter, http_limiter, metrics, blocking)
+            else:
+                future = executor.submit(process_single_paper, link_data, thread_id, results_queue, filename, pool, tracker, limiter,
+                                         metrics, blocking)
+            futures.append(future)
+        
+        # 모든 작업 제출
+        for i, link_data in enumerate(link_data_list):
+            submit(link_data, i+1)
+        
+        # 결과 수집 (실시간)
+        pending = len(link_data_list)
+        while pending > 0 or (retry_queue is not None and len(retry_queue) > 0):
+            # 백오프가 끝난 논문은 작업 목록 맨 뒤에 다시 제출 (정상 작업은 먼저 처리됨)
+            if retry_queue is not None:
+                for link_data in retry_queue.pop_due():
+                    count(metrics, 'retries')
+                    submit(link_data, link_data[1])
+                    pending += 1
+                if pending == 0:
+                    # 남은 건 재시도 대기뿐: 가장 빠른 재시도 시각까지 대기
+                    time.sleep(min(1.0, retry_queue.next_delay() or 0.0))
+                    continue
+            try:
+                # 큐에서 결과 가져오기 (타임아웃 1초)
+                paper_info = results_queue.get(timeout=1)
+            except queue.Empty:
+                # 타임아웃 발생 시 계속 대기
+                continue
+            pending -= 1
+            
+            if paper_info['제목'] == FAILED_TEXT and retry_queue is not None:
+                link_data = (paper_info['링크'], paper_info['번호'])
+                kind = paper_info.get('오류종류', 'transient')
+                if retry_queue.schedule(paper_info['링크'], link_data, kind, paper_info.get('오류', '')):
+                    print(f"⏳ 논문 {paper_info['번호']} 나중에 다시 시도 ({retry_queue.attempts(paper_info['링크'])}회 실패)")
+                    continue
+            yield paper_info
+        
+        # 모든 작업 완료 대기
+        for future in futures:
+            future.result()
+
+def record_in_journal(journal, paper_info):
+    """작업 기록에 결과 반영 (실패한 논문은 다음 실행에서 다시 시도)"""
+    if journal is None:
+        return
+    if paper_info['제목'] == FAILED_TEXT:
+        journal.mark_failed(paper_info['링크'], paper_info.get('오류', ''))
+    else:
+        journal.mark_done(paper_info['링크'], paper_info)
+
+def make_browser_fetcher(browser, tracker=None, metrics=None):
+    """브라우저로 검색 결과 페이지 HTML을 가져오는 함수 생성 (HTTP로 안 될 때)"""
+    def fetch_page(url):
+        with timed(metrics, STAGE_NAVIGATION):
+            browser.get(url)
+        wait_for_selenium(browser, 'search_results', SEARCH_RESULTS_READY, tracker=tracker)
+        return browser.page_source
+    return fetch_page
+
+def crawl_dbpia_papers(use_pool=True, max_pages_per_session=SESSION_MAX_PAGES, fast=False,
+                       output_format='csv', flush_interval=DEFAULT_FLUSH_INTERVAL,
+                       journal_path=JOURNAL_PATH, adaptive=True, max_rps=DEFAULT_MAX_RPS,
+                       metrics_path=None, prometheus_path=None, block_resources=True,
+                       max_attempts=3, dead_letter_path=None, search_word=None):
+    """DBPIA 논문 크롤링 메인 함수
+    
+    use_pool=False 이면 기존처럼 논문마다 브라우저를 새로 띄움 (성능 비교용)
+    fast=True 이면 상세 페이지를 HTTP로 먼저 가져오고, 부족한 페이지만 브라우저로 처리
+    output_format 은 'csv', 'jsonl', 'parquet' 중 하나 (결과는 한 줄씩 이어 씀)
+    journal_path 의 작업 기록으로 이미 수집한 논문은 건너뜀 (None 이면 기록 안 함)
+    adaptive=True 이면 응답 속도/오류에 따라 동시 요청 수를 자동 조절 (max_rps = 초당 요청 상한)
+    끝나면 단계별 시간 요약을 metrics_path(기본 data/metrics/)에, prometheus_path 가 있으면 textfile 로도 저장
+    block_resources=True 이면 이미지/폰트/CSS/광고 요청을 막아서 로딩 시간과 전송량을 줄임
+    일시적인 오류로 실패한 논문은 max_attempts 번까지 나중에 다시 시도하고,
+    끝내 실패한 논문은 결과 파일 대신 최종 실패 목록(dead_letter_path, 기본 data/dead_letters/)에 남김
+    search_word 가 없으면 실행 중에 입력받음
+    """
     
     # 경고 메시지 숨기기
     logging.getLogger('selenium').setLevel(logging.WARNING)
@@ -180,135 +222,63 @@ def crawl_dbpia_papers():
     # 브라우저 시작
     print("🌐 브라우저를 시작하는 중...")
     
-    # Chrome 옵션 설정
-    chrome_options = Options()
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--disable-extensions')
-    chrome_options.add_argument('--disable-logging')
-    chrome_options.add_argument('--disable-web-security')
-    chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-    chrome_options.add_argument('--log-level=3')
-    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    
     # 브라우저 실행
-    service = Service(ChromeDriverManager().install())
-    service.log_path = os.devnull
-    browser = webdriver.Chrome(service=service, options=chrome_options)
+    metrics = RunMetrics('dbpia')  # 단계별 시간/카운터
+    blocking = BlockingPolicy(TEXT_ONLY_BLOCKED_TYPES) if block_resources else None
+    with timed(metrics, STAGE_BROWSER_LAUNCH):
+        browser = create_chrome_browser(blocking)
     browser.maximize_window()
+    pool = None
+    writer = None
+    limiter = http_limiter = None
+    http = create_http_pool()  # 검색 결과 페이지와 빠른 모드가 같이 쓰는 커넥션 풀
+    tracker = ReadinessTracker(metrics)  # 단계별 실제 대기 시간
+    journal = CrawlJournal(journal_path) if journal_path else None
     
     try:
         # 검색어 입력
-        search_word = input("🔍 검색하시고자 하는 논문 제목을 입력하세요: ")
-        
-        # URL 생성
-        url = 'https://www.dbpia.co.kr/search/topSearch?startCount=0&collection=ALL&range=A&searchField=ALL&sort=RANK&query={}&srchOption=*&includeAr=false'
-        final_url = url.format(search_word)
-        
-        print(f"🔗 검색 URL: {final_url}")
-        browser.get(final_url)
-        browser.implicitly_wait(10)
-        time.sleep(5)
-        
-        # 페이지 로딩 확인
-        print("📄 페이지 로딩 완료 확인 중...")
-        print(f"📋 현재 페이지 제목: {browser.title}")
+        if search_word is None:
+            search_word = input("🔍 검색하시고자 하는 논문 제목을 입력하세요: ")
         
-        # 검색 결과 확인
-        try:
-            result_elements = browser.find_elements(By.CLASS_NAME, 'thesis__pageLink')
-            print(f"📊 찾은 논문 링크 수: {len(result_elements)}")
-            
-            if len(result_elements) == 0:
-                print("⚠️ 검색 결과가 없습니다. 다른 검색어를 시도해보세요.")
-                page_source = browser.page_source
-                if "검색결과가 없습니다" in page_source or "no results" in page_source.lower():
-                    print("✅ 확인: 검색 결과가 없다는 메시지 발견")
-                else:
-                    print("🔍 페이지에 다른 요소들이 있는지 확인 중...")
-                    alternative_elements = browser.find_elements(By.CSS_SELECTOR, 'a[href*="thesis"]')
-                    print(f"🔄 대안 요소 수: {len(alternative_elements)}")
-        except Exception as e:
-            print(f"❌ 검색 결과 확인 중 오류: {e}")
+        print(f"🔗 검색 URL: {build_search_url(search_word)}")
         
         # 데이터 저장용 리스트
         paper_data = []
-        link_list = []
-        processed_titles = set()  # 중복 제목 체크용
         
-        # CSV 파일명 생성
+        # 결과 파일명 생성
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'dbpia_papers_{search_word}_{timestamp}.csv'
+        filename = f'dbpia_papers_{search_word}_{timestamp}{FORMAT_EXTENSIONS[output_format]}'
         
-        # 첫 번째 페이지 링크 수집
-        print("📄 첫 번째 페이지 링크 수집 중...")
-        links = browser.find_elements(By.CLASS_NAME, 'thesis__pageLink')
-        print(f"🔗 첫 페이지에서 찾은 링크 수: {len(links)}")
+        # 검색 결과 페이지 URL을 직접 계산해서 링크 수집 (HTTP 병렬 → 안 되면 브라우저)
+        print("📄 검색 결과 링크 수집 중...")
+        link_list = []
         
-        # 대안 선택자 시도
-        if len(links) == 0:
-            print("🤔 기본 선택자로 링크를 찾지 못했습니다. 다른 방법들을 시도해볼게요...")
-            alternative_selectors = [
-                'a[href*="thesis"]',
-                '.thesis a',
-                '.search-result a',
-                '.paper-item a',
-                'a[href*="dbpia"]'
-            ]
-            
-            for selector in alternative_selectors:
-                try:
-                    alt_links = browser.find_elements(By.CSS_SELECTOR, selector)
-                    print(f"🔍 선택자 '{selector}'로 찾은 링크 수: {len(alt_links)}")
-                    if len(alt_links) > 0:
-                        links = alt_links
-                        break
-                except Exception as e:
-                    print(f"❌ 선택자 '{selector}' 시도 중 오류: {e}")
+        def fetch_search_page(page_url):
+            with timed(metrics, STAGE_HTTP_FETCH):
+                return fetch_html(http, page_url)
         
-        # 링크 저장 (중복 제거)
-        for link in links:
-            href = link.get_attribute('href')
-            if href and href not in link_list:
-                link_list.append(href)
-                print(f"✅ 링크 추가: {href[:50]}...")
-            elif href in link_list:
-                print(f"⚠️ 중복 링크 제외: {href[:50]}...")
+        try:
+            link_list = collect_search_links(search_word, fetch_search_page)
+        except Exception as e:
+            print(f"❌ HTTP 링크 수집 중 오류: {e}")
         
-        # 모든 페이지 링크 수집 (무한 반복!)
-        page_num = 2
-        while True:  # 무한 반복!
+        if len(link_list) == 0:
+            print("🤔 HTTP로 링크를 찾지 못했습니다. 브라우저로 다시 시도할게요...")
             try:
-                print(f"📄 {page_num}페이지 링크 수집 중...")
-                xpath = f'//*[@id="pageList"]/a[{page_num}]'
-                page_button = browser.find_element(By.XPATH, xpath)
-                browser.execute_script("arguments[0].click();", page_button)
-                time.sleep(3)
-                
-                # 현재 페이지의 링크 수집
-                links = browser.find_elements(By.CLASS_NAME, 'thesis__pageLink')
-                new_links_count = 0
-                
-                for link in links:
-                    href = link.get_attribute('href')
-                    if href and href not in link_list:
-                        link_list.append(href)
-                        new_links_count += 1
-                
-                # 새로운 링크가 없으면 더 이상 페이지가 없다는 뜻!
-                if new_links_count == 0:
-                    print(f"✅ {page_num}페이지에 새로운 논문이 없습니다. 크롤링 완료!")
-                    break
-                
-                print(f"✅ {page_num}페이지에서 {new_links_count}개 새 링크 발견!")
-                page_num += 1  # 다음 페이지로
-                        
+                link_list = collect_search_links(search_word, make_browser_fetcher(browser, tracker, metrics), max_parallel=1)
             except Exception as e:
-                print(f"❌ {page_num}페이지 처리 중 오류: {e}")
-                print("🗯️ 더 이상 페이지가 없습니다. 크롤링 완료!")
-                break  # 오류가 발생하면 반복 종료
+                print(f"❌ 브라우저 링크 수집 중 오류: {e}")
+        
+        # 작업 기록: 이번에 못 모았으면 지난번 링크 사용, 모았으면 기록
+        done_records = {}
+        if journal is not None:
+            if len(link_list) == 0:
+                link_list = journal.saved_links(search_word)
+                if link_list:
+                    print(f"📒 작업 기록에 저장된 링크 {len(link_list)}개를 사용합니다")
+            else:
+                journal.record_links(search_word, link_list)
+            done_records = journal.completed_records(search_word)
         
         print(f"🍀 총 {len(link_list)}개 논문 링크 수집 완료!")
         
@@ -317,46 +287,86 @@ def crawl_dbpia_papers():
             print("❌ 수집된 논문 링크가 없습니다. 검색어를 변경하거나 사이트 구조를 확인해주세요.")
             return None, []
         
-        # 병렬 처리로 논문 상세 정보 수집! 🚀
-        print(f"🚀 병렬 처리 시작! (최대 4개 스레드)")
-        
-        # 스레드 풀 생성 (최대 4개 스레드)
-        max_workers = min(4, len(link_list))  # 논문 수가 적으면 스레드 수도 조정
-        results_queue = queue.Queue()
-        
-        # 링크 데이터 준비
-        link_data_list = [(link, idx) for idx, link in enumerate(link_list, 1)]
+        # 링크 데이터 준비 (이미 수집이 끝난 논문은 건너뜀)
+        link_data_list = [(link, idx) for idx, link in enumerate(link_list, 1) if link not in done_records]
+        if done_records:
+            print(f"⏭️ 이미 수집한 논문 {len(link_list) - len(link_data_list)}개 건너뜀, 남은 논문 {len(link_data_list)}개")
         
-        # ThreadPoolExecutor로 병렬 처리
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # 모든 작업 제출
-            futures = []
-            for i, link_data in enumerate(link_data_list):
-                future = executor.submit(process_single_paper, link_data, i+1, results_queue, filename)
-                futures.append(future)
+        # 병렬 처리로 논문 상세 정보 수집! 🚀
+        # 스레드 풀 생성 (빠른 모드는 HTTP 요청을 더 많이 동시에)
+        remaining = max(1, len(link_data_list))  # 논문 수가 적으면 스레드 수도 조정
+        if adaptive:
+            # 시작은 4개(빠른 모드 8개)에서 응답을 보며 늘리고 줄임
+            rate = HostRateLimiter(max_rps)
+            browser_workers = min(BROWSER_MAX_WORKERS, remaining)
+            limiter = AdaptiveLimiter(initial=min(4, browser_workers), max_limit=browser_workers, rate=rate)
+            if fast:
+                http_limiter = AdaptiveLimiter(initial=min(8, remaining), max_limit=min(FAST_MAX_WORKERS, remaining), rate=rate)
+        else:
+            browser_workers = min(4, remaining)
+        max_workers = min(FAST_MAX_WORKERS, remaining) if fast else browser_workers
+        print(f"🚀 병렬 처리 시작! (최대 {max_workers}개 스레드{', 동시 요청 수 자동 조절' if adaptive else ''})")
+        
+        # 스레드 수만큼 브라우저 세션 풀 생성 (필요할 때 하나씩 띄움)
+        pool = BrowserPool(browser_workers, max_pages=max_pages_per_session, metrics=metrics,
+                           blocking=blocking) if use_pool else None
+        sampler = PeakRssSampler().start()
+        started_at = time.perf_counter()
+        
+        # 결과는 받는 즉시 한 줄씩 이어 씀
+        writer = open_writer(filename, PAPER_COLUMNS, fmt=output_format, flush_interval=flush_interval)
+        
+        # 지난 실행에서 끝난 논문은 기록에서 바로 옮겨 씀
+        for idx, link in enumerate(link_list, 1):
+            if link in done_records:
+                paper_info = dict(done_records[link], 번호=idx)
+                paper_data.append(paper_info)
+                with timed(metrics, STAGE_FILE_WRITE):
+                    writer.write(paper_info)
+        
+        # 병렬 처리 결과를 받는 즉시 저장
+        completed_count = 0
+        retry_queue = RetryQueue(RetryPolicy(max_attempts=max_attempts))
+        for paper_info in iter_paper_details(link_data_list, max_workers, pool, http, fast, tracker, filename,
+                                             limiter, http_limiter, metrics, blocking, retry_queue):
+            completed_count += 1
+            if paper_info['제목'] == FAILED_TEXT:
+                # 재시도까지 실패: 결과 파일에는 쓰지 않고 작업 기록/최종 실패 목록에만 남김
+                count(metrics, 'dead_letters')
+                record_in_journal(journal, paper_info)
+                continue
+            paper_data.append(paper_info)
             
-            # 결과 수집 (실시간)
-            completed_count = 0
-            while completed_count < len(link_list):
-                try:
-                    # 큐에서 결과 가져오기 (타임아웃 1초)
-                    paper_info = results_queue.get(timeout=1)
-                    paper_data.append(paper_info)
-                    completed_count += 1
-                    
-                    # 실시간 CSV 저장
-                    df = pd.DataFrame(paper_data)
-                    df.to_csv(filename, index=False, encoding='utf-8-sig')
-                    
-                    print(f"😺 진행률: {completed_count}/{len(link_list)} ({completed_count/len(link_list)*100:.1f}%)")
-                    
-                except queue.Empty:
-                    # 타임아웃 발생 시 계속 대기
-                    continue
+            # 실시간 저장 (새 줄만 추가)
+            with timed(metrics, STAGE_FILE_WRITE):
+                writer.write(paper_info)
+            record_in_journal(journal, paper_info)
             
-            # 모든 작업 완료 대기
-            for future in futures:
-                future.result()
+            print(f"😺 진행률: {completed_count}/{len(link_data_list)} ({completed_count/len(link_data_list)*100:.1f}%)")
+        
+        writer.close()
+        elapsed = time.perf_counter() - started_at
+        peak_bytes = sampler.stop()
+        if pool is not None:
+            print(f"🧰 브라우저 세션: {pool.launched}개 실행, {pool.recycled}개 교체")
+        print(format_throughput(len(paper_data), elapsed, peak_bytes))
+        for active_limiter in (limiter, http_limiter):
+            if active_limiter is not None:
+                print(format_limiter_summary(active_limiter.summary()))
+        tracker.print_summary()
+        retry_queue.print_summary('dbpia', dead_letter_path)
+        metrics.incr('skipped', len(done_records))
+        metrics.report(metrics_path, prometheus_path, extra={
+            'query': search_word,
+            'fast': fast,
+            'block_resources': block_resources,
+            'output': filename,
+            'peak_rss_mb': round(peak_bytes / 1024 / 1024, 1) if peak_bytes else None,
+            'waits': tracker.summary(),
+            'dead_letters': len(retry_queue.dead_letters),
+            'limiters': {name: active.summary() for name, active in (('browser', limiter), ('http', http_limiter))
+                         if active is not None},
+        })
         
         # 크롤링 완료 결과 출력
         print(f"\n🎉 === 크롤링 완료! ===")
@@ -385,14 +395,42 @@ def crawl_dbpia_papers():
         
     finally:
         print("🌐 브라우저를 종료합니다...")
+        if writer is not None:
+            writer.close()
+        if journal is not None:
+            journal.close()
+        if pool is not None:
+            pool.close()
         browser.quit()
 
 def main():
+    parser = argparse.ArgumentParser(description="DBPIA 논문 크롤링 프로그램")
+    parser.add_argument('--fast', action='store_true', help="상세 페이지를 HTTP로 먼저 가져오기 (JSON-LD)")
+    parser.add_argument('--no-pool', action='store_true', help="논문마다 브라우저를 새로 띄우기 (비교용)")
+    parser.add_argument('--format', choices=sorted(FORMAT_EXTENSIONS), default='csv', help="결과 파일 형식")
+    parser.add_argument('--flush-interval', type=float, default=DEFAULT_FLUSH_INTERVAL, help="디스크 기록(fsync) 간격 (초)")
+    parser.add_argument('--journal', default=JOURNAL_PATH, help="작업 기록 파일 (이미 수집한 논문은 건너뜀)")
+    parser.add_argument('--no-journal', action='store_true', help="작업 기록 없이 처음부터 크롤링")
+    parser.add_argument('--no-adaptive', action='store_true', help="동시 요청 수 자동 조절 끄기 (고정 스레드 수)")
+    parser.add_argument('--max-rps', type=float, default=DEFAULT_MAX_RPS, help="사이트별 초당 최대 요청 수")
+    parser.add_argument('--metrics', help="실행 요약 JSON 경로 (기본: data/metrics/dbpia_<시각>.json)")
+    parser.add_argument('--prometheus', help="Prometheus textfile 경로 (node_exporter textfile collector 용)")
+    parser.add_argument('--no-block', action='store_true', help="이미지/폰트/CSS/광고 요청 차단 끄기")
+    parser.add_argument('--max-attempts', type=int, default=3, help="논문 하나당 최대 시도 횟수 (일시적 오류만 재시도)")
+    parser.add_argument('--dead-letters', help="최종 실패 목록 경로 (기본: data/dead_letters/dbpia_<시각>.jsonl)")
+    args = parser.parse_args()
+    
     print("=" * 50)
     print("🎓 DBPIA 논문 크롤링 프로그램")
     print("=" * 50)
     
-    filename, data = crawl_dbpia_papers()
+    filename, data = crawl_dbpia_papers(use_pool=not args.no_pool, fast=args.fast,
+                                        output_format=args.format, flush_interval=args.flush_interval,
+                                        journal_path=None if args.no_journal else args.journal,
+                                        adaptive=not args.no_adaptive, max_rps=args.max_rps,
+                                        metrics_path=args.metrics, prometheus_path=args.prometheus,
+                                        block_resources=not args.no_block,
+                                        max_attempts=args.max_attempts, dead_letter_path=args.dead_letters)
     
     if filename:
         print(f"\n🎉 ✅ 성공적으로 완료되었습니다!")
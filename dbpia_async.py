@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# asyncio + Playwright 기반 DBPIA 크롤링 엔진
+#
+# 크롬 프로세스 하나에 격리된 브라우저 컨텍스트를 여러 개 띄워서 동시에 처리합니다.
+# (Selenium 엔진은 스레드마다 크롬 프로세스를 하나씩 띄움)
+# 결과 파일 형식/열/작업 기록은 crawl_dbpia_papers 와 같습니다.
+from datetime import datetime  # 현재 날짜/시간 가져오기
+import argparse  # 명령행 옵션
+import asyncio  # 비동기 처리
+import os  # 파일 시스템 관련 기능
+import time  # 시간 관련 기능
+
+from playwright.async_api import async_playwright
+
+from dbpia import record_in_journal
+from dbpia_browser import PeakRssSampler, SESSION_MAX_PAGES, format_throughput
+from dbpia_fast import create_http_pool, fetch_html
+from dbpia_journal import JOURNAL_PATH, CrawlJournal
+from dbpia_pagination import build_search_url, collect_search_links
+from dbpia_parser import FAILED_TEXT, PAPER_COLUMNS, build_paper_info, extract_paper_record
+from common.blocking import TEXT_ONLY_BLOCKED_TYPES, BlockingPolicy
+from common.contexts import ContextPool
+from common.metrics import (
+    STAGE_BROWSER_LAUNCH, STAGE_EXTRACTION, STAGE_FILE_WRITE, STAGE_NAVIGATION, RunMetrics, count, timed,
+)
+from common.readiness import PAPER_DETAIL_READY, SEARCH_RESULTS_READY, ReadinessTracker, wait_for_page
+from common.replay import install_replay_routing
+from common.retry import RetryPolicy, RetryQueue, classify_error
+from common.writers import DEFAULT_FLUSH_INTERVAL, FORMAT_EXTENSIONS, open_writer
+
+DEFAULT_CONCURRENCY = 16  # 동시에 여는 페이지(컨텍스트) 수
+
+
+async def process_paper_async(contexts, link, idx, tracker=None, metrics=None):
+    """논문 하나를 컨텍스트 풀의 페이지로 처리"""
+    slot = None
+    crashed = False
+    try:
+        slot = await contexts.checkout()  # 컨텍스트를 못 만들어도(브라우저 오류) 실패 레코드로 재시도
+        page = slot['page']
+        with timed(metrics, STAGE_NAVIGATION):
+            await page.goto(link, wait_until='domcontentloaded')
+        await wait_for_page(page, 'paper_detail', PAPER_DETAIL_READY, tracker=tracker)
+        html = await page.content()
+        with timed(metrics, STAGE_EXTRACTION):
+            paper_info = extract_paper_record(html, link, idx)
+        count(metrics, 'pages')
+        count(metrics, 'bytes', len(html.encode('utf-8')))
+        return paper_info
+    except Exception as e:
+        crashed = True
+        count(metrics, 'failures')
+        print(f"❌ 논문 {idx} 처리 실패: {e}")
+        failed = FAILED_TEXT
+        paper_info = build_paper_info(idx, link, failed, failed, failed, failed, failed, failed)
+        paper_info['오류'] = str(e)  # 작업 기록용 (결과 파일 열에는 포함되지 않음)
+        paper_info['오류종류'] = classify_error(e)  # 다시 시도할지 판단
+        return paper_info
+    finally:
+        if slot is not None:
+            await contexts.checkin(slot, crashed=crashed)
+
+
+async def iter_paper_details_async(browser, link_data_list, concurrency=DEFAULT_CONCURRENCY,
+                                   tracker=None, max_pages_per_context=SESSION_MAX_PAGES, metrics=None,
+                                   blocking=None, retry_queue=None):
+    """논문 상세 정보를 동시에 수집하고, 끝나는 순서대로 돌려줌 (async generator)
+
+    retry_queue 를 주면 일시적인 오류로 실패한 논문은 백오프 후 새 작업으로 맨 뒤에 다시 넣고,
+    횟수를 다 쓴 논문만 실패 레코드('처리 실패')로 돌려줌 (iter_paper_details 와 같음)
+    """
+    contexts = ContextPool(browser, concurrency, max_pages=max_pages_per_context, metrics=metrics,
+                           blocking=blocking)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(link, idx):
+        async with semaphore:
+            return await process_paper_async(contexts, link, idx, tracker, metrics)
+
+    tasks = {asyncio.create_task(run(link, idx)) for link, idx in link_data_list}
+    try:
+        while tasks or (retry_queue is not None and len(retry_queue) > 0):
+            # 백오프가 끝난 논문은 새 작업으로 다시 넣음 (세마포어 대기열 맨 뒤라서 정상 작업이 먼저 처리됨)
+            if retry_queue is not None:
+                for link, idx in retry_queue.pop_due():
+                    count(metrics, 'retries')
+                    tasks.add(asyncio.create_task(run(link, idx)))
+                if not tasks:
+                    # 남은 건 재시도 대기뿐: 가장 빠른 재시도 시각까지 대기
+                    await asyncio.sleep(min(1.0, retry_queue.next_delay() or 0.0))
+                    continue
+            done, tasks = await asyncio.wait(tasks, timeout=1.0, return_when=asyncio.FIRST_COMPLETED)
+            for finished in done:
+                paper_info = finished.result()
+                if paper_info['제목'] == FAILED_TEXT and retry_queue is not None:
+                    kind = paper_info.get('오류종류', 'transient')
+                    link_data = (paper_info['링크'], paper_info['번호'])
+                    if retry_queue.schedule(paper_info['링크'], link_data, kind, paper_info.get('오류', '')):
+                        print(f"⏳ 논문 {paper_info['번호']} 나중에 다시 시도 ({retry_queue.attempts(paper_info['링크'])}회 실패)")
+                        continue
+                yield paper_info
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        print(f"🧰 브라우저 컨텍스트: {contexts.launched}개 생성, {contexts.recycled}개 교체")
+        await contexts.close()
+
+
+async def collect_links_async(search_word, browser, tracker=None):
+    """검색 결과 링크 수집 (HTTP 병렬 → 안 되면 Playwright 페이지로)"""
+    http = create_http_pool()
+    try:
+        links = await asyncio.to_thread(
+            collect_search_links, search_word, lambda url: fetch_html(http, url))
+    except Exception as e:
+        print(f"❌ HTTP 링크 수집 중 오류: {e}")
+        links = []
+    if links:
+        return links
+
+    print("🤔 HTTP로 링크를 찾지 못했습니다. 브라우저로 다시 시도할게요...")
+    context = await browser.new_context(locale='ko-KR')
+    await install_replay_routing(context)  # 재생 모드일 때만
+    page = await context.new_page()
+    loop = asyncio.get_running_loop()
+
+    def fetch_page(url):
+        # collect_search_links 는 동기 함수라 스레드에서 돌리고, 페이지 조작은 이벤트 루프로 넘김
+        async def load():
+            await page.goto(url, wait_until='domcontentloaded')
+            await wait_for_page(page, 'search_results', SEARCH_RESULTS_READY, tracker=tracker)
+            return await page.content()
+        return asyncio.run_coroutine_threadsafe(load(), loop).result()
+
+    try:
+        return await asyncio.to_thread(collect_search_links, search_word, fetch_page, 1)
+    finally:
+        await context.close()
+
+
+async def crawl_dbpia_papers_async(search_word=None, concurrency=DEFAULT_CONCURRENCY,
+                                   output_format='csv', flush_interval=DEFAULT_FLUSH_INTERVAL,
+                                   journal_path=JOURNAL_PATH, headless=True,
+                                   metrics_path=None, prometheus_path=None, block_resources=True,
+                                   max_attempts=3, dead_letter_path=None):
+    """DBPIA 논문 크롤링 (asyncio 엔진) - crawl_dbpia_papers 와 같은 (파일명, 논문 목록) 반환
+
+    일시적인 오류로 실패한 논문은 max_attempts 번까지 나중에 다시 시도하고,
+    끝내 실패한 논문은 결과 파일 대신 최종 실패 목록(dead_letter_path, 기본 data/dead_letters/)에 남김
+    """
+    if search_word is None:
+        search_word = input("🔍 검색하시고자 하는 논문 제목을 입력하세요: ")
+    print(f"🔗 검색 URL: {build_search_url(search_word)}")
+
+    metrics = RunMetrics('dbpia_async')
+    blocking = BlockingPolicy(TEXT_ONLY_BLOCKED_TYPES) if block_resources else None
+    tracker = ReadinessTracker(metrics)
+    journal = CrawlJournal(journal_path) if journal_path else None
+    writer = None
+    paper_data = []
+
+    async with async_playwright() as p:
+        print("🌐 브라우저를 시작하는 중...")
+        with timed(metrics, STAGE_BROWSER_LAUNCH):
+            browser = await p.chromium.launch(headless=headless)
+        try:
+            link_list = await collect_links_async(search_word, browser, tracker)
+
+            done_records = {}
+            if journal is not None:
+                if not link_list:
+                    link_list = journal.saved_links(search_word)
+                else:
+                    journal.record_links(search_word, link_list)
+                done_records = journal.completed_records(search_word)
+
+            print(f"🍀 총 {len(link_list)}개 논문 링크 수집 완료!")
+            if not link_list:
+                print("❌ 수집된 논문 링크가 없습니다. 검색어를 변경하거나 사이트 구조를 확인해주세요.")
+                return None, []
+
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f'dbpia_papers_{search_word}_{timestamp}{FORMAT_EXTENSIONS[output_format]}'
+            writer = open_writer(filename, PAPER_COLUMNS, fmt=output_format, flush_interval=flush_interval)
+
+            for idx, link in enumerate(link_list, 1):
+                if link in done_records:
+                    paper_info = dict(done_records[link], 번호=idx)
+                    paper_data.append(paper_info)
+                    with timed(metrics, STAGE_FILE_WRITE):
+                        writer.write(paper_info)
+
+            link_data_list = [(link, idx) for idx, link in enumerate(link_list, 1) if link not in done_records]
+            print(f"🚀 비동기 처리 시작! (동시 페이지 {concurrency}개, 남은 논문 {len(link_data_list)}개)")
+
+            sampler = PeakRssSampler().start()
+            started_at = time.perf_counter()
+            completed_count = 0
+            retry_queue = RetryQueue(RetryPolicy(max_attempts=max_attempts))
+            async for paper_info in iter_paper_details_async(browser, link_data_list, concurrency, tracker,
+                                                             metrics=metrics, blocking=blocking,
+                                                             retry_queue=retry_queue):
+                completed_count += 1
+                if paper_info['제목'] == FAILED_TEXT:
+                    # 재시도까지 실패: 결과 파일에는 쓰지 않고 작업 기록/최종 실패 목록에만 남김
+                    count(metrics, 'dead_letters')
+                    record_in_journal(journal, paper_info)
+                    continue
+                paper_data.append(paper_info)
+                with timed(metrics, STAGE_FILE_WRITE):
+                    writer.write(paper_info)
+                record_in_journal(journal, paper_info)
+                print(f"😺 진행률: {completed_count}/{len(link_data_list)} ({completed_count/len(link_data_list)*100:.1f}%)")
+            writer.close()
+
+            print(format_throughput(len(paper_data), time.perf_counter() - started_at, sampler.stop()))
+            tracker.print_summary()
+            retry_queue.print_summary('dbpia_async', dead_letter_path)
+            if blocking is not None:
+                metrics.incr('requests_blocked', blocking.blocked_total)
+            metrics.report(metrics_path, prometheus_path, extra={
+                'query': search_word, 'concurrency': concurrency, 'output': filename, 'waits': tracker.summary(),
+                'blocked': blocking.blocked if blocking is not None else None,
+                'dead_letters': len(retry_queue.dead_letters),
+            })
+            print(f"\n🎉 === 크롤링 완료! ===")
+            print(f"📁 파일명: {filename}")
+            print(f"😺 총 논문 수: {len(paper_data)}")
+            print(f"💾 저장 위치: {os.path.abspath(filename)}")
+            return filename, paper_data
+
+        finally:
+            if writer is not None:
+                writer.close()
+            if journal is not None:
+                journal.close()
+            await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DBPIA 논문 크롤링 (asyncio + Playwright 엔진)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="동시에 여는 페이지 수")
+    parser.add_argument('--format', choices=sorted(FORMAT_EXTENSIONS), default='csv', help="결과 파일 형식")
+    parser.add_argument('--journal', default=JOURNAL_PATH, help="작업 기록 파일 (이미 수집한 논문은 건너뜀)")
+    parser.add_argument('--no-journal', action='store_true', help="작업 기록 없이 처음부터 크롤링")
+    parser.add_argument('--metrics', help="실행 요약 JSON 경로 (기본: data/metrics/dbpia_async_<시각>.json)")
+    parser.add_argument('--prometheus', help="Prometheus textfile 경로")
+    parser.add_argument('--no-block', action='store_true', help="이미지/폰트/CSS/광고 요청 차단 끄기")
+    parser.add_argument('--max-attempts', type=int, default=3, help="논문 하나당 최대 시도 횟수 (일시적 오류만 재시도)")
+    parser.add_argument('--dead-letters', help="최종 실패 목록 경로 (기본: data/dead_letters/dbpia_async_<시각>.jsonl)")
+    args = parser.parse_args()
+
+    filename, data = asyncio.run(crawl_dbpia_papers_async(
+        concurrency=args.concurrency,
+        output_format=args.format,
+        journal_path=None if args.no_journal else args.journal,
+        metrics_path=args.metrics,
+        prometheus_path=args.prometheus,
+        block_resources=not args.no_block,
+        max_attempts=args.max_attempts,
+        dead_letter_path=args.dead_letters,
+    ))
+    if filename:
+        print(f"\n🎉 ✅ 성공적으로 완료되었습니다!")
+        print(f"😎 파일 확인: {filename}")
+    else:
+        print("\n❌ 크롤링에 실패했습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 여러 검색어를 한 번에 돌리는 DBPIA 배치 크롤러 (입력 대기 없음)
+#
+# 사용법: python dbpia_batch.py keywords.txt --fast --budget 32
+# - keywords.txt 는 한 줄에 검색어 하나 (# 으로 시작하면 주석)
+# - 같은 논문이 여러 검색어에 나와도 상세 페이지는 한 번만 가져오고,
+#   결과 파일의 '검색어' 열에 해당 검색어들을 모두 기록합니다.
+from concurrent.futures import ThreadPoolExecutor  # 스레드 풀
+from datetime import datetime  # 현재 날짜/시간 가져오기
+import argparse  # 명령행 옵션
+import logging  # 로그(기록) 관리
+import os  # 파일 시스템 관련 기능
+import threading  # 멀티스레딩
+import time  # 시간 관련 기능
+
+from dbpia import DEFAULT_MAX_RPS, iter_paper_details, make_browser_fetcher, record_in_journal
+from dbpia_browser import BrowserPool, PeakRssSampler, SESSION_MAX_PAGES, format_throughput
+from dbpia_fast import FAST_MAX_WORKERS, create_http_pool, fetch_html
+from dbpia_journal import JOURNAL_PATH, CrawlJournal
+from dbpia_pagination import PAGINATION_MAX_PARALLEL, collect_search_links
+from dbpia_parser import FAILED_TEXT, PAPER_COLUMNS
+from common.blocking import TEXT_ONLY_BLOCKED_TYPES, BlockingPolicy
+from common.concurrency import AdaptiveLimiter, HostRateLimiter, format_limiter_summary
+from common.metrics import STAGE_FILE_WRITE, STAGE_HTTP_FETCH, RunMetrics, timed
+from common.readiness import ReadinessTracker
+from common.retry import RetryPolicy, RetryQueue
+from common.writers import DEFAULT_FLUSH_INTERVAL, FORMAT_EXTENSIONS, open_writer
+
+BATCH_COLUMNS = PAPER_COLUMNS + ['검색어']
+QUERY_SEPARATOR = ' | '  # '검색어' 열에서 여러 검색어 구분
+DEFAULT_BUDGET = 32  # 동시에 진행할 전체 요청 수
+BROWSER_WORKERS = 4  # 동시에 띄울 최대 브라우저 수
+
+
+def read_keywords(path):
+    """검색어 파일 읽기 (빈 줄/주석 제외, 중복 제거)"""
+    with open(path, encoding='utf-8') as f:
+        keywords = [line.strip() for line in f]
+    return list(dict.fromkeys(word for word in keywords if word and not word.startswith('#')))
+
+
+class PageCounter:
+    """가져온 페이지 수 세기 (여러 스레드에서 같이 사용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def wrap(self, fetch_page):
+        def counted(url):
+            with self._lock:
+                self.count += 1
+            return fetch_page(url)
+        return counted
+
+
+def collect_query_links(search_word, http, pool, tracker, max_parallel, metrics=None):
+    """검색어 하나의 링크 수집 ((링크 목록, 가져온 검색 페이지 수) 반환)"""
+    counter = PageCounter()
+    links = []
+
+    def fetch_page(url):
+        with timed(metrics, STAGE_HTTP_FETCH):
+            return fetch_html(http, url)
+
+    try:
+        links = collect_search_links(search_word, counter.wrap(fetch_page), max_parallel)
+    except Exception as e:
+        print(f"❌ [{search_word}] HTTP 링크 수집 중 오류: {e}")
+
+    if not links and pool is not None:
+        # HTTP로 안 되면 풀의 브라우저로 다시 시도
+        try:
+            with pool.session() as session:
+                fetcher = counter.wrap(make_browser_fetcher(session.browser, tracker, metrics))
+                links = collect_search_links(search_word, fetcher, max_parallel=1)
+        except Exception as e:
+            print(f"❌ [{search_word}] 브라우저 링크 수집 중 오류: {e}")
+
+    print(f"🔎 [{search_word}] 링크 {len(links)}개 (검색 페이지 {counter.count}장)")
+    return links, counter.count
+
+
+def crawl_dbpia_batch(keywords, budget=DEFAULT_BUDGET, query_workers=4, fast=False,
+                      output_format='csv', flush_interval=DEFAULT_FLUSH_INTERVAL,
+                      journal_path=JOURNAL_PATH, max_pages_per_session=SESSION_MAX_PAGES,
+                      output_dir='.', max_rps=DEFAULT_MAX_RPS, metrics_path=None, prometheus_path=None,
+                      block_resources=True, max_attempts=3, dead_letter_path=None):
+    """여러 검색어를 동시에 크롤링해서 하나의 결과 파일로 저장"""
+    logging.getLogger('selenium').setLevel(logging.WARNING)
+    logging.getLogger('urllib3').setLevel(logging.WARNING)
+
+    started_at = time.perf_counter()
+    sampler = PeakRssSampler().start()
+    metrics = RunMetrics('dbpia_batch')
+    tracker = ReadinessTracker(metrics)
+    http = create_http_pool(max(budget, FAST_MAX_WORKERS))
+    blocking = BlockingPolicy(TEXT_ONLY_BLOCKED_TYPES) if block_resources else None
+    pool = BrowserPool(min(BROWSER_WORKERS, budget), max_pages=max_pages_per_session, metrics=metrics,
+                       blocking=blocking)
+    journal = CrawlJournal(journal_path) if journal_path else None
+    writer = None
+
+    try:
+        # 1단계: 검색어별 링크 수집 (전체 동시 요청 수 = budget)
+        query_workers = max(1, min(query_workers, len(keywords), budget))
+        per_query_parallel = max(1, min(PAGINATION_MAX_PARALLEL, budget // query_workers))
+        print(f"📚 검색어 {len(keywords)}개 링크 수집 시작 (검색어 {query_workers}개 동시, 각 {per_query_parallel}페이지 동시)")
+
+        with ThreadPoolExecutor(max_workers=query_workers) as executor:
+            collected = list(executor.map(
+                lambda word: collect_query_links(word, http, pool, tracker, per_query_parallel, metrics), keywords,
+            ))
+        link_stage_sec = time.perf_counter() - started_at
+
+        # 논문 URL → 검색어 목록 (URL 순서는 처음 나온 순서)
+        membership = {}
+        search_pages = 0
+        naive_detail_pages = 0
+        for word, (links, pages) in zip(keywords, collected):
+            search_pages += pages
+            naive_detail_pages += len(links)
+            for link in links:
+                membership.setdefault(link, []).append(word)
+            if journal is not None and links:
+                journal.record_links(word, links)
+
+        # 이미 수집한 논문은 작업 기록에서 가져옴
+        done_records = {}
+        if journal is not None:
+            for word in keywords:
+                done_records.update(journal.completed_records(word))
+
+        all_links = list(membership)
+        link_data_list = [(link, idx) for idx, link in enumerate(all_links, 1) if link not in done_records]
+        print(f"🍀 고유 논문 {len(all_links)}개 (검색어별 합계 {naive_detail_pages}개), "
+              f"이미 수집 {len(all_links) - len(link_data_list)}개, 새로 수집 {len(link_data_list)}개")
+
+        # 결과 파일
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = os.path.join(output_dir, f'dbpia_batch_{timestamp}{FORMAT_EXTENSIONS[output_format]}')
+        writer = open_writer(filename, BATCH_COLUMNS, fmt=output_format, flush_interval=flush_interval)
+
+        paper_count = 0
+        for idx, link in enumerate(all_links, 1):
+            if link in done_records:
+                writer.write(dict(done_records[link], 번호=idx, 검색어=QUERY_SEPARATOR.join(membership[link])))
+                paper_count += 1
+
+        # 2단계: 고유 논문 상세 수집 (전체 동시 요청 수 = budget)
+        detail_started_at = time.perf_counter()
+        limiter = http_limiter = None
+        retry_queue = RetryQueue(RetryPolicy(max_attempts=max_attempts))
+        if link_data_list:
+            max_workers = min(budget if fast else min(BROWSER_WORKERS, budget), len(link_data_list))
+            # 실제 동시 요청 수는 응답을 보며 자동 조절 (max_workers 가 상한)
+            rate = HostRateLimiter(max_rps)
+            browser_limit = min(BROWSER_WORKERS, budget, len(link_data_list))
+            limiter = AdaptiveLimiter(initial=min(4, browser_limit), max_limit=browser_limit, rate=rate)
+            if fast:
+                http_limiter = AdaptiveLimiter(initial=min(8, max_workers), max_limit=max_workers, rate=rate)
+            print(f"🚀 상세 수집 시작! (최대 {max_workers}개 스레드, 동시 요청 수 자동 조절)")
+            for completed, paper_info in enumerate(
+                    iter_paper_details(link_data_list, max_workers, pool, http, fast, tracker, filename,
+                                       limiter, http_limiter, metrics, None, retry_queue), 1):
+                record_in_journal(journal, paper_info)
+                if paper_info['제목'] == FAILED_TEXT:
+                    continue  # 재시도까지 실패한 논문은 최종 실패 목록에만 남김
+                paper_info['검색어'] = QUERY_SEPARATOR.join(membership[paper_info['링크']])
+                with timed(metrics, STAGE_FILE_WRITE):
+                    writer.write(paper_info)
+                paper_count += 1
+                if completed % 50 == 0 or completed == len(link_data_list):
+                    print(f"😺 진행률: {completed}/{len(link_data_list)} ({completed/len(link_data_list)*100:.1f}%)")
+        detail_stage_sec = time.perf_counter() - detail_started_at
+        writer.close()
+        for active_limiter in (limiter, http_limiter):
+            if active_limiter is not None:
+                print(format_limiter_summary(active_limiter.summary()))
+
+        # 검색어마다 따로 돌렸을 때(검색어당 프로세스 1개)와 비교
+        elapsed = time.perf_counter() - started_at
+        fetched_pages = search_pages + len(link_data_list)
+        naive_pages = search_pages + naive_detail_pages
+        # (링크 수집은 검색어를 하나씩, 상세는 같은 동시성으로 중복 포함해서 가져온다고 가정)
+        per_paper_sec = detail_stage_sec / max(1, len(link_data_list))
+        naive_estimate_sec = link_stage_sec * query_workers + per_paper_sec * naive_detail_pages
+
+        print(f"\n🎉 === 배치 크롤링 완료! ===")
+        print(f"📁 파일명: {filename}")
+        print(f"📄 가져온 페이지: {fetched_pages}장 (검색어별 개별 실행 시 {naive_pages}장)")
+        print(f"⏱️ 전체 시간: {elapsed:.1f}초 (검색어별 개별 실행 추정 {naive_estimate_sec:.1f}초)")
+        print(format_throughput(paper_count, elapsed, sampler.stop()))
+        tracker.print_summary()
+        retry_queue.print_summary('dbpia_batch', dead_letter_path)
+
+        result = {
+            'filename': filename,
+            'keywords': len(keywords),
+            'papers': paper_count,
+            'pages_fetched': fetched_pages,
+            'naive_pages': naive_pages,
+            'elapsed_sec': round(elapsed, 3),
+            'naive_estimate_sec': round(naive_estimate_sec, 3),
+            'dead_letters': len(retry_queue.dead_letters),
+        }
+        metrics.incr('search_pages', search_pages)
+        metrics.report(metrics_path, prometheus_path, extra={'batch': result, 'waits': tracker.summary()})
+        return result
+
+    finally:
+        if writer is not None:
+            writer.close()
+        if journal is not None:
+            journal.close()
+        pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DBPIA 여러 검색어 배치 크롤링")
+    parser.add_argument('keyword_file', help="검색어 파일 (한 줄에 하나)")
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, help="전체 동시 요청 수")
+    parser.add_argument('--query-workers', type=int, default=4, help="동시에 링크를 수집할 검색어 수")
+    parser.add_argument('--fast', action='store_true', help="상세 페이지를 HTTP로 먼저 가져오기 (JSON-LD)")
+    parser.add_argument('--format', choices=sorted(FORMAT_EXTENSIONS), default='csv', help="결과 파일 형식")
+    parser.add_argument('--flush-interval', type=float, default=DEFAULT_FLUSH_INTERVAL, help="디스크 기록(fsync) 간격 (초)")
+    parser.add_argument('--journal', default=JOURNAL_PATH, help="작업 기록 파일 (이미 수집한 논문은 건너뜀)")
+    parser.add_argument('--no-journal', action='store_true', help="작업 기록 없이 처음부터 크롤링")
+    parser.add_argument('--output-dir', default='.', help="결과 파일 폴더")
+    parser.add_argument('--max-rps', type=float, default=DEFAULT_MAX_RPS, help="사이트별 초당 최대 요청 수")
+    parser.add_argument('--metrics', help="실행 요약 JSON 경로 (기본: data/metrics/dbpia_batch_<시각>.json)")
+    parser.add_argument('--prometheus', help="Prometheus textfile 경로")
+    parser.add_argument('--no-block', action='store_true', help="이미지/폰트/CSS/광고 요청 차단 끄기")
+    parser.add_argument('--max-attempts', type=int, default=3, help="논문 하나당 최대 시도 횟수 (일시적 오류만 재시도)")
+    args = parser.parse_args()
+
+    keywords = read_keywords(args.keyword_file)
+    if not keywords:
+        print("❌ 검색어 파일이 비어 있습니다.")
+        return
+
+    print("=" * 50)
+    print(f"🎓 DBPIA 배치 크롤링 (검색어 {len(keywords)}개)")
+    print("=" * 50)
+
+    crawl_dbpia_batch(
+        keywords,
+        budget=args.budget,
+        query_workers=args.query_workers,
+        fast=args.fast,
+        output_format=args.format,
+        flush_interval=args.flush_interval,
+        journal_path=None if args.no_journal else args.journal,
+        output_dir=args.output_dir,
+        max_rps=args.max_rps,
+        metrics_path=args.metrics,
+        prometheus_path=args.prometheus,
+        block_resources=not args.no_block,
+        max_attempts=args.max_attempts,
+    )
+
+
+if __name__ == "__main__":
+    main()
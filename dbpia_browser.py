@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# DBPIA 크롤링용 크롬 브라우저 생성 및 세션 풀
+from selenium import webdriver  # 웹 브라우저를 자동으로 조작하는 도구
+from selenium.webdriver.chrome.service import Service  # 크롬 브라우저 서비스
+from selenium.webdriver.chrome.options import Options  # 크롬 브라우저 옵션 설정
+from webdriver_manager.chrome import ChromeDriverManager  # 크롬 드라이버 자동 설치
+from contextlib import contextmanager  # with 문 지원
+import os  # 파일 시스템 관련 기능
+import queue  # 스레드 간 데이터 전달
+import resource  # 메모리 사용량 (psutil 없을 때)
+import threading  # 멀티스레딩
+from common.blocking import apply_selenium_blocking  # 이미지/폰트/광고 요청 차단
+from common.metrics import STAGE_BROWSER_LAUNCH, timed  # 단계별 시간 기록
+
+try:
+    import psutil  # 자식 프로세스(크롬)까지 포함한 메모리 측정 (선택)
+except ImportError:
+    psutil = None
+
+# 세션 하나가 처리할 최대 페이지 수 (이후 브라우저를 새로 띄움)
+SESSION_MAX_PAGES = 50
+
+_driver_path = None
+_driver_lock = threading.Lock()
+
+
+def get_driver_path():
+    """크롬 드라이버 경로 (프로세스당 한 번만 설치)"""
+    global _driver_path
+    with _driver_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def build_chrome_options():
+    """공통 크롬 옵션 생성"""
+    chrome_options = Options()
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-logging')
+    chrome_options.add_argument('--disable-web-security')
+    chrome_options.add_argument('--disable-features=VizDisplayCompositor')
+    chrome_options.add_argument('--log-level=3')
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    # DOMContentLoaded 에서 바로 돌려받고, 필요한 요소는 readiness 대기로 확인
+    chrome_options.page_load_strategy = 'eager'
+    return chrome_options
+
+
+def create_chrome_browser(blocking=None):
+    """새 크롬 브라우저 실행 (blocking 정책이 있으면 필요 없는 요청 차단)"""
+    service = Service(get_driver_path())
+    service.log_path = os.devnull
+    browser = webdriver.Chrome(service=service, options=build_chrome_options())
+    if blocking is not None:
+        apply_selenium_blocking(browser, blocking)
+    return browser
+
+
+class BrowserSession:
+    """풀에서 빌려주는 브라우저 한 개"""
+
+    def __init__(self, session_id, blocking=None):
+        self.session_id = session_id
+        self.browser = create_chrome_browser(blocking)
+        self.pages = 0
+
+    def quit(self):
+        try:
+            self.browser.quit()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    """오래 살아있는 브라우저 세션 풀 (스레드 수만큼)"""
+
+    def __init__(self, size, max_pages=SESSION_MAX_PAGES, metrics=None, blocking=None):
+        self.size = size
+        self.max_pages = max_pages
+        self.metrics = metrics  # 브라우저 실행 시간 기록 (선택)
+        self.blocking = blocking  # 요청 차단 정책 (선택)
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._live = 0
+        self._next_id = 1
+        self._closed = False
+        self.launched = 0  # 지금까지 띄운 브라우저 수
+        self.recycled = 0  # 교체한 브라우저 수
+
+    def checkout(self):
+        """세션 하나 빌리기 (없으면 새로 띄우고, 꽉 찼으면 대기)"""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("브라우저 풀이 이미 종료되었습니다")
+                can_launch = self._live < self.size
+                if can_launch:
+                    self._live += 1
+                    session_id = self._next_id
+                    self._next_id += 1
+
+            if can_launch:
+                try:
+                    with timed(self.metrics, STAGE_BROWSER_LAUNCH):
+                        session = BrowserSession(session_id, self.blocking)
+                except Exception:
+                    with self._lock:
+                        self._live -= 1
+                    raise
+                with self._lock:
+                    self.launched += 1
+                return session
+
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def checkin(self, session, crashed=False):
+        """세션 반납 (오류가 났거나 N 페이지를 넘기면 교체)"""
+        session.pages += 1
+        if crashed or session.pages >= self.max_pages or self._closed:
+            session.quit()
+            with self._lock:
+                self._live -= 1
+                self.recycled += 1
+            return
+        self._idle.put(session)
+
+    @contextmanager
+    def session(self):
+        """with 문으로 세션 빌리기"""
+        session = self.checkout()
+        crashed = False
+        try:
+            yield session
+        except Exception:
+            crashed = True
+            raise
+        finally:
+            self.checkin(session, crashed=crashed)
+
+    def close(self):
+        """풀에 남은 브라우저 모두 종료"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            session.quit()
+            with self._lock:
+                self._live -= 1
+
+
+def current_rss_bytes():
+    """현재 프로세스 + 자식 프로세스(크롬 포함)의 메모리 사용량"""
+    if psutil is None:
+        return None
+    try:
+        proc = psutil.Process()
+        total = proc.memory_info().rss
+        for child in proc.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+    except psutil.Error:
+        return None
+
+
+class PeakRssSampler:
+    """크롤링 동안 최대 메모리 사용량을 주기적으로 측정"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = current_rss_bytes()
+            if rss is not None:
+                self.peak_bytes = max(self.peak_bytes, rss)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if psutil is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if psutil is None:
+            # psutil 없으면 종료된 자식까지 포함한 ru_maxrss (리눅스 기준 KB)
+            self_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            child_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+            self.peak_bytes = (self_kb + child_kb) * 1024
+        return self.peak_bytes
+
+
+def format_throughput(count, elapsed, peak_bytes):
+    """처리 속도 및 최대 메모리 요약 문자열"""
+    rate = count / elapsed if elapsed > 0 else 0.0
+    return f"⏱️ {count}개 / {elapsed:.1f}초 ({rate:.2f} 논문/초), 🧠 최대 메모리: {peak_bytes / 1024 / 1024:.1f} MB"
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 브라우저 없이 HTTP로 DBPIA 상세 페이지를 가져오는 빠른 경로
+import urllib3  # 커넥션 풀 + keep-alive HTTP 클라이언트 (selenium 의존성)
+from common.concurrency import HttpStatusError
+from common.replay import site_url
+from dbpia_parser import extract_paper_record, missing_fields
+
+# 빠른 모드에서 동시에 처리할 논문 수
+FAST_MAX_WORKERS = 32
+
+# 이 필드가 비어 있으면 Selenium 경로로 다시 처리
+REQUIRED_FIELDS = ('제목', '저자', '발행년도', '학술지')
+
+HTTP_TIMEOUT = urllib3.Timeout(connect=5.0, read=15.0)
+
+DEFAULT_HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+    ),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+}
+
+
+def create_http_pool(max_workers=FAST_MAX_WORKERS):
+    """스레드들이 같이 쓰는 keep-alive 커넥션 풀 생성"""
+    return urllib3.PoolManager(
+        num_pools=4,
+        maxsize=max_workers,
+        block=True,
+        headers=DEFAULT_HEADERS,
+        timeout=HTTP_TIMEOUT,
+        # 재시도 후에도 5xx 면 응답을 그대로 받아서 동시 요청 수 조절에 반영
+        retries=urllib3.Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504), raise_on_status=False),
+    )
+
+
+def fetch_html(http, url):
+    """페이지 HTML 가져오기"""
+    response = http.request('GET', site_url(url))
+    if response.status != 200:
+        raise HttpStatusError(response.status, url)
+    return response.data.decode('utf-8', errors='replace')
+
+
+def extract_paper_from_html(html, link, idx):
+    """HTML에서 논문 정보 생성 ((논문 정보, 비어 있는 필수 필드 목록) 반환)"""
+    paper_info = extract_paper_record(html, link, idx)
+    return paper_info, missing_fields(paper_info, REQUIRED_FIELDS)
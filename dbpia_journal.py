@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 중단된 크롤링을 이어서 할 수 있게 해주는 작업 기록 (SQLite, WAL 모드)
+#
+# - query_links: 검색어별로 수집한 논문 링크 (순서 포함)
+# - papers: 논문 URL별 상세 수집 상태 (pending / done / failed) 와 결과
+# 상태는 URL 기준이라 여러 검색어에 같은 논문이 나와도 한 번만 수집합니다.
+from datetime import datetime  # 현재 날짜/시간 가져오기
+import json  # JSON 데이터 처리
+import os  # 파일 시스템 관련 기능
+import sqlite3  # 작업 기록 저장
+import threading  # 여러 스레드에서 같이 사용
+
+JOURNAL_PATH = 'data/dbpia_journal.sqlite3'
+
+STATUS_PENDING = 'pending'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS papers (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    record TEXT,
+    error TEXT,
+    updated_at TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS query_links (
+    query TEXT NOT NULL,
+    url TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (query, url)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_query_links_position ON query_links (query, position);
+CREATE INDEX IF NOT EXISTS idx_papers_status ON papers (status);
+'''
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class CrawlJournal:
+    """논문 URL 기준 작업 기록"""
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')  # WAL 에서는 커밋 단위로 안전
+        self._conn.executescript(_SCHEMA)
+
+    def record_links(self, query, links):
+        """검색어로 수집한 링크 기록 (새 논문은 pending 상태로 추가)"""
+        now = _now()
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO papers (url, status, updated_at) VALUES (?, ?, ?)',
+                    ((url, STATUS_PENDING, now) for url in links),
+                )
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO query_links (query, url, position) VALUES (?, ?, ?)',
+                    ((query, url, position) for position, url in enumerate(links, 1)),
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def saved_links(self, query):
+        """이전 실행에서 기록한 검색어의 링크 (순서대로)"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url FROM query_links WHERE query = ? ORDER BY position', (query,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def completed_records(self, query):
+        """검색어 링크 중 이미 수집이 끝난 논문 {url: record}"""
+        with self._lock:
+            rows = self._conn.execute(
+                '''SELECT p.url, p.record FROM query_links q
+                   JOIN papers p ON p.url = q.url
+                   WHERE q.query = ? AND p.status = ?''',
+                (query, STATUS_DONE),
+            ).fetchall()
+        return {url: json.loads(record) for url, record in rows}
+
+    def status_of(self, urls):
+        """URL 목록의 상태 {url: status} (기록이 없으면 빠짐)"""
+        result = {}
+        urls = list(urls)
+        with self._lock:
+            # SQLite 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT url, status FROM papers WHERE url IN ({placeholders})', chunk
+                ).fetchall()
+                result.update(rows)
+        return result
+
+    def mark_done(self, url, record):
+        """상세 수집 완료 기록"""
+        with self._lock:
+            self._conn.execute(
+                '''INSERT INTO papers (url, status, attempts, record, error, updated_at)
+                   VALUES (?, ?, 1, ?, NULL, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                       status = excluded.status, attempts = attempts + 1,
+                       record = excluded.record, error = NULL, updated_at = excluded.updated_at''',
+                (url, STATUS_DONE, json.dumps(record, ensure_ascii=False, default=str), _now()),
+            )
+
+    def mark_failed(self, url, error):
+        """상세 수집 실패 기록 (다음 실행에서 다시 시도)"""
+        with self._lock:
+            self._conn.execute(
+                '''INSERT INTO papers (url, status, attempts, error, updated_at)
+                   VALUES (?, ?, 1, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                       status = excluded.status, attempts = attempts + 1,
+                       error = excluded.error, updated_at = excluded.updated_at''',
+                (url, STATUS_FAILED, str(error), _now()),
+            )
+
+    def counts(self, query=None):
+        """상태별 논문 수 {status: count}"""
+        with self._lock:
+            if query is None:
+                rows = self._conn.execute('SELECT status, COUNT(*) FROM papers GROUP BY status').fetchall()
+            else:
+                rows = self._conn.execute(
+                    '''SELECT p.status, COUNT(*) FROM query_links q
+                       JOIN papers p ON p.url = q.url
+                       WHERE q.query = ? GROUP BY p.status''',
+                    (query,),
+                ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# DBPIA 검색 결과 페이지 URL을 직접 계산해서 병렬로 가져오는 페이지네이션 엔진
+from concurrent.futures import ThreadPoolExecutor  # 스레드 풀
+from html.parser import HTMLParser  # HTML 파싱 (표준 라이브러리)
+from urllib.parse import quote, urljoin  # URL 인코딩 / 상대 경로 처리
+import math  # 페이지 수 계산
+import re  # 정규식
+import time  # 시간 관련 기능
+from common.replay import site_url  # 재생 모드면 재생 서버 주소로
+from common.retry import RetryPolicy, classify_error  # 일시적인 오류만 다시 시도
+
+SEARCH_URL = 'https://www.dbpia.co.kr/search/topSearch?startCount={start}&collection=ALL&range=A&searchField=ALL&sort=RANK&query={query}&srchOption=*&includeAr=false'
+
+DEFAULT_PAGE_SIZE = 20  # 검색 결과 페이지당 결과 수 (startCount 간격)
+PAGINATION_MAX_PARALLEL = 8  # 동시에 가져올 검색 결과 페이지 수
+MAX_RESULT_PAGES = 500  # 안전 장치 (총 건수를 모를 때)
+PAGE_FETCH_ATTEMPTS = 3  # 검색 결과 페이지 하나당 최대 시도 횟수 (일시적 오류만 재시도)
+
+# 검색 결과 총 건수 표시 (사이트 문구가 바뀌어도 잡히도록 여러 개)
+TOTAL_COUNT_PATTERNS = [
+    re.compile(r'class="[^"]*(?:totalCount|total-count|searchCount|search__count)[^"]*"[^>]*>\s*\(?\s*([\d,]+)'),
+    re.compile(r'총\s*<[^>]*>\s*([\d,]+)\s*<'),
+    re.compile(r'총\s*([\d,]+)\s*건'),
+    re.compile(r'검색결과\s*\(?\s*([\d,]+)\s*\)?\s*건'),
+]
+
+
+def build_search_url(search_word, start_count=0):
+    """검색어와 시작 위치로 검색 결과 페이지 URL 생성"""
+    return site_url(SEARCH_URL.format(start=start_count, query=quote(search_word)))
+
+
+class _SearchLinkParser(HTMLParser):
+    """검색 결과 페이지에서 논문 링크(href) 수집"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.page_links = []  # class="thesis__pageLink"
+        self.thesis_links = []  # href 에 thesis 가 들어간 링크 (대안)
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'a':
+            return
+        attrs = dict(attrs)
+        href = attrs.get('href')
+        if not href or href.startswith('javascript:'):
+            return
+        if 'thesis__pageLink' in (attrs.get('class') or '').split():
+            self.page_links.append(href)
+        elif 'thesis' in href:
+            self.thesis_links.append(href)
+
+
+def parse_total_count(html):
+    """검색 결과 총 건수 (찾지 못하면 None)"""
+    for pattern in TOTAL_COUNT_PATTERNS:
+        match = pattern.search(html)
+        if match:
+            return int(match.group(1).replace(',', ''))
+    return None
+
+
+def parse_search_page(html, base_url, use_alternative=False):
+    """검색 결과 페이지 HTML에서 논문 링크 목록 추출"""
+    parser = _SearchLinkParser()
+    parser.feed(html)
+    parser.close()
+    links = parser.page_links
+    if not links and use_alternative:
+        links = parser.thesis_links
+    return [urljoin(base_url, href) for href in links]
+
+
+def collect_search_links(search_word, fetch_page, max_parallel=PAGINATION_MAX_PARALLEL,
+                         max_pages=MAX_RESULT_PAGES):
+    """검색 결과 전체 링크 수집
+
+    fetch_page(url) -> html 함수로 페이지를 가져옴 (HTTP 또는 브라우저)
+    총 건수를 알면 필요한 페이지 URL을 한 번에 계산해서 병렬로 가져오고,
+    모르면 max_parallel 장씩 가져오다가 새 링크가 없는 페이지에서 멈춤
+    페이지를 끝내 가져오지 못하면 (일시적 오류는 다시 시도한 뒤) 오류를 그대로 올림
+    """
+    started_at = time.perf_counter()
+
+    # 첫 페이지: 페이지 크기와 총 건수 파악
+    first_url = build_search_url(search_word, 0)
+    first_html = fetch_page(first_url)
+    first_links = parse_search_page(first_html, first_url, use_alternative=True)
+    total_count = parse_total_count(first_html)
+    print(f"🔗 첫 페이지에서 찾은 링크 수: {len(first_links)} (총 건수: {total_count if total_count is not None else '알 수 없음'})")
+
+    links = dict.fromkeys(first_links)  # 순서 유지 + O(1) 중복 제거
+    if not first_links:
+        return []
+
+    # 사이트의 페이지당 결과 수는 고정 (첫 페이지 링크 수는 중복/대안 링크가 섞일 수 있어서 확인용으로만 씀)
+    page_size = DEFAULT_PAGE_SIZE
+    if len(links) > page_size:
+        print(f"⚠️ 첫 페이지 링크 {len(links)}개가 페이지 크기 {page_size}보다 많습니다 (검색 결과 형식 확인 필요)")
+    pages_fetched = 1
+
+    retry_policy = RetryPolicy(max_attempts=PAGE_FETCH_ATTEMPTS)
+
+    def fetch_links(page_index):
+        # 실패한 페이지를 빈 페이지로 치면 결과가 빠지거나(총 건수를 알 때) 마지막 페이지로 오해하므로(모를 때)
+        # 일시적인 오류는 다시 시도하고, 그래도 안 되면 오류를 그대로 올려서 호출한 쪽이 다른 방법을 쓰게 함
+        url = build_search_url(search_word, page_index * page_size)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return parse_search_page(fetch_page(url), url)
+            except Exception as e:
+                kind = classify_error(e)
+                if not retry_policy.should_retry(kind, attempt):
+                    print(f"❌ {page_index + 1}페이지 처리 중 오류 ({attempt}회 시도): {e}")
+                    raise
+                print(f"⏳ {page_index + 1}페이지 다시 시도 ({attempt}회 실패): {e}")
+                time.sleep(retry_policy.delay(attempt))
+
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        if total_count is not None:
+            # 총 건수로 필요한 페이지를 모두 계산
+            page_count = min(math.ceil(total_count / page_size), max_pages)
+            for page_links in executor.map(fetch_links, range(1, page_count)):
+                links.update(dict.fromkeys(page_links))
+            pages_fetched = page_count
+        else:
+            # 총 건수를 모르면 max_parallel 장씩 진행
+            next_page = 1
+            while next_page < max_pages:
+                wave = range(next_page, min(next_page + max_parallel, max_pages))
+                reached_end = False
+                for page_links in executor.map(fetch_links, wave):
+                    before = len(links)
+                    links.update(dict.fromkeys(page_links))
+                    if len(links) == before:
+                        reached_end = True
+                pages_fetched += len(wave)
+                if reached_end:
+                    break
+                next_page = wave.stop
+
+    link_list = list(links)
+    if total_count is not None:
+        link_list = link_list[:total_count]
+
+    elapsed = time.perf_counter() - started_at
+    print(f"📄 검색 결과 {pages_fetched}페이지, 링크 {len(link_list)}개 수집 ({elapsed:.1f}초)")
+    return link_list
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# DBPIA 상세 페이지 HTML에서 논문 정보를 뽑아내는 함수들 (브라우저 없이 동작)
+#
+# extract_paper_record(html, link, idx) 하나로 Selenium 경로와 HTTP 빠른 경로가
+# 같은 결과를 만들고, 저장해 둔 페이지로 오프라인 테스트/벤치마크도 할 수 있습니다.
+from datetime import datetime  # 현재 날짜/시간 가져오기
+from html.parser import HTMLParser  # HTML 파싱 (표준 라이브러리)
+import json  # JSON 데이터 처리
+import re  # 정규식
+
+JSON_LD_PATTERN = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# 결과 파일의 열 순서
+PAPER_COLUMNS = ['번호', '제목', '저자', '학술지', '발행년도', '수록면', '초록', '링크', '크롤링날짜']
+
+# 상세 수집에 실패한 논문의 필드 값
+FAILED_TEXT = '처리 실패'
+
+# 페이지에서 찾지 못했을 때의 기본값
+FIELD_DEFAULTS = {
+    '제목': "제목 없음",
+    '저자': "저자 없음",
+    '학술지': "학술지 없음",
+    '발행년도': "년도 없음",
+    '수록면': "수록면 정보 없음",
+    '초록': "초록 없음",
+}
+
+# JSON-LD 가 없을 때 텍스트를 읽는 class (수록면은 앞에서부터 처음 값이 있는 것)
+PAGE_CLASSES = ('thesis__page', 'thesis__pages', 'page-info', 'thesis__volume', 'thesis__issue')
+FALLBACK_CLASSES = {
+    '제목': 'thesis__title',
+    '저자': 'thesis__author',
+    '발행년도': 'thesis__year',
+    '학술지': 'thesis__journal',
+}
+DETAIL_CLASSES = tuple(FALLBACK_CLASSES.values()) + ('abstractTxt',) + PAGE_CLASSES
+_CLASS_PATTERNS = {}  # class 목록 → 컴파일된 정규식
+
+# 텍스트를 읽지 않는 태그 / 닫는 태그가 없는 태그
+_SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+_VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+}
+
+
+def parse_json_ld(html):
+    """HTML에서 첫 번째 JSON-LD 데이터 추출 (없으면 None)"""
+    for match in JSON_LD_PATTERN.finditer(html):
+        try:
+            data = json.loads(match.group(1).strip())
+        except ValueError:
+            continue
+        if isinstance(data, list):
+            data = next((item for item in data if isinstance(item, dict)), None)
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def fields_from_json_ld(json_ld_data):
+    """JSON-LD에서 논문 필드 추출 (JSON-LD에 있는 키만 담아서 반환)"""
+    fields = {}
+    if not json_ld_data:
+        return fields
+
+    # 논문 제목
+    if 'headline' in json_ld_data:
+        fields['제목'] = json_ld_data['headline']
+
+    # 논문 저자
+    if 'author' in json_ld_data:
+        if isinstance(json_ld_data['author'], list):
+            fields['저자'] = ', '.join([author_item.get('name', '') if isinstance(author_item, dict) else str(author_item) for author_item in json_ld_data['author']])
+        elif isinstance(json_ld_data['author'], dict):
+            fields['저자'] = json_ld_data['author'].get('name', '')
+        else:
+            fields['저자'] = str(json_ld_data['author'])
+
+    # 발행년도
+    if 'datePublished' in json_ld_data:
+        fields['발행년도'] = str(json_ld_data['datePublished'])[:4]
+
+    # 학술지명
+    if 'isPartOf' in json_ld_data:
+        if isinstance(json_ld_data['isPartOf'], dict):
+            fields['학술지'] = json_ld_data['isPartOf'].get('name', '')
+        else:
+            fields['학술지'] = str(json_ld_data['isPartOf'])
+
+    # 수록면 정보
+    if 'pagination' in json_ld_data:
+        page_info = "수록면 정보 없음"
+        if isinstance(json_ld_data['pagination'], dict):
+            page_start = json_ld_data['pagination'].get('pageStart', '')
+            page_end = json_ld_data['pagination'].get('pageEnd', '')
+            if page_start:
+                page_info = str(page_start)
+                if page_end:
+                    page_info += f"-{page_end}"
+        else:
+            page_info = str(json_ld_data['pagination'])
+        fields['수록면'] = page_info
+
+    return fields
+
+
+class _AllFound(Exception):
+    """찾는 요소를 모두 읽었으니 나머지 HTML은 건너뜀"""
+
+
+class _ClassTextParser(HTMLParser):
+    """지정한 class들을 가진 첫 번째 요소의 텍스트를 한 번에 수집"""
+
+    def __init__(self, class_names):
+        super().__init__(convert_charrefs=True)
+        self.wanted = set(class_names)
+        self.stack = []  # [(태그, 이 요소에서 시작한 class 목록)]
+        self.active = []  # 지금 텍스트를 모으는 중인 class
+        self.parts = {}  # class → 텍스트 조각
+        self.skip_depth = 0  # script/style 안
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            if tag == 'br' and self.active and not self.skip_depth:
+                for name in self.active:
+                    self.parts[name].append('\n')
+            return
+        started = []
+        if self.wanted:
+            for key, value in attrs:
+                if key == 'class' and value:
+                    for name in value.split():
+                        if name in self.wanted:
+                            self.wanted.discard(name)
+                            self.parts[name] = []
+                            self.active.append(name)
+                            started.append(name)
+                    break
+        if tag in _SKIP_TAGS:
+            self.skip_depth += 1
+        self.stack.append((tag, started))
+
+    def handle_endtag(self, tag):
+        # 닫는 태그가 빠진 HTML도 있으므로 같은 태그를 만날 때까지 닫음
+        for position in range(len(self.stack) - 1, -1, -1):
+            if self.stack[position][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > position:
+            closed_tag, started = self.stack.pop()
+            if closed_tag in _SKIP_TAGS:
+                self.skip_depth -= 1
+            for name in started:
+                self.active.remove(name)
+        if not self.wanted and not self.active:
+            raise _AllFound()
+
+    def handle_data(self, data):
+        if self.active and not self.skip_depth:
+            for name in self.active:
+                self.parts[name].append(data)
+
+
+def _normalize_text(parts):
+    # 브라우저의 .text 처럼 줄마다 공백 정리
+    raw = ''.join(parts)
+    lines = [' '.join(line.split()) for line in raw.splitlines()]
+    return '\n'.join(line for line in lines if line).strip()
+
+
+def _class_pattern(class_names):
+    names = '|'.join(re.escape(name) for name in class_names)
+    return re.compile(r'class\s*=\s*["\'][^"\']*?(?<![\w-])(?:' + names + r')(?![\w-])')
+
+
+def collect_class_texts(html, class_names):
+    """class 이름별 첫 요소의 텍스트 {class: text} (요소가 없으면 키가 없음)
+
+    처음 나오는 대상 요소의 태그부터 파싱을 시작하고, 모두 읽으면 바로 멈춤
+    """
+    class_names = tuple(class_names)
+    if not class_names:
+        return {}
+    pattern = _CLASS_PATTERNS.get(class_names)
+    if pattern is None:
+        pattern = _CLASS_PATTERNS[class_names] = _class_pattern(class_names)
+    match = pattern.search(html)
+    if not match:
+        return {}
+    start = html.rfind('<', 0, match.start())
+
+    parser = _ClassTextParser(class_names)
+    try:
+        parser.feed(html[max(start, 0):])
+        parser.close()
+    except _AllFound:
+        pass
+    return {name: _normalize_text(parts) for name, parts in parser.parts.items()}
+
+
+def needed_classes(fields):
+    """JSON-LD 에 없는 필드만 HTML에서 찾도록 필요한 class 목록"""
+    names = ['abstractTxt']
+    for field, class_name in FALLBACK_CLASSES.items():
+        if field not in fields:
+            names.append(class_name)
+    if '수록면' not in fields:
+        names.extend(PAGE_CLASSES)
+    return tuple(names)
+
+
+def extract_title(fields, texts):
+    """논문 제목 (JSON-LD → thesis__title)"""
+    if '제목' in fields:
+        return fields['제목']
+    return texts.get('thesis__title', FIELD_DEFAULTS['제목'])
+
+
+def extract_author(fields, texts):
+    """논문 저자 (JSON-LD 저자 목록 → thesis__author)"""
+    if '저자' in fields:
+        return fields['저자']
+    return texts.get('thesis__author', FIELD_DEFAULTS['저자'])
+
+
+def extract_journal(fields, texts):
+    """학술지명 (JSON-LD isPartOf → thesis__journal)"""
+    if '학술지' in fields:
+        return fields['학술지']
+    return texts.get('thesis__journal', FIELD_DEFAULTS['학술지'])
+
+
+def extract_year(fields, texts):
+    """발행년도 (JSON-LD datePublished → thesis__year)"""
+    if '발행년도' in fields:
+        return fields['발행년도']
+    return texts.get('thesis__year', FIELD_DEFAULTS['발행년도'])
+
+
+def extract_pages(fields, texts):
+    """수록면 (JSON-LD pagination → 페이지 관련 class 순서대로)"""
+    if '수록면' in fields:
+        return fields['수록면']
+    page_info = FIELD_DEFAULTS['수록면']
+    for name in PAGE_CLASSES:
+        if name in texts:
+            page_info = texts[name]
+            if page_info:
+                break
+    return page_info
+
+
+def extract_abstract(fields, texts):
+    """초록 (abstractTxt)"""
+    return texts.get('abstractTxt', FIELD_DEFAULTS['초록'])
+
+
+# (결과 열 이름, 추출 함수) - 벤치마크에서 필드별 비용을 잴 때도 사용
+FIELD_EXTRACTORS = [
+    ('제목', extract_title),
+    ('저자', extract_author),
+    ('학술지', extract_journal),
+    ('발행년도', extract_year),
+    ('수록면', extract_pages),
+    ('초록', extract_abstract),
+]
+
+
+def extract_paper_record(html, link, idx):
+    """상세 페이지 HTML → 논문 정보 (브라우저/네트워크 없이 동작하는 순수 함수)"""
+    fields = fields_from_json_ld(parse_json_ld(html))
+    texts = collect_class_texts(html, needed_classes(fields))
+    record = build_paper_info(idx, link)
+    for name, extractor in FIELD_EXTRACTORS:
+        record[name] = extractor(fields, texts)
+    return record
+
+
+def missing_fields(record, names):
+    """값이 비었거나 기본값(…없음)인 필드 목록"""
+    return [name for name in names if not record.get(name) or record[name] == FIELD_DEFAULTS.get(name)]
+
+
+def build_paper_info(idx, link, title=FIELD_DEFAULTS['제목'], author=FIELD_DEFAULTS['저자'],
+                     journal=FIELD_DEFAULTS['학술지'], year=FIELD_DEFAULTS['발행년도'],
+                     page_info=FIELD_DEFAULTS['수록면'], abstract=FIELD_DEFAULTS['초록']):
+    """CSV 한 줄에 해당하는 논문 정보 딕셔너리 생성"""
+    return {
+        '번호': idx,
+        '제목': title,
+        '저자': author,
+        '학술지': journal,
+        '발행년도': year,
+        '수록면': page_info,
+        '초록': abstract,
+        '링크': link,
+        '크롤링날짜': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+# 테스트에서 저장소 모듈을 스크립트와 같은 방식으로 불러오도록 경로 추가
+# (common 은 저장소 루트, zigzag_* 는 zigzag 폴더, 벤치마크 기준 구현은 benchmarks 폴더)
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, 'zigzag'), os.path.join(ROOT, 'benchmarks')):
+    if path not in sys.path:
+        sys.path.append(path)
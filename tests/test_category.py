@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+# 분류기가 예전 guess_category_from_title / 카테고리마다 any() 검사와 같은 결과를 내는지
+from bench_category import chain_classifier, extended_taxonomy, legacy_guess, synthetic_titles
+from zigzag_category import DEFAULT_CATEGORY, DEFAULT_TAXONOMY, CategoryClassifier
+
+
+def test_default_taxonomy_matches_legacy():
+    titles = synthetic_titles(3000, DEFAULT_TAXONOMY) + [
+        '', '오버핏 셔츠 팬츠 세트', 'SHIRT & Pants', '린넨 바지 가방', 'bag shoes', '데일리 니트']
+    classifier = CategoryClassifier()
+    assert classifier.classify_many(titles) == [legacy_guess(title) for title in titles]
+
+
+def test_extended_taxonomy_matches_chain():
+    taxonomy = extended_taxonomy(categories=20, keywords=10)
+    titles = synthetic_titles(3000, taxonomy)
+    assert CategoryClassifier(taxonomy).classify_many(titles) == [chain_classifier(taxonomy)(t) for t in titles]
+
+
+def test_overlapping_keywords_keep_priority():
+    # 우선인 키워드가 다른 키워드 안에 들어 있음 / 앞부분이 겹침 / 끝과 앞이 이어짐
+    taxonomies = [
+        [{'category': 'A', 'keywords': ['셔츠']}, {'category': 'B', 'keywords': ['티셔츠']}],
+        [{'category': 'A', 'keywords': ['티셔츠']}, {'category': 'B', 'keywords': ['셔츠']}],
+        [{'category': 'A', 'keywords': ['가방']}, {'category': 'B', 'keywords': ['가방끈']}],
+        [{'category': 'A', 'keywords': ['방끈']}, {'category': 'B', 'keywords': ['가방']}],
+    ]
+    titles = ['티셔츠', '셔츠', '가방끈', '가방', '방끈', '반팔 티셔츠 가방끈', '니트']
+    for taxonomy in taxonomies:
+        classifier = CategoryClassifier(taxonomy)
+        assert classifier.classify_many(titles) == [chain_classifier(taxonomy)(t) for t in titles]
+
+
+def test_empty_taxonomy_and_title():
+    assert CategoryClassifier([{'category': 'A', 'keywords': []}]).classify('셔츠') == DEFAULT_CATEGORY
+    assert CategoryClassifier().classify(None) == DEFAULT_CATEGORY
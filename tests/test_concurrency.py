@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# AIMD 동시 요청 수 계산 (성공하면 조금씩 늘리고, 과부하면 절반으로, 줄인 뒤에는 cooldown 동안 다시 줄이지 않음)
+import pytest
+
+from common import concurrency
+from common.concurrency import AimdController
+
+
+class StatusError(Exception):
+    def __init__(self, status):
+        super().__init__(f'HTTP {status}')
+        self.status = status
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(concurrency.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_additive_increase_up_to_max(clock):
+    controller = AimdController(initial=4, max_limit=6)
+    for _ in range(4):  # 동시 요청 수만큼 성공 → 약 1 증가
+        controller.on_success(0.1)
+    assert controller.allowed == 4 and 4.9 < controller.limit < 5.0
+    for _ in range(100):
+        controller.on_success(0.1)
+    assert controller.limit == 6 and controller.peak_limit == 6
+
+
+def test_overload_halves_once_per_cooldown(clock):
+    controller = AimdController(initial=16, min_limit=2, cooldown=1.0)
+    controller.on_overload()
+    assert controller.limit == 8
+    controller.on_overload()  # cooldown 안 → 그대로
+    assert controller.limit == 8 and controller.overloads == 2 and controller.decreases == 1
+    clock[0] += 1.0
+    controller.on_overload()
+    assert controller.limit == 4
+    for _ in range(5):
+        clock[0] += 1.0
+        controller.on_overload()
+    assert controller.allowed == 2  # min_limit 아래로는 안 내려감
+
+
+def test_latency_rise_decreases(clock):
+    controller = AimdController(initial=8, latency_tolerance=2.0)
+    for _ in range(11):
+        controller.on_success(0.1)
+    before = controller.limit
+    for _ in range(10):  # 지연 평균이 최소 지연의 2배를 넘으면 0.9배 (cooldown 때문에 한 번만)
+        controller.on_success(1.0)
+    assert controller.decreases == 1
+    assert controller.limit < before
+
+
+def test_record_routes_errors(clock):
+    controller = AimdController(initial=8)
+    controller.record(0.5, StatusError(404))
+    assert controller.limit == 8 and controller.errors == 1
+    controller.record(0.5, StatusError(503))
+    assert controller.limit == 4 and controller.overloads == 1
+    clock[0] += 10
+    controller.record(0.5, TimeoutError())
+    assert controller.limit == 2 and controller.overloads == 2
+    controller.record(0.1)
+    assert controller.successes == 1
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# 재시도 백오프 / RetryQueue 예약·꺼내기·최종 실패 / 오류 분류
+import json
+
+from common import retry
+from common.retry import PERMANENT, TRANSIENT, RetryPolicy, RetryQueue, classify_error
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class StatusError(Exception):
+    def __init__(self, status):
+        super().__init__(f'HTTP {status}')
+        self.status = status
+
+
+def test_delay_is_full_jitter_with_cap():
+    policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=5.0)
+    for attempt, ceiling in [(1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0), (10, 5.0)]:
+        delays = [policy.delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling / 2  # 0 에만 붙어 있지 않음
+
+
+def test_should_retry_only_transient_within_attempts():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry(TRANSIENT, 1)
+    assert policy.should_retry(TRANSIENT, 2)
+    assert not policy.should_retry(TRANSIENT, 3)
+    assert not policy.should_retry(PERMANENT, 1)
+
+
+def test_queue_waits_for_backoff(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(retry.time, 'monotonic', clock)
+    queue = RetryQueue(RetryPolicy(max_attempts=3, base_delay=2.0, max_delay=2.0))
+    monkeypatch.setattr(queue.policy, 'delay', lambda attempt: 2.0)
+
+    assert queue.schedule('a', {'url': 'a'}, TRANSIENT, 'timed out')
+    assert len(queue) == 1
+    assert queue.pop_due() == []
+    assert queue.next_delay() == 2.0
+
+    clock.now += 2.0
+    assert queue.pop_due() == [{'url': 'a'}]
+    assert len(queue) == 0
+    assert queue.next_delay() is None
+    assert queue.attempts('a') == 1
+    assert queue.retried == 1
+
+
+def test_queue_dead_letters_after_max_attempts(tmp_path):
+    queue = RetryQueue(RetryPolicy(max_attempts=2, base_delay=0.0))
+    assert queue.schedule('a', 'a', TRANSIENT, 'timed out')
+    assert not queue.schedule('a', 'a', TRANSIENT, 'timed out')  # 두 번째 실패 = 마지막 시도
+    assert not queue.schedule('b', 'b', PERMANENT, 'HTTP 404')  # 영구 오류는 바로 최종 실패
+    assert [(entry['key'], entry['attempts'], entry['kind']) for entry in queue.dead_letters] == [
+        ('a', 2, TRANSIENT), ('b', 1, PERMANENT)]
+
+    path = queue.write_report('test', str(tmp_path / 'dead.jsonl'))
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line)['key'] for line in f] == ['a', 'b']
+    assert RetryQueue().write_report('test', str(tmp_path / 'none.jsonl')) is None
+
+
+def test_classify_error():
+    assert classify_error(StatusError(404)) == PERMANENT
+    assert classify_error(StatusError(429)) == TRANSIENT
+    assert classify_error(StatusError(503)) == TRANSIENT
+    assert classify_error(TimeoutError()) == TRANSIENT
+    assert classify_error(ConnectionResetError()) == TRANSIENT
+    assert classify_error(RuntimeError('net::ERR_CONNECTION_RESET')) == TRANSIENT
+    assert classify_error(ValueError('파싱 실패')) == PERMANENT
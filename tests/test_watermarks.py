@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+# 상품별 워터마크: 델타 계산, 일찍 멈추기, commit/discard, 전체 갱신 시각(full_at)
+import pytest
+
+from common.watermarks import WatermarkStore, content_key
+
+SCOPE = 'zigzag_reviews'
+QUIET = {'stopped_by': 'quiet'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = WatermarkStore(str(tmp_path / 'watermarks.sqlite3'), keep=5, full_refresh_days=7)
+    yield store
+    store.close()
+
+
+def full_at(store, product_id):
+    row = store.conn.execute('SELECT full_at FROM watermarks WHERE scope = ? AND product_id = ?',
+                             (SCOPE, product_id)).fetchone()
+    return row and row[0]
+
+
+def test_first_crawl_reads_to_end(store):
+    watermark = store.load(SCOPE, 1)
+    assert not watermark.stop_early and not watermark.should_stop('a')
+    fresh, summary = store.track(watermark, ['c', 'b', 'a'], key=str)
+    assert fresh == ['c', 'b', 'a']
+    assert summary['new'] == 3 and summary['full']
+    store.commit(1, QUIET)
+    assert full_at(store, '1') is not None
+    assert store.summary()['full'] == 1
+
+
+def test_second_crawl_returns_delta_and_stops_early(store):
+    store.track(store.load(SCOPE, 1), ['b', 'a'], key=str)
+    store.commit(1, QUIET)
+    first_full_at = full_at(store, '1')
+
+    watermark = store.load(SCOPE, 1)
+    assert watermark.stop_early
+    assert not watermark.should_stop('d')
+    assert watermark.should_stop('b') and watermark.caught_up
+    fresh, summary = store.track(watermark, ['d', 'c', 'b'], key=str)
+    assert fresh == ['d', 'c'] and summary['seen'] == 1
+    store.commit(1, {'stopped_by': 'caught_up'})
+    assert full_at(store, '1') == first_full_at  # 일찍 멈췄으면 전체 갱신 아님
+    assert store.summary()['incremental'] == 1
+    assert store.load(SCOPE, 1).previous == ['d', 'c', 'b', 'a']
+
+
+def test_cut_short_does_not_count_as_full(store):
+    store.track(store.load(SCOPE, 1), ['b', 'a'], key=str)
+    store.commit(1, {'stopped_by': 'max_pages'})
+    assert full_at(store, '1') is None
+    assert store.summary()['cut_short'] == 1
+    # 전체 갱신을 한 적이 없으니 다음에도 끝까지 읽음
+    assert not store.load(SCOPE, 1).stop_early
+
+    store.track(store.load(SCOPE, 2), ['x'], key=str)
+    store.commit(2)  # 멈춘 이유를 모르면 끝까지 읽은 것으로 치지 않음
+    assert full_at(store, '2') is None
+
+
+def test_refresh_due_reads_to_end_again(store):
+    store.track(store.load(SCOPE, 1), ['a'], key=str)
+    store.commit(1, QUIET)
+    store.conn.execute('UPDATE watermarks SET full_at = full_at - ?', (8 * 24 * 3600,))
+    watermark = store.load(SCOPE, 1)
+    assert not watermark.stop_early and not watermark.should_stop('a')
+    assert watermark.seen('a')  # 델타 계산은 그대로
+
+
+def test_discard_and_commit_one_product(store):
+    store.track(store.load(SCOPE, 1), ['a'], key=str)
+    store.track(store.load(SCOPE, 2), ['b'], key=str)
+    store.discard(1)
+    store.commit(2, QUIET)
+    assert store.load(SCOPE, 1).previous == []
+    assert store.load(SCOPE, 2).previous == ['b']
+
+
+def test_stage_merges_and_keeps_recent_keys(store):
+    watermark = store.load(SCOPE, 1)
+    store.stage(watermark, ['r2', 'r1'], newest_date='2024-05-01', new_count=2)
+    store.stage(watermark, ['i3', 'i2', 'i1', 'i0'], newest_date='2024-06-01', new_count=4)
+    store.commit(1, QUIET)
+    loaded = store.load(SCOPE, 1)
+    assert loaded.previous == ['r2', 'r1', 'i3', 'i2', 'i1']  # keep=5
+    assert loaded.newest_date == '2024-06-01'
+    assert store.summary()['new_items'] == 6
+
+
+def test_content_key_ignores_whitespace():
+    assert content_key('좋아요  정말', None, 5) == content_key(' 좋아요 정말 ', 5)
+    assert content_key('좋아요', 5) != content_key('좋아요', 4)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+# 비정상 종료로 잘린 마지막 줄 복구 (truncate_partial_line)
+from common.writers import truncate_partial_line
+
+
+def write(tmp_path, data):
+    path = tmp_path / 'out'
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_missing_or_empty_file(tmp_path):
+    assert truncate_partial_line(str(tmp_path / 'none.jsonl')) == 0
+    assert truncate_partial_line(write(tmp_path, b'')) == 0
+
+
+def test_jsonl_keeps_complete_lines(tmp_path):
+    path = write(tmp_path, b'{"a":1}\n{"a":2}\n')
+    assert truncate_partial_line(path) == 16
+    with open(path, 'rb') as f:
+        assert f.read() == b'{"a":1}\n{"a":2}\n'
+
+
+def test_jsonl_drops_partial_line(tmp_path):
+    path = write(tmp_path, b'{"a":1}\n{"a":')
+    assert truncate_partial_line(path) == 8
+    with open(path, 'rb') as f:
+        assert f.read() == b'{"a":1}\n'
+    assert truncate_partial_line(write(tmp_path, b'{"a":')) == 0
+
+
+def test_csv_newline_inside_quotes_is_not_a_line_end(tmp_path):
+    complete = 'title,abstract\n논문,"첫 줄\n둘째 줄"\n'.encode('utf-8')
+    path = write(tmp_path, complete)
+    assert truncate_partial_line(path, quote='"') == len(complete)
+
+    # 따옴표 안에서 끊긴 행 → 그 행 전체를 버림
+    header = 'title,abstract\n'.encode('utf-8')
+    path = write(tmp_path, header + '논문,"첫 줄\n둘째'.encode('utf-8'))
+    assert truncate_partial_line(path, quote='"') == len(header)
+
+    # 마지막 완전한 행에 따옴표 안 줄바꿈이 있어도 그 행까지는 남김
+    path = write(tmp_path, complete + '논문2,"끊'.encode('utf-8'))
+    assert truncate_partial_line(path, quote='"') == len(complete)
+    with open(path, 'rb') as f:
+        assert f.read() == complete
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+# 지그재그 후기 목록을 화면(DOM) 대신 API 응답(JSON)에서 바로 읽기
+#
+# 후기 목록 페이지는 JSON API 응답으로 화면을 채웁니다. Playwright 의 response 이벤트로
+# 그 응답을 받아서 후기 내용/이미지/별점/작성일을 꺼내고, 더 없을 때까지 다음 페이지를 불러옵니다.
+# CSS 클래스 이름(css-s01evr 등)이 바뀌어도 영향이 없고, 스크롤 횟수도 훨씬 적습니다.
+#
+# 응답 형식(GraphQL 필드 이름)이 바뀌어도 버틸 수 있도록 특정 경로 대신
+# "id + 내용 + (별점 또는 작성일) 필드가 있는 객체"를 후기로 보고 JSON 전체를 훑습니다.
+import asyncio
+from datetime import datetime, timezone
+import time
+
+from common.metrics import STAGE_NAVIGATION, timed
+from common.watermarks import content_key
+
+# 후기 API 응답으로 볼 URL 조각
+REVIEW_API_MARKERS = ('graphql', '/review', 'review_list', 'ReviewList')
+
+# 후기 객체를 알아보는 필드 이름 (앞에 있을수록 우선)
+REVIEW_ID_KEYS = ('id', 'review_id', 'reviewId')
+REVIEW_TEXT_KEYS = ('contents', 'content', 'review_text', 'text', 'body')
+REVIEW_RATING_KEYS = ('rating', 'score', 'star', 'rating_value', 'ratingValue')
+REVIEW_DATE_KEYS = ('date_created', 'created_at', 'createdAt', 'dateCreated', 'date')
+REVIEW_OPTION_KEYS = ('option', 'option_name', 'optionName', 'product_option', 'selected_option', 'option_detail')
+HAS_NEXT_KEYS = ('has_next', 'hasNext', 'has_next_page', 'hasNextPage')
+
+# 후기 첨부 사진 원본 주소 (화면에서 읽을 때와 같은 기준 - 프로필 사진/상품 썸네일/옵션 색상 이미지 제외)
+REVIEW_IMAGE_MARKER = 'zigzag.kr/original/review/'
+
+API_FIRST_RESPONSE_TIMEOUT = 15.0  # 첫 후기 응답을 기다리는 최대 시간 (초)
+API_NEXT_RESPONSE_TIMEOUT = 3.0  # 스크롤 후 다음 응답을 기다리는 최대 시간 (초)
+API_MAX_PAGES = 200  # 안전장치: 최대 응답(페이지) 수
+
+
+def is_review_response(url, content_type):
+    """후기 목록 API 응답인지 (JSON + 후기 관련 URL)"""
+    if 'json' not in (content_type or ''):
+        return False
+    return any(marker in url for marker in REVIEW_API_MARKERS)
+
+
+def _first(obj, keys):
+    for key in keys:
+        value = obj.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def _format_date(value):
+    """epoch(초/밀리초) 숫자는 ISO 문자열로, 문자열은 그대로"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, tz=timezone.utc).isoformat(timespec='seconds')
+    return value
+
+
+def _is_image_url(value):
+    return isinstance(value, str) and value.startswith('http') and REVIEW_IMAGE_MARKER in value.split('?')[0]
+
+
+def _collect_image_urls(obj, urls):
+    """후기 객체 안의 후기 사진 URL (쿼리 문자열 제거, 순서 유지)"""
+    if isinstance(obj, dict):
+        for value in obj.values():
+            _collect_image_urls(value, urls)
+    elif isinstance(obj, list):
+        for value in obj:
+            _collect_image_urls(value, urls)
+    elif _is_image_url(obj):
+        urls.setdefault(obj.split('?')[0], None)
+    return urls
+
+
+def _option_text(value):
+    """구매 옵션 값 → 문자열 ('블랙 / M' 처럼, 목록/객체면 값만 이어 붙임)"""
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, dict):
+        value = [value]
+    if not isinstance(value, list):
+        return None
+    parts = []
+    for item in value:
+        if isinstance(item, dict):
+            item = _first(item, ('value', 'name', 'text'))
+        if isinstance(item, str) and item.strip():
+            parts.append(item.strip())
+    return ' / '.join(parts) or None
+
+
+def _looks_like_review(obj):
+    # id + 내용 + (별점 또는 작성일) 이 있어야 후기로 봄 (상품 옵션 같은 객체 제외)
+    return (isinstance(obj, dict)
+            and _first(obj, REVIEW_ID_KEYS) is not None
+            and isinstance(_first(obj, REVIEW_TEXT_KEYS), str)
+            and (_first(obj, REVIEW_RATING_KEYS) is not None or _first(obj, REVIEW_DATE_KEYS) is not None))
+
+
+def normalize_review(obj):
+    """API 후기 객체 → {id, text, rating, option, date, images}"""
+    rating = _first(obj, REVIEW_RATING_KEYS)
+    return {
+        'id': str(_first(obj, REVIEW_ID_KEYS)),
+        'text': _first(obj, REVIEW_TEXT_KEYS).strip(),
+        'rating': rating if isinstance(rating, (int, float)) and not isinstance(rating, bool) else None,
+        'option': _option_text(_first(obj, REVIEW_OPTION_KEYS)),
+        'date': _format_date(_first(obj, REVIEW_DATE_KEYS)),
+        'images': list(_collect_image_urls(obj, {})),
+    }
+
+
+def review_key(review, by_id=True):
+    """증분 크롤링용 후기 키 (API 후기는 ID, 화면에서 읽은 후기는 순번이 바뀌므로 내용 해시)"""
+    if by_id:
+        return f"id:{review['id']}"
+    return content_key(review.get('text'))  # 화면에서 스크롤 중에 확인할 때도 같은 값이 나오도록 원문만
+
+
+def parse_review_payload(payload):
+    """응답 JSON → (후기 목록, 다음 페이지 여부 또는 None)"""
+    reviews = []
+    has_next = None
+    stack = [payload]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            if _looks_like_review(obj):
+                reviews.append(normalize_review(obj))
+                continue  # 후기 안의 하위 객체(댓글 등)는 따로 보지 않음
+            for key in HAS_NEXT_KEYS:
+                if isinstance(obj.get(key), bool):
+                    has_next = obj[key]
+            stack.extend(reversed(list(obj.values())))
+        elif isinstance(obj, list):
+            stack.extend(reversed(obj))
+    return reviews, has_next
+
+
+class ReviewCapture:
+    """페이지의 후기 API 응답을 모아서 후기 목록으로 정리"""
+
+    def __init__(self, metrics=None, stop_at=None, on_review=None):
+        self.reviews = {}  # id → 후기 (처음 나온 순서, on_review 가 있으면 모으지 않음)
+        self.seen_ids = set()
+        self.total = 0  # 지금까지 받은 후기 수 (중복 제외)
+        self.on_review = on_review  # 새 후기를 받는 대로 넘길 함수 (스트리밍 저장)
+        self.responses = 0
+        self.has_next = None
+        self.metrics = metrics
+        self.stop_at = stop_at  # 후기 → 참이면 더 읽지 않음 (증분 크롤링)
+        self.caught_up = False
+        self._arrived = asyncio.Event()
+        self._tasks = set()
+        self._page = None
+
+    def attach(self, page):
+        page.on('response', self._on_response)
+        self._page = page
+        return self
+
+    def detach(self):
+        """응답 구독 해제 (같은 페이지로 다음 상품을 열 때 이전 수집이 응답을 계속 받지 않도록)"""
+        if self._page is not None:
+            self._page.remove_listener('response', self._on_response)
+            self._page = None
+
+    def _on_response(self, response):
+        if not is_review_response(response.url, response.headers.get('content-type')):
+            return
+        task = asyncio.ensure_future(self._handle(response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, response):
+        try:
+            payload = await response.json()
+        except Exception:
+            return  # 본문이 없거나 JSON 이 아닌 응답
+        reviews, has_next = parse_review_payload(payload)
+        if not reviews and has_next is None:
+            return  # 후기와 상관없는 GraphQL 응답
+        self.responses += 1
+        new_count = 0
+        for review in reviews:
+            if review['id'] not in self.seen_ids:
+                self.seen_ids.add(review['id'])
+                if self.on_review is not None:
+                    self.on_review(review)
+                else:
+                    self.reviews[review['id']] = review
+                new_count += 1
+            if self.stop_at is not None and self.stop_at(review):
+                self.caught_up = True
+        self.total += new_count
+        if has_next is not None:
+            self.has_next = has_next
+        if self.metrics is not None:
+            self.metrics.incr('api_responses')
+            self.metrics.incr('api_reviews', new_count)
+        self._arrived.set()
+
+    async def wait_for_response(self, timeout):
+        """다음 후기 응답이 올 때까지 대기 (오면 True)"""
+        try:
+            await asyncio.wait_for(self._arrived.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._arrived.clear()
+        return True
+
+    async def settle(self):
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def review_list(self):
+        return list(self.reviews.values())
+
+
+async def capture_reviews_from_api(page, review_url, tracker=None, metrics=None, max_pages=API_MAX_PAGES,
+                                   stop_at=None, on_review=None):
+    """후기 목록 페이지를 열고 API 응답에서 후기를 모두 수집 (다음 페이지가 없을 때까지 스크롤)
+
+    stop_at(후기) 이 참인 후기가 나오면 다음 페이지를 요청하지 않음 (이미 본 후기에 도달)
+    on_review(후기) 를 주면 받는 대로 넘기고 모으지 않음 (반환 목록은 비어 있음, 메모리 일정)
+    (후기 목록, {responses, reviews, scrolls, stopped_by}) 반환 - stopped_by 는 scroll_until_idle 과 같은 뜻:
+    'quiet'(다음 페이지 없음), 'caught_up', 'max_pages', 'timeout'(다음 페이지가 있는데 응답이 안 옴)
+    """
+    capture = ReviewCapture(metrics, stop_at, on_review).attach(page)
+    scrolls = 0
+    stopped_by = 'timeout'
+    try:
+        with timed(metrics, STAGE_NAVIGATION):
+            await page.goto(review_url, wait_until='domcontentloaded')
+        started = time.perf_counter()
+        arrived = await capture.wait_for_response(API_FIRST_RESPONSE_TIMEOUT)
+        if tracker is not None:
+            tracker.record('review_api', time.perf_counter() - started, arrived)
+        if arrived:
+            stopped_by = None
+            while stopped_by is None:
+                if capture.caught_up:
+                    stopped_by = 'caught_up'
+                elif capture.has_next is False:
+                    stopped_by = 'quiet'  # 마지막 페이지
+                elif capture.responses >= max_pages:
+                    stopped_by = 'max_pages'
+                else:
+                    before = capture.total
+                    await page.evaluate('() => window.scrollTo(0, document.body.scrollHeight)')
+                    scrolls += 1
+                    if not await capture.wait_for_response(API_NEXT_RESPONSE_TIMEOUT):
+                        # 다음 페이지가 있다고 했는데 응답이 없으면 중간에 끊긴 것, 알 수 없으면 끝으로 봄
+                        stopped_by = 'timeout' if capture.has_next else 'quiet'
+                    elif capture.has_next is None and capture.total == before:
+                        stopped_by = 'quiet'  # 다음 페이지 여부를 알 수 없고 새 후기도 없음
+    finally:
+        capture.detach()
+        await capture.settle()  # 해제 전에 받은 응답은 끝까지 처리
+    if capture.caught_up:
+        stopped_by = 'caught_up'
+    stats = {'responses': capture.responses, 'reviews': capture.total, 'scrolls': scrolls, 'stopped_by': stopped_by}
+    if arrived:
+        print(f"📡 API 응답 {capture.responses}개에서 후기 {capture.total}개 수집 (스크롤 {scrolls}회, 멈춘 이유: {stopped_by})")
+    return capture.review_list(), stats
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 여러 상품을 한 번에 돌리는 지그재그 배치 크롤러
+#
+# 사용법: python zigzag/zigzag_batch.py products.txt --kind images --concurrency 8
+# - products.txt 는 한 줄에 상품 URL 하나 (# 으로 시작하면 주석, 단축 링크도 가능)
+# - 크롬은 하나만 띄우고 상품마다 컨텍스트(탭)를 돌려 쓰며, 이미지 다운로드/서버 전송은
+#   연결 풀이 있는 aiohttp 세션 하나와 이미지 저장소 하나를 모든 상품이 같이 씁니다.
+# - 결과는 상품이 끝나는 순서대로 JSON Lines 파일에 한 줄씩 바로 기록합니다.
+# - --incremental 이면 상품마다 워터마크를 보고 이미 본 후기에서 멈추고, 새로 나온 것만 기록합니다.
+# - --upload-url 을 주면 이미지 정보는 상품마다 보내지 않고 BatchUploader 로 모아서 gzip 으로 보냅니다.
+# - --review-output-dir 을 주면(reviews) 리뷰는 결과 줄에 넣지 않고 상품별 JSONL 파일에 받는 대로 한 줄씩 씁니다.
+from datetime import datetime  # 현재 날짜/시간 가져오기
+import argparse  # 명령행 옵션
+import asyncio  # 비동기 처리
+import os  # 파일 시스템 관련 기능
+import sys
+import time  # 시간 관련 기능
+from pathlib import Path
+
+import aiohttp
+from playwright.async_api import async_playwright
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))  # 공통 모듈(common) 경로
+from common.blocking import BlockingPolicy, PageTraffic
+from common.concurrency import AsyncAdaptiveLimiter, format_limiter_summary
+from common.contexts import CONTEXT_MAX_PAGES, ContextPool
+from common.image_store import ImageStore
+from common.metrics import STAGE_BROWSER_LAUNCH, STAGE_FILE_WRITE, RunMetrics, count, timed
+from common.readiness import ReadinessTracker
+from common.retry import RetryPolicy, RetryQueue, classify_error
+from common.uploader import UPLOAD_BATCH_ITEMS, BatchUploader
+from common.watermarks import WATERMARK_PATH, WatermarkStore
+from common.writers import DEFAULT_FLUSH_INTERVAL, JsonlStreamWriter
+from zigzag_combined import crawl_product_combined
+from zigzag_img import create_postprocessor, crawl_product_images, env_config, image_upload_record
+from zigzag_links import SHORT_LINK_CACHE_PATH, ShortLinkResolver, is_short_link, product_id_from_url
+from zigzag_text import CAPTURE_MODE, OUTPUT_PARTITION, crawl_product_reviews
+
+DEFAULT_CONCURRENCY = 8  # 동시에 처리할 상품(컨텍스트) 수
+DEFAULT_MAX_ATTEMPTS = 2  # 상품 하나당 최대 시도 횟수 (일시적 오류만 재시도)
+PROGRESS_EVERY = 50  # 진행률 출력 간격 (상품 수)
+KINDS = ('images', 'reviews', 'combined')  # combined: 후기 페이지 한 번으로 리뷰 + 이미지 + 상품명
+
+
+def read_product_urls(path):
+    """상품 URL 파일 읽기 (빈 줄/주석 제외, 중복 제거)"""
+    with open(path, encoding='utf-8') as f:
+        urls = [line.strip() for line in f]
+    return list(dict.fromkeys(url for url in urls if url and not url.startswith('#')))
+
+
+async def group_by_product(product_urls, resolver, session):
+    """단축 링크를 한꺼번에 변환해서 상품 주소로 합침 ((상품 주소 목록, 상품 주소 → 원래 링크들) 반환)
+
+    변환하지 못한 단축 링크는 그대로 두고, 크롤링할 때 브라우저로 엽니다
+    """
+    short_links = [url for url in product_urls if is_short_link(url)]
+    resolved = await resolver.resolve_many(short_links, session) if short_links else {}
+    sources = {}
+    for url in product_urls:
+        product_id = resolved.get(url) if is_short_link(url) else product_id_from_url(url)
+        target = f"https://zigzag.kr/catalog/products/{product_id}" if product_id else url
+        sources.setdefault(target, []).append(url)
+    return list(sources), sources
+
+
+async def crawl_one(contexts, product_url, kind, session, store, limiter, tracker, metrics, uploader=None,
+                    resolver=None, postprocessor=None, watermarks=None, review_output_dir=None):
+    """상품 하나를 컨텍스트 풀의 페이지로 처리 (결과 dict 와 이미지 최종 실패 목록 반환)"""
+    slot = None
+    crashed = False
+    image_retry = RetryQueue(RetryPolicy(max_attempts=env_config.DOWNLOAD_MAX_ATTEMPTS))
+    try:
+        slot = await contexts.checkout()  # 컨텍스트를 못 만들어도 이 상품만 실패로 (나중에 다시 시도)
+        page = slot['page']
+        if kind in ('images', 'combined'):
+            crawl = crawl_product_images if kind == 'images' else crawl_product_combined
+            result = await crawl(page, product_url, session=session, store=store, limiter=limiter,
+                                 retry_queue=image_retry, tracker=tracker, metrics=metrics, resolver=resolver,
+                                 postprocessor=postprocessor, watermarks=watermarks)
+            if uploader is not None and result['images']:
+                # 큐가 차 있으면(서버가 밀리면) 여기서 기다리므로 크롤링 속도도 같이 줄어듦
+                await uploader.put(image_upload_record(result['product_id'], 'zigzag', result['images']))
+        else:
+            crawled = await crawl_product_reviews(page, product_url, tracker, metrics, CAPTURE_MODE, watermarks,
+                                                  review_output_dir, OUTPUT_PARTITION)
+            count(metrics, 'reviews', crawled['reviewCount'])
+            result = {
+                'success': True,
+                'product_id': crawled['product_id'],
+                'reviewCount': crawled['reviewCount'],
+                'reviews': crawled['reviews'],
+                'output': crawled['output'],
+                'scroll': crawled['scroll'],
+                'incremental': crawled['incremental'],
+            }
+        result['product_url'] = product_url
+        return result, image_retry.dead_letters
+    except Exception as e:
+        crashed = True  # 페이지 상태를 알 수 없으니 컨텍스트 교체
+        if watermarks is not None:
+            # 실패하기 전에 기록 예약한 키는 버림 (다시 시도할 때 새 항목 수가 두 번 세어지지 않도록)
+            product_id = product_id_from_url(product_url)
+            if product_id is None and resolver is not None:
+                product_id = resolver.lookup(product_url)  # 브라우저로 변환한 단축 링크
+            if product_id is not None:
+                watermarks.discard(product_id)
+        return {
+            'success': False,
+            'product_url': product_url,
+            'error': str(e),
+            'errorKind': classify_error(e),
+        }, image_retry.dead_letters
+    finally:
+        if slot is not None:
+            await contexts.checkin(slot, crashed=crashed)
+
+
+async def iter_products(browser, product_urls, kind, concurrency, session, store, limiter, tracker, metrics,
+                        retry_queue, max_pages_per_context=CONTEXT_MAX_PAGES, blocking=None, traffic=None,
+                        uploader=None, image_dead_letters=None, resolver=None, postprocessor=None, watermarks=None,
+                        review_output_dir=None):
+    """상품들을 동시에 처리하고, 끝나는 순서대로 결과를 돌려줌 (async generator)
+
+    일시적 오류로 실패한 상품은 다른 상품이 다 끝난 뒤 백오프를 두고 다시 처리하고,
+    끝내 실패한 상품만 실패 결과로 돌려줌
+    """
+    contexts = ContextPool(browser, concurrency, max_pages=max_pages_per_context, metrics=metrics,
+                           blocking=blocking, traffic=traffic)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(product_url):
+        async with semaphore:
+            return await crawl_one(contexts, product_url, kind, session, store, limiter, tracker, metrics,
+                                   uploader, resolver, postprocessor, watermarks, review_output_dir)
+
+    pending = list(product_urls)
+    try:
+        while pending:
+            tasks = [asyncio.create_task(run(url)) for url in pending]
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    result, dead_letters = await finished
+                    if image_dead_letters is not None:
+                        image_dead_letters.extend(dead_letters)
+                    if not result['success'] and retry_queue.schedule(
+                            result['product_url'], result['product_url'], result['errorKind'], result['error']):
+                        print(f"🔁 나중에 다시 시도: {result['product_url']} ({result['error']})")
+                        continue
+                    yield result
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            # 재시도 대기 중인 상품은 백오프가 끝나는 대로 다시
+            pending = []
+            while len(retry_queue) > 0 and not pending:
+                await asyncio.sleep(retry_queue.next_delay() or 0.0)
+                pending = retry_queue.pop_due()
+            count(metrics, 'retries', len(pending))
+    finally:
+        print(f"🧰 브라우저 컨텍스트: {contexts.launched}개 생성, {contexts.recycled}개 교체")
+        await contexts.close()
+
+
+async def crawl_zigzag_batch(product_urls, kind='images', concurrency=DEFAULT_CONCURRENCY, output_dir='data',
+                             flush_interval=DEFAULT_FLUSH_INTERVAL, max_pages_per_context=CONTEXT_MAX_PAGES,
+                             block_resources=True, upload_url=None, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                             metrics_path=None, prometheus_path=None, dead_letter_path=None, headless=True,
+                             link_cache_path=SHORT_LINK_CACHE_PATH, upload_batch_items=UPLOAD_BATCH_ITEMS,
+                             incremental=False, watermark_path=WATERMARK_PATH, review_output_dir=None):
+    """여러 상품을 브라우저 하나, HTTP 세션 하나로 동시에 크롤링해서 JSON Lines 로 저장
+
+    단축 링크는 먼저 HTTP 로 한꺼번에 상품 주소로 바꾸고, 같은 상품은 한 번만 크롤링
+    incremental=True 면 이미 본 후기에서 멈추고 새 후기/이미지만 기록 (워터마크는 결과를 쓴 뒤 반영)
+    review_output_dir 를 주면(reviews) 리뷰를 review_output_dir/dt=날짜/상품ID.jsonl 에 받는 대로 기록
+    """
+    started_at = time.perf_counter()
+    metrics = RunMetrics('zigzag_batch')
+    tracker = ReadinessTracker(metrics)
+    blocking = BlockingPolicy() if block_resources else None
+    traffic = PageTraffic()  # 모든 페이지 전송량 합계
+    retry_queue = RetryQueue(RetryPolicy(max_attempts=max_attempts))
+    image_retry_report = RetryQueue()  # 이미지 최종 실패 목록 모음 (보고서 저장용)
+    # 이미지 다운로드 동시 요청 수는 모든 상품을 합쳐서 자동 조절
+    limiter = AsyncAdaptiveLimiter(
+        initial=env_config.DOWNLOAD_INITIAL_CONCURRENCY,
+        max_limit=env_config.DOWNLOAD_MAX_CONCURRENCY,
+        max_rps=env_config.DOWNLOAD_MAX_RPS,
+    )
+    store = ImageStore() if kind != 'reviews' else None
+    resolver = ShortLinkResolver(link_cache_path)
+    postprocessor = create_postprocessor() if kind != 'reviews' else None  # 모든 상품이 프로세스 풀 하나를 같이 씀
+    watermarks = WatermarkStore(watermark_path) if incremental else None
+
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = os.path.join(output_dir, f'zigzag_{kind}_{timestamp}.jsonl')
+    writer = JsonlStreamWriter(filename, [], flush_interval=flush_interval)  # 열 목록 없음 = 결과 dict 그대로
+
+    succeeded = failed = 0
+    uploader = None
+    try:
+        connector = aiohttp.TCPConnector(limit=env_config.DOWNLOAD_MAX_CONCURRENCY + concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session, async_playwright() as p:
+            if upload_url and kind != 'reviews':
+                # 서버 전송도 같은 연결 풀을 씀
+                uploader = BatchUploader(upload_url, session=session, max_batch_items=upload_batch_items,
+                                         metrics=metrics)
+                await uploader.start()
+            input_count = len(product_urls)
+            product_urls, sources = await group_by_product(product_urls, resolver, session)
+            resolver.print_summary()
+            print(f"🚀 링크 {input_count}개 → 상품 {len(product_urls)}개 크롤링 시작 (동시 {concurrency}개, 브라우저 1개)")
+            with timed(metrics, STAGE_BROWSER_LAUNCH):
+                browser = await p.chromium.launch(headless=headless)
+            try:
+                async for result in iter_products(
+                        browser, product_urls, kind, concurrency, session, store, limiter, tracker, metrics,
+                        retry_queue, max_pages_per_context, blocking, traffic, uploader,
+                        image_retry_report.dead_letters, resolver, postprocessor, watermarks, review_output_dir):
+                    result['source_urls'] = sources.get(result['product_url'], [result['product_url']])
+                    with timed(metrics, STAGE_FILE_WRITE):
+                        writer.write(result)
+                    if watermarks is not None and result['success']:
+                        watermarks.commit(result['product_id'], result['scroll'])  # 결과를 쓴 뒤에 워터마크 반영
+                    if result['success']:
+                        succeeded += 1
+                    else:
+                        failed += 1
+                        count(metrics, 'failures')
+                    done = succeeded + failed
+                    if done % PROGRESS_EVERY == 0 or done == len(product_urls):
+                        print(f"😺 진행률: {done}/{len(product_urls)} ({done/len(product_urls)*100:.1f}%)")
+            finally:
+                count(metrics, 'bytes_transferred', await traffic.settle())
+                count(metrics, 'requests', traffic.requests)
+                if blocking is not None:
+                    count(metrics, 'requests_blocked', blocking.blocked_total)
+                await browser.close()
+                if uploader is not None:
+                    await uploader.close()  # 남은 배치까지 전송
+        writer.close()
+
+        elapsed = time.perf_counter() - started_at
+        print(f"\n🎉 === 지그재그 배치 크롤링 완료! ===")
+        print(f"📁 파일명: {filename}")
+        print(f"📦 성공 {succeeded}개, 실패 {failed}개, {elapsed:.1f}초 ({succeeded / elapsed if elapsed else 0.0:.2f}개/초)")
+        if kind != 'reviews':
+            print(format_limiter_summary(limiter.summary()))
+            store.print_summary()
+            if postprocessor is not None:
+                postprocessor.print_summary()
+            image_retry_report.print_summary('zigzag_batch_images')
+            if uploader is not None:
+                uploader.print_summary('zigzag_batch')
+        if watermarks is not None:
+            watermarks.print_summary()
+        tracker.print_summary()
+        retry_queue.print_summary('zigzag_batch', dead_letter_path)
+
+        summary = {
+            'filename': filename,
+            'kind': kind,
+            'links': input_count,
+            'products': len(product_urls),
+            'succeeded': succeeded,
+            'failed': failed,
+            'elapsed_sec': round(elapsed, 3),
+        }
+        if uploader is not None:
+            summary['upload'] = uploader.summary()
+        if watermarks is not None:
+            summary['incremental'] = watermarks.summary()
+        metrics.report(metrics_path, prometheus_path, extra={'batch': summary, 'waits': tracker.summary()})
+        return summary
+    finally:
+        writer.close()
+        resolver.close()
+        if postprocessor is not None:
+            postprocessor.close()
+        if store is not None:
+            store.close()
+        if watermarks is not None:
+            watermarks.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지그재그 여러 상품 배치 크롤링")
+    parser.add_argument('product_file', help="상품 URL 파일 (한 줄에 하나)")
+    parser.add_argument('--kind', choices=KINDS, default='images', help="수집할 데이터 (후기 이미지 / 리뷰 텍스트 / 둘 다 + 상품명)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="동시에 처리할 상품 수")
+    parser.add_argument('--output-dir', default='data', help="결과 파일 폴더")
+    parser.add_argument('--flush-interval', type=float, default=DEFAULT_FLUSH_INTERVAL, help="디스크 기록(fsync) 간격 (초)")
+    parser.add_argument('--max-pages-per-context', type=int, default=CONTEXT_MAX_PAGES, help="컨텍스트 교체 주기 (페이지 수)")
+    parser.add_argument('--upload-url', help="이미지 정보를 보낼 서버 API 주소 (images, combined 일 때)")
+    parser.add_argument('--upload-batch-size', type=int, default=UPLOAD_BATCH_ITEMS, help="서버로 한 번에 보낼 상품 수")
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS, help="상품 하나당 최대 시도 횟수")
+    parser.add_argument('--link-cache', default=SHORT_LINK_CACHE_PATH, help="단축 링크 → 상품 ID 캐시 파일")
+    parser.add_argument('--incremental', action='store_true', help="이미 본 후기에서 멈추고 새로 나온 것만 기록")
+    parser.add_argument('--watermarks', default=WATERMARK_PATH, help="증분 크롤링 워터마크 파일")
+    parser.add_argument('--review-output-dir', help="리뷰를 상품별 JSONL 로 바로 기록할 폴더 (reviews 일 때)")
+    parser.add_argument('--metrics', help="실행 요약 JSON 경로 (기본: data/metrics/zigzag_batch_<시각>.json)")
+    parser.add_argument('--prometheus', help="Prometheus textfile 경로")
+    parser.add_argument('--no-block', action='store_true', help="이미지/폰트/광고 요청 차단 끄기")
+    args = parser.parse_args()
+
+    product_urls = read_product_urls(args.product_file)
+    if not product_urls:
+        print("❌ 상품 URL 파일이 비어 있습니다.")
+        return
+
+    print("=" * 50)
+    print(f"👗 지그재그 배치 크롤링 (상품 {len(product_urls)}개)")
+    print("=" * 50)
+
+    asyncio.run(crawl_zigzag_batch(
+        product_urls,
+        kind=args.kind,
+        concurrency=args.concurrency,
+        output_dir=args.output_dir,
+        flush_interval=args.flush_interval,
+        max_pages_per_context=args.max_pages_per_context,
+        block_resources=not args.no_block,
+        upload_url=args.upload_url,
+        upload_batch_items=args.upload_batch_size,
+        incremental=args.incremental,
+        watermark_path=args.watermarks,
+        review_output_dir=args.review_output_dir,
+        max_attempts=args.max_attempts,
+        link_cache_path=args.link_cache,
+        metrics_path=args.metrics,
+        prometheus_path=args.prometheus,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+# 상품명 → 카테고리 분류기 (키워드 분류표를 한 번 컴파일해서 여러 제목을 빠르게 분류)
+#
+# 분류표는 [{"category": ..., "keywords": [...]}] 목록이고, 앞에 있는 카테고리가 우선입니다.
+# (예전 guess_category_from_title 의 if/elif 순서와 같음)
+# 모든 키워드를 트라이(공통 앞부분을 합친 나무)로 묶어 정규식 하나로 컴파일하고, 제목을 한 번만 훑어서
+# 찾은 키워드 중 가장 우선인 카테고리를 고릅니다.
+# - 트라이 정규식은 한 위치에서 가장 긴 키워드를 고르므로, 그 위치에서 맞는 다른 키워드는 모두 그 앞부분입니다.
+#   키워드마다 "자기 + 앞부분 키워드" 중 가장 높은 우선순위를 미리 계산해 둡니다.
+# - 카테고리가 다른 키워드끼리 걸칠 수 있으면(한쪽이 다른 쪽 중간에 들어 있거나 끝/앞이 이어짐)
+#   모든 위치를 보도록 전방 탐색 패턴을 쓰고, 아니면 더 빠른 일반 패턴을 씁니다.
+import json
+import re
+
+DEFAULT_CATEGORY = '기타'
+
+# 기본 분류표 (우선순위 순서)
+DEFAULT_TAXONOMY = [
+    {'category': '의류-상의', 'keywords': ['셔츠', '블라우스', 'shirt']},
+    {'category': '의류-하의', 'keywords': ['바지', '팬츠', 'pants']},
+    {'category': '신발', 'keywords': ['신발', 'shoes']},
+    {'category': '가방', 'keywords': ['가방', 'bag']},
+]
+
+
+def has_cross_category_overlap(keyword_priority):
+    """우선순위가 다른 키워드가 다른 키워드의 중간에서 시작할 수 있는지
+
+    (다른 키워드 중간에 들어 있거나, 한 키워드의 끝부분이 다른 키워드의 앞부분인 경우)
+    """
+    prefixes = {}  # 앞부분 → 그 앞부분으로 시작하는 키워드들의 우선순위
+    for keyword, priority in keyword_priority.items():
+        for end in range(1, len(keyword) + 1):
+            prefixes.setdefault(keyword[:end], set()).add(priority)
+    for keyword, priority in keyword_priority.items():
+        for start in range(1, len(keyword)):
+            tail = keyword[start:]
+            # 끝부분으로 시작하는 다른 우선순위 키워드가 있음 (끝/앞이 이어짐)
+            if prefixes.get(tail, set()) - {priority}:
+                return True
+            # 중간에 다른 우선순위 키워드가 들어 있음
+            for end in range(1, len(tail)):
+                if keyword_priority.get(tail[:end], priority) != priority:
+                    return True
+    return False
+
+
+def trie_pattern(keywords):
+    """키워드 목록 → 트라이 정규식 (한 위치에서 가장 긴 키워드를 찾음)"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = None  # 키워드 끝
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # 여기서 끝나는 키워드가 있으면 더 긴 쪽을 먼저 시도하고, 안 되면 여기서 끝냄
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+def load_taxonomy(path):
+    """분류표 JSON 파일 읽기 ([{"category": ..., "keywords": [...]}], 앞쪽이 우선)"""
+    with open(path, encoding='utf-8') as f:
+        taxonomy = json.load(f)
+    for entry in taxonomy:
+        if not entry.get('category') or not isinstance(entry.get('keywords'), list):
+            raise ValueError(f"분류표 형식이 잘못되었습니다: {entry}")
+    return taxonomy
+
+
+class CategoryClassifier:
+    """분류표를 정규식 하나로 컴파일한 분류기"""
+
+    def __init__(self, taxonomy=None, default=DEFAULT_CATEGORY):
+        self.taxonomy = taxonomy or DEFAULT_TAXONOMY
+        self.default = default
+        self.categories = [entry['category'] for entry in self.taxonomy]
+        self.keyword_priority = {}  # 키워드 → 가장 높은 우선순위 (작을수록 우선)
+        for priority, entry in enumerate(self.taxonomy):
+            for keyword in entry['keywords']:
+                keyword = keyword.lower()
+                if keyword and keyword not in self.keyword_priority:
+                    self.keyword_priority[keyword] = priority
+        # 찾은 키워드 → 그 키워드와 앞부분 키워드들 중 가장 높은 우선순위
+        self.match_priority = {
+            keyword: min(self.keyword_priority.get(keyword[:end], priority) for end in range(1, len(keyword) + 1))
+            for keyword, priority in self.keyword_priority.items()
+        }
+        self.overlapping = has_cross_category_overlap(self.keyword_priority)
+        if not self.keyword_priority:
+            self.pattern = None
+        elif self.overlapping:
+            # 전방 탐색으로 감싸서 걸쳐 있는 키워드도 모든 위치에서 확인
+            self.pattern = re.compile('(?=(' + trie_pattern(self.keyword_priority) + '))')
+        else:
+            self.pattern = re.compile(trie_pattern(self.keyword_priority))
+
+    def classify(self, title):
+        """상품명 하나 분류"""
+        if self.pattern is None or not title:
+            return self.default
+        best = None
+        for keyword in self.pattern.findall(title.lower()):
+            priority = self.match_priority[keyword]
+            if best is None or priority < best:
+                best = priority
+                if best == 0:
+                    break  # 가장 우선인 카테고리
+        return self.default if best is None else self.categories[best]
+
+    def classify_many(self, titles):
+        """여러 상품명 분류 (목록 순서대로)"""
+        classify = self.classify
+        return [classify(title) for title in titles]
+
+
+_default_classifier = None
+
+
+def default_classifier():
+    """기본 분류표 분류기 (처음 쓸 때 한 번 컴파일)"""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = CategoryClassifier()
+    return _default_classifier
@@ -0,0 +1,231 @@
+# 후기 페이지 한 번 방문으로 리뷰 텍스트 + 후기 이미지 + 상품명/카테고리를 같이 수집
+#
+# 지금까지는 zigzag_text 와 zigzag_img 가 같은 후기 페이지를 따로 열고 스크롤했고,
+# 이미지 크롤러는 상품명 때문에 상품 페이지를 한 번 더 열었습니다.
+# 여기서는 후기 페이지를 한 번만 열어서 텍스트와 이미지를 같이 읽고,
+# 상품명은 같은 컨텍스트의 두 번째 탭에서 동시에 읽습니다 (기다리는 시간이 겹침).
+import asyncio
+import json
+import sys
+from pathlib import Path
+from playwright.async_api import async_playwright
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))  # 공통 모듈(common) 경로
+from common.blocking import BlockingPolicy, PageTraffic, install_route_blocking
+from common.metrics import STAGE_BROWSER_LAUNCH, STAGE_EXTRACTION, STAGE_FILE_WRITE, STAGE_NAVIGATION, RunMetrics, count, timed
+from common.readiness import ReadinessTracker, wait_for_selector
+from common.replay import install_replay_routing
+from common.retry import RetryPolicy, RetryQueue
+from common.watermarks import WatermarkStore
+from zigzag_api import capture_reviews_from_api, review_key  # 후기 API 응답 수집
+from zigzag_links import ShortLinkResolver  # 단축 링크 변환
+from zigzag_img import (
+    REVIEW_IMAGE_SELECTOR, create_postprocessor, env_config, download_images, extract_title_from_zigzag,
+    guess_category_from_title, image_urls_from_reviews, postprocess_images, resolve_redirect_and_extract_product_info,
+    scroll_to_load_all_reviews,
+)
+from zigzag_text import PARSE_REVIEW_FUNCTION, REVIEW_CONTAINER_SELECTOR, seen_reviews_in_page
+
+WATERMARK_SCOPE = 'zigzag_combined'
+
+async def extract_reviews_and_images(page):
+    """화면(DOM)에서 리뷰(별점/옵션/작성일/본문으로 나눔)와 후기 이미지 URL 을 한 번에 추출"""
+    return await page.evaluate('''(selectors) => {''' + PARSE_REVIEW_FUNCTION + '''
+        const reviews = [];
+        document.querySelectorAll(selectors.review).forEach((container, index) => {
+            const review = parseReview(container, index + 1);
+            if (review) reviews.push(review);
+        });
+
+        const urls = new Set();
+        document.querySelectorAll(selectors.image).forEach((img) => {
+            const src = img.getAttribute("src") || "";
+            if (src.includes("zigzag.kr/original/review/")) {
+                urls.add(src.split("?")[0]);
+            }
+        });
+
+        return {reviews: reviews, images: Array.from(urls)};
+    }''', {'review': REVIEW_CONTAINER_SELECTOR, 'image': REVIEW_IMAGE_SELECTOR})
+
+async def fetch_title_in_new_tab(context, product_page_url, tracker=None, metrics=None):
+    """같은 컨텍스트의 새 탭에서 상품명 읽기 (후기 페이지와 동시에)"""
+    tab = await context.new_page()
+    try:
+        return await extract_title_from_zigzag(tab, product_page_url, tracker, metrics)
+    finally:
+        await tab.close()
+
+async def crawl_product_combined(page, product_url, session=None, store=None, limiter=None, retry_queue=None,
+                                 tracker=None, metrics=None, capture_mode=None, download=True, resolver=None,
+                                 postprocessor=None, watermarks=None):
+    """이미 열린 페이지로 상품 하나의 리뷰/이미지/상품명을 한 번에 수집
+
+    download=True 면 후기 이미지도 내려받음 (session/store/limiter 는 호출한 쪽 것을 씀)
+    watermarks(WatermarkStore) 를 주면 이미 본 리뷰에서 멈추고 새 리뷰/이미지만 돌려줌
+    (워터마크는 결과를 저장한 뒤 watermarks.commit() 해야 반영됨)
+    """
+    if capture_mode is None:
+        capture_mode = env_config.CAPTURE_MODE
+    if retry_queue is None:
+        retry_queue = RetryQueue(RetryPolicy(max_attempts=env_config.DOWNLOAD_MAX_ATTEMPTS))
+
+    product_info = await resolve_redirect_and_extract_product_info(page, product_url, tracker, metrics, resolver)
+    product_id = product_info['product_id']
+    review_url = product_info['review_url']
+    watermark = watermarks.load(WATERMARK_SCOPE, product_id) if watermarks is not None else None
+    incremental = None
+
+    # 상품명은 두 번째 탭에서 동시에
+    title_task = asyncio.ensure_future(
+        fetch_title_in_new_tab(page.context, product_info['product_page_url'], tracker, metrics))
+    try:
+        reviews = []
+        scroll_stats = None  # 멈춘 이유가 든 요약 (API 면 capture_reviews_from_api, 화면이면 scroll_until_idle)
+        if capture_mode == 'api':
+            stop_at = (lambda review: watermark.should_stop(review_key(review))) if watermark is not None else None
+            reviews, scroll_stats = await capture_reviews_from_api(page, review_url, tracker, metrics,
+                                                                   stop_at=stop_at)
+            count(metrics, 'pages')
+            if not reviews:
+                print("🤔 후기 API 응답을 찾지 못했습니다. 화면에서 다시 읽을게요...")
+        if reviews:
+            if watermark is not None:
+                dates = [review['date'] for review in reviews if review.get('date')]
+                reviews, incremental = watermarks.track(watermark, reviews, review_key,
+                                                        newest_date=max(dates) if dates else None)
+            image_urls = image_urls_from_reviews(reviews)
+        else:
+            with timed(metrics, STAGE_NAVIGATION):
+                await page.goto(review_url, wait_until='domcontentloaded')
+            count(metrics, 'pages')
+            await wait_for_selector(page, 'review_list', REVIEW_CONTAINER_SELECTOR, tracker=tracker)
+            until = seen_reviews_in_page(REVIEW_CONTAINER_SELECTOR, watermark) if watermark is not None else None
+            scroll_stats = await scroll_to_load_all_reviews(page, tracker, metrics, until)
+            with timed(metrics, STAGE_EXTRACTION):
+                extracted = await extract_reviews_and_images(page)
+            reviews = extracted['reviews']
+            image_urls = extracted['images']
+            if watermark is not None:
+                # 화면에서는 후기와 이미지를 짝지을 수 없으므로 리뷰는 내용 해시, 이미지는 URL 로 따로 구분
+                dates = [review['date'] for review in reviews if review.get('date')]
+                reviews, incremental = watermarks.track(watermark, reviews,
+                                                        lambda review: review_key(review, by_id=False),
+                                                        newest_date=max(dates) if dates else None)
+                image_urls, _images = watermarks.track(watermark, image_urls, lambda url: url)
+        title = await title_task
+    finally:
+        if not title_task.done():
+            title_task.cancel()
+            await asyncio.gather(title_task, return_exceptions=True)
+    count(metrics, 'reviews', len(reviews))
+    if incremental is not None:
+        count(metrics, 'reviews_seen', incremental['seen'])
+
+    limited = image_urls[:env_config.IMAGE_LIMIT]
+    manifest = {}
+    if download and limited:
+        manifest = await download_images(product_id, limited, limiter=limiter, metrics=metrics,
+                                         retry_queue=retry_queue, store=store, session=session)
+    processed = await postprocess_images(postprocessor, manifest, metrics)
+
+    print(f"🧵 리뷰 {len(reviews)}개, 후기 이미지 {len(limited)}장, 상품명: {title} ({product_id})")
+    return {
+        'success': True,
+        'product_id': product_id,
+        'title': title,
+        'category': guess_category_from_title(title),
+        'reviewCount': len(reviews),
+        'reviews': reviews,
+        'imageCount': len(limited),
+        'images': limited,
+        'downloaded': len(manifest),
+        'imageHashes': {url: entry['hash'] for url, entry in manifest.items()},
+        'failedImages': [entry['key'] for entry in retry_queue.dead_letters],
+        'perceptualHashes': {url: entry['phash'] for url, entry in processed.items()},
+        'thumbnails': {url: entry['thumbnail'] for url, entry in processed.items()},
+        'scroll': scroll_stats,
+        'incremental': incremental,
+    }
+
+async def crawl_zigzag_combined(product_url, output_path="data/review-combined.json", metrics_path=None,
+                                prometheus_path=None, block_resources=None, capture_mode=None, download=True,
+                                incremental=None):
+    """리뷰 텍스트 + 후기 이미지 + 상품명을 후기 페이지 한 번 방문으로 크롤링 (상품 하나)"""
+    if block_resources is None:
+        block_resources = env_config.BLOCK_RESOURCES
+    if incremental is None:
+        incremental = env_config.INCREMENTAL
+    metrics = RunMetrics('zigzag_combined')  # 단계별 시간/카운터
+    blocking = BlockingPolicy() if block_resources else None
+    traffic = PageTraffic()  # 페이지 전송량 (차단 켬/끔 비교용)
+    async with async_playwright() as p:
+        with timed(metrics, STAGE_BROWSER_LAUNCH):
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(locale='ko-KR')
+            await install_replay_routing(context)  # 재생 모드일 때만 (차단 규칙보다 먼저)
+            if blocking is not None:
+                await install_route_blocking(context, blocking)  # 상품명 탭에도 적용
+            context.on('page', traffic.attach)
+            page = await context.new_page()
+        tracker = ReadinessTracker(metrics)  # 단계별 실제 대기 시간
+        resolver = ShortLinkResolver()  # 단축 링크 → 상품 ID 캐시
+        postprocessor = create_postprocessor() if download else None
+        watermarks = WatermarkStore() if incremental else None
+
+        try:
+            retry_queue = RetryQueue(RetryPolicy(max_attempts=env_config.DOWNLOAD_MAX_ATTEMPTS))
+            result = await crawl_product_combined(page, product_url, retry_queue=retry_queue, tracker=tracker,
+                                                  metrics=metrics, capture_mode=capture_mode, download=download,
+                                                  resolver=resolver, postprocessor=postprocessor,
+                                                  watermarks=watermarks)
+
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            with timed(metrics, STAGE_FILE_WRITE):
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(result, f, ensure_ascii=False, indent=env_config.JSON_INDENT)
+            print(f"💾 결과 저장 완료: {output_path}")
+            if watermarks is not None:
+                watermarks.commit(result['product_id'], result['scroll'])  # 저장한 뒤에 워터마크 반영
+
+            if download:
+                retry_queue.print_summary('zigzag_combined')
+            if postprocessor is not None:
+                postprocessor.print_summary()
+            tracker.print_summary()
+            result['waits'] = tracker.summary()
+            result['metrics'] = metrics.summary()
+            return result
+
+        except Exception as err:
+            count(metrics, 'failures')
+            print(f"🥲 지그재그 크롤링 실패: {err}")
+            raise err
+        finally:
+            count(metrics, 'bytes_transferred', await traffic.settle())
+            count(metrics, 'requests', traffic.requests)
+            if blocking is not None:
+                count(metrics, 'requests_blocked', blocking.blocked_total)
+            resolver.close()
+            if postprocessor is not None:
+                postprocessor.close()
+            if watermarks is not None:
+                watermarks.close()
+            await browser.close()
+            metrics.report(metrics_path, prometheus_path, extra={
+                'product_url': product_url,
+                'block_resources': block_resources,
+                'waits': tracker.summary(),
+            })
+
+async def main():
+    """메인 실행 함수"""
+    try:
+        product_url = "https://zigzag.kr/catalog/products/150012796"
+        result = await crawl_zigzag_combined(product_url)
+        print(f"크롤링 결과: 리뷰 {result['reviewCount']}개, 이미지 {result['imageCount']}장, 카테고리 {result['category']}")
+    except Exception as e:
+        print(f"에러 발생: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,56 +1,108 @@
 import os
+import sys
 import json
 import asyncio
-import re
-from urllib.parse import unquote
 from pathlib import Path
 from playwright.async_api import async_playwright
 import aiohttp
 import aiofiles
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))  # 공통 모듈(common) 경로
+from common.blocking import BlockingPolicy, PageTraffic, install_route_blocking
+from common.concurrency import AsyncAdaptiveLimiter, format_limiter_summary
+from common.metrics import (
+    STAGE_BROWSER_LAUNCH, STAGE_EXTRACTION, STAGE_FILE_WRITE, STAGE_IMAGE_DOWNLOAD, STAGE_IMAGE_POSTPROCESS,
+    STAGE_NAVIGATION, RunMetrics, count, timed,
+)
+from common.image_index import ImagePostProcessor, postprocess_available
+from common.image_store import ImageStore, stream_to_store, write_manifest
+from common.retry import RetryPolicy, RetryQueue, classify_error
+from common.readiness import ReadinessTracker, wait_for_page, wait_for_selector
+from common.replay import install_replay_routing
+from common.scroll import format_scroll_stats, scroll_until_idle
+from common.watermarks import WatermarkStore
+from common.writers import JsonlStreamWriter, partition_path
+from zigzag_api import capture_reviews_from_api, review_key  # 후기 API 응답 수집
+from zigzag_category import CategoryClassifier, default_classifier, load_taxonomy  # 카테고리 분류
+from zigzag_links import ShortLinkResolver, is_short_link, product_id_from_url  # 단축 링크 변환
+
 # 환경 설정 (envConfig 대신)
 class EnvConfig:
-    SCROLL_ITERATIONS = 10
-    SCROLL_DELAY_MS = 1000
+    SCROLL_QUIET_MS = 1000  # 스크롤 후 이 시간 안에 새 후기가 없으면 끝으로 판단
+    SCROLL_MAX_ITEMS = None  # 후기 몇 개까지 불러올지 (None 이면 끝까지)
+    SCROLL_TIME_BUDGET_SEC = 120  # 상품 하나에 쓸 최대 스크롤 시간
     JSON_INDENT = 2
     IMAGE_LIMIT = 50
+    DOWNLOAD_INITIAL_CONCURRENCY = 4  # 이미지 동시 다운로드 시작 개수
+    DOWNLOAD_MAX_CONCURRENCY = 16  # 자동 조절 시 최대 동시 다운로드 수
+    DOWNLOAD_MAX_RPS = 20  # 이미지 서버별 초당 최대 요청 수
+    DOWNLOAD_MAX_ATTEMPTS = 3  # 이미지 하나당 최대 시도 횟수 (일시적 오류만 재시도)
+    CAPTURE_MODE = 'api'  # 'api': 후기 API 응답에서 읽기 (없으면 화면으로), 'dom': 화면에서 읽기
+    BLOCK_RESOURCES = True  # 페이지의 이미지/폰트/광고 요청 차단 (img[src] 속성만 읽으면 되므로)
+    POSTPROCESS_IMAGES = True  # 받은 이미지로 썸네일 + 지각 해시 만들기 (numpy, Pillow 필요)
+    CATEGORY_TAXONOMY_PATH = None  # 카테고리 분류표 JSON (None 이면 기본 분류표)
+    INCREMENTAL = False  # 이미 본 후기에서 멈추고 새 후기 이미지만 수집 (워터마크: data/watermarks.sqlite3)
+    OUTPUT_MODE = 'json'  # 'json': URL 목록 JSON 하나, 'jsonl': 이미지마다 한 줄 (IMAGE_OUTPUT_DIR/dt=날짜/상품ID.jsonl)
+    IMAGE_OUTPUT_DIR = 'data/review-images'
+    OUTPUT_PARTITION = 'date'  # None 이면 IMAGE_OUTPUT_DIR/상품ID.jsonl
 
 env_config = EnvConfig()
 
 REVIEW_IMAGE_SELECTOR = "div.css-s01evr.efs1gt61 img"
 REVIEW_TEXT_SELECTOR = "div.css-s01evr.efs1gt61"
+PRODUCT_TITLE_SELECTOR = "h1.BODY_15.REGULAR"
+WATERMARK_SCOPE = 'zigzag_images'
+IMAGE_COLUMNS = ['product_id', 'position', 'url']  # jsonl 출력 열
 
-async def extract_title_from_zigzag(page, product_page_url):
+async def extract_title_from_zigzag(page, product_page_url, tracker=None, metrics=None):
     """지그재그 상품 페이지에서 제목을 추출"""
-    await page.goto(product_page_url, wait_until='networkidle')
+    with timed(metrics, STAGE_NAVIGATION):
+        await page.goto(product_page_url, wait_until='domcontentloaded')
+    count(metrics, 'pages')
+    await wait_for_selector(page, 'product_title', PRODUCT_TITLE_SELECTOR, tracker=tracker)
     
-    title = await page.evaluate('''() => {
-        const titleEl = document.querySelector("h1.BODY_15.REGULAR");
-        return titleEl ? titleEl.innerText.trim() : null;
-    }''')
+    with timed(metrics, STAGE_EXTRACTION):
+        title = await page.evaluate('''(selector) => {
+            const titleEl = document.querySelector(selector);
+            return titleEl ? titleEl.innerText.trim() : null;
+        }''', PRODUCT_TITLE_SELECTOR)
     
     return title or "상품명 없음"
 
-async def resolve_redirect_and_extract_product_info(page, input_url):
-    """리디렉션을 처리하고 상품 정보를 추출"""
+async def resolve_redirect_and_extract_product_info(page, input_url, tracker=None, metrics=None, resolver=None):
+    """리디렉션을 처리하고 상품 정보를 추출
+    
+    resolver(ShortLinkResolver) 가 있으면 단축 링크는 캐시/HTTP 리디렉션으로 먼저 변환하고,
+    못 찾은 경우에만 브라우저로 열어서 자바스크립트 리디렉션을 기다림
+    """
     final_url = input_url
+    product_id = None
+    
+    if is_short_link(input_url) and resolver is not None:
+        product_id = await resolver.resolve(input_url)
+        if product_id is not None:
+            count(metrics, 'redirects_http')
     
-    if "s.zigzag.kr" in input_url or "zigzag.kr/p/" in input_url:
-        await page.goto(input_url, wait_until='networkidle')
+    if product_id is None and is_short_link(input_url):
+        with timed(metrics, STAGE_NAVIGATION):
+            await page.goto(input_url, wait_until='domcontentloaded')
+        count(metrics, 'pages')
+        # 자바스크립트 리디렉션까지 끝나서 상품 URL이 보이면 바로 진행
+        await wait_for_page(page, 'redirect', '''() => (
+            location.href.indexOf('deeplink_url=') !== -1 || location.href.indexOf('products/') !== -1
+        )''', tracker=tracker)
         final_url = page.url
         print(f"리디렉션 완료: {final_url}")
-        
-        # deeplink_url 파라미터에서 실제 URL 추출
-        deeplink_match = re.search(r'deeplink_url=([^&]+)', final_url)
-        if deeplink_match:
-            final_url = unquote(deeplink_match.group(1))
+        product_id = product_id_from_url(final_url)  # deeplink_url 파라미터도 확인
+        if product_id is not None and resolver is not None:
+            resolver.remember(input_url, product_id)
+    elif product_id is None:
+        product_id = product_id_from_url(final_url)
     
     # 상품 ID 추출
-    match = re.search(r'products/(\d+)', final_url)
-    if not match:
+    if not product_id:
         raise Exception("상품 ID를 추출할 수 없습니다.")
     
-    product_id = match.group(1)
     review_url = f"https://zigzag.kr/review/list/{product_id}"
     product_page_url = f"https://zigzag.kr/catalog/products/{product_id}"
     
@@ -60,11 +112,34 @@ async def resolve_redirect_and_extract_product_info(page, input_url):
         'product_page_url': product_page_url
     }
 
-async def scroll_to_load_all_reviews(page):
-    """모든 후기를 로드하기 위해 스크롤"""
-    for i in range(env_config.SCROLL_ITERATIONS):
-        await page.evaluate('() => window.scrollBy(0, window.innerHeight)')
-        await asyncio.sleep(env_config.SCROLL_DELAY_MS / 1000)  # ms를 초로 변환
+async def scroll_to_load_all_reviews(page, tracker=None, metrics=None, until=None):
+    """모든 후기를 로드하기 위해 스크롤 (SCROLL_QUIET_MS 동안 새 후기가 없으면 멈춤)
+    
+    until 이 참이 되면(증분 크롤링: 이미 본 후기에 도달) 바로 멈춤
+    스크롤 횟수/대기 시간/불러온 후기 수/멈춘 이유 반환
+    """
+    stats = await scroll_until_idle(
+        page, REVIEW_TEXT_SELECTOR,
+        quiet_window=env_config.SCROLL_QUIET_MS / 1000,
+        max_items=env_config.SCROLL_MAX_ITEMS,
+        time_budget=env_config.SCROLL_TIME_BUDGET_SEC,
+        tracker=tracker,
+        until=until,
+    )
+    count(metrics, 'scrolls', stats['scrolls'])
+    print(format_scroll_stats(stats))
+    return stats
+
+def image_urls_from_reviews(reviews):
+    """API 후기 목록의 이미지 URL (순서 유지, 중복 제거)"""
+    return list(dict.fromkeys(url for review in reviews for url in review['images']))
+
+def seen_images_in_page(watermark):
+    """화면에 이미 본 후기 이미지가 나왔는지 확인하는 scroll_until_idle 의 until 함수"""
+    async def until(page, state):
+        urls = await extract_review_image_urls(page)
+        return any(watermark.should_stop(url) for url in urls)
+    return until
 
 async def extract_review_image_urls(page):
     """후기 이미지 URL들을 추출"""
@@ -83,105 +158,302 @@ async def extract_review_image_urls(page):
         return Array.from(urls);
     }}''', REVIEW_IMAGE_SELECTOR)
 
-async def save_image_urls_to_json(file_path, urls):
+async def save_image_urls_to_json(file_path, urls, metrics=None):
     """이미지 URL들을 JSON 파일로 저장"""
     # 디렉터리 생성
     Path(file_path).parent.mkdir(parents=True, exist_ok=True)
     
     # JSON 파일로 저장
-    async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-        await f.write(json.dumps(urls, indent=env_config.JSON_INDENT, ensure_ascii=False))
+    with timed(metrics, STAGE_FILE_WRITE):
+        async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
+            await f.write(json.dumps(urls, indent=env_config.JSON_INDENT, ensure_ascii=False))
     
     print(f"후기 이미지 URL {len(urls)}개 JSON 저장 완료")
 
-async def download_images(product_id, image_urls):
-    """이미지들을 다운로드 (실제 구현은 별도 함수로)"""
-    # 이 함수는 원본의 downloadImages 함수를 구현해야 합니다
+def save_image_urls_to_jsonl(file_path, product_id, urls, metrics=None, append=False):
+    """이미지 URL들을 JSON Lines 로 저장 (한 줄에 {product_id, position, url}, append=True 면 이어 씀)"""
+    with timed(metrics, STAGE_FILE_WRITE):
+        with JsonlStreamWriter(file_path, IMAGE_COLUMNS, append=append) as writer:
+            for position, url in enumerate(urls, 1):
+                writer.write({'product_id': product_id, 'position': position, 'url': url})
+    
+    print(f"후기 이미지 URL {len(urls)}개 JSONL 저장 완료: {file_path}")
+
+async def download_images(product_id, image_urls, limiter=None, metrics=None, retry_queue=None, store=None,
+                          session=None):
+    """이미지들을 동시에 다운로드해서 내용 해시 저장소에 저장 (동시 요청 수는 응답을 보며 자동 조절)
+    
+    - 이미 받은 URL이나 같은 내용의 사진은 다시 저장하지 않음 (store 는 여러 상품이 같이 씀)
+    - downloads/{product_id}/manifest.json 에 URL → 해시/경로 기록
+    - 일시적인 오류로 실패한 이미지는 다른 이미지가 다 끝난 뒤 백오프를 두고 다시 받고,
+      끝내 실패한 이미지는 retry_queue 의 최종 실패 목록에 남음
+    - session 을 주면 그 연결 풀을 같이 씀 (여러 상품을 받을 때), 없으면 새로 열고 닫음
+    URL → {hash, path, bytes} 반환
+    """
     print(f"이미지 다운로드 시작: {len(image_urls)}개 (상품 ID: {product_id})")
     
-    # 실제 다운로드 로직을 여기에 구현
-    download_dir = Path(f"downloads/{product_id}")
-    download_dir.mkdir(parents=True, exist_ok=True)
-    
-    async with aiohttp.ClientSession() as session:
-        for i, url in enumerate(image_urls):
-            try:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        filename = f"review_image_{i+1}.jpg"
-                        file_path = download_dir / filename
-                        
-                        async with aiofiles.open(file_path, 'wb') as f:
-                            await f.write(await response.read())
-                        
-                        print(f"다운로드 완료: {filename}")
-            except Exception as e:
+    product_dir = Path(f"downloads/{product_id}")
+    own_limiter = limiter is None
+    if own_limiter:
+        limiter = AsyncAdaptiveLimiter(
+            initial=env_config.DOWNLOAD_INITIAL_CONCURRENCY,
+            max_limit=env_config.DOWNLOAD_MAX_CONCURRENCY,
+            max_rps=env_config.DOWNLOAD_MAX_RPS,
+        )
+    if retry_queue is None:
+        retry_queue = RetryQueue(RetryPolicy(max_attempts=env_config.DOWNLOAD_MAX_ATTEMPTS))
+    own_store = store is None
+    if own_store:
+        store = ImageStore()
+    manifest = {}
+    
+    async def fetch(session, url):
+        with timed(metrics, STAGE_IMAGE_DOWNLOAD):
+            return await stream_to_store(session, url, store)
+    
+    async def download_one(session, url):
+        known = store.lookup_url(url)
+        if known is not None:
+            manifest[url] = known
+            count(metrics, 'images_deduped')
+            return
+        try:
+            entry = await limiter.call(url, fetch, session, url)
+            manifest[url] = entry
+            count(metrics, 'images')
+            count(metrics, 'bytes', entry['bytes'])
+            print(f"다운로드 완료: {entry['hash'][:12]} ({entry['bytes'] / 1024:.0f} KB)")
+        except Exception as e:
+            if retry_queue.schedule(url, url, classify_error(e), str(e)):
+                print(f"이미지 다운로드 실패, 나중에 다시 시도 ({url}): {e}")
+            else:
+                count(metrics, 'failures')
                 print(f"이미지 다운로드 실패 ({url}): {e}")
+    
+    async def download_all(session):
+        await asyncio.gather(*(download_one(session, url) for url in dict.fromkeys(image_urls)))
+        # 실패한 이미지는 백오프가 끝나는 대로 다시 받기
+        while len(retry_queue) > 0:
+            await asyncio.sleep(retry_queue.next_delay() or 0.0)
+            due = retry_queue.pop_due()
+            count(metrics, 'retries', len(due))
+            await asyncio.gather(*(download_one(session, url) for url in due))
+    
+    try:
+        if session is None:
+            connector = aiohttp.TCPConnector(limit=limiter.max_limit)
+            async with aiohttp.ClientSession(connector=connector) as own_session:
+                await download_all(own_session)
+        else:
+            await download_all(session)
+        with timed(metrics, STAGE_FILE_WRITE):
+            write_manifest(product_dir, manifest)
+        if own_limiter:
+            print(format_limiter_summary(limiter.summary()))
+        if own_store:
+            store.print_summary()
+    finally:
+        if own_store:
+            store.close()
+    return manifest
+
+def create_postprocessor():
+    """이미지 후처리기 (설정이 꺼져 있거나 numpy/Pillow 가 없으면 None)"""
+    if not env_config.POSTPROCESS_IMAGES:
+        return None
+    if not postprocess_available():
+        print("⚠️ numpy/Pillow 가 없어서 이미지 후처리(썸네일, 지각 해시)를 건너뜁니다")
+        return None
+    return ImagePostProcessor()
+
+async def postprocess_images(postprocessor, manifest, metrics=None):
+    """다운로드 결과를 후처리 (썸네일 + 지각 해시) - URL → {phash, thumbnail}"""
+    if postprocessor is None or not manifest:
+        return {}
+    with timed(metrics, STAGE_IMAGE_POSTPROCESS):
+        processed = await postprocessor.process(manifest)
+    count(metrics, 'images_postprocessed', len(processed))
+    return processed
+
+_category_classifier = None  # 처음 쓸 때 분류표를 한 번 컴파일
 
 def guess_category_from_title(title):
-    """제목에서 카테고리를 추측 (실제 구현은 별도 함수로)"""
-    # 원본의 guessCategoryFromTitle 함수를 구현해야 합니다
-    # 간단한 예시 구현
-    title_lower = title.lower()
-    
-    if any(word in title_lower for word in ['셔츠', '블라우스', 'shirt']):
-        return '의류-상의'
-    elif any(word in title_lower for word in ['바지', '팬츠', 'pants']):
-        return '의류-하의'
-    elif any(word in title_lower for word in ['신발', 'shoes']):
-        return '신발'
-    elif any(word in title_lower for word in ['가방', 'bag']):
-        return '가방'
+    """제목에서 카테고리를 추측 (분류표는 CATEGORY_TAXONOMY_PATH, 없으면 기본 분류표)"""
+    global _category_classifier
+    if _category_classifier is None:
+        if env_config.CATEGORY_TAXONOMY_PATH:
+            _category_classifier = CategoryClassifier(load_taxonomy(env_config.CATEGORY_TAXONOMY_PATH))
+        else:
+            _category_classifier = default_classifier()
+    return _category_classifier.classify(title)
+
+async def crawl_product_images(page, product_url, session=None, store=None, limiter=None, retry_queue=None,
+                               tracker=None, metrics=None, output_path=None, capture_mode=None, resolver=None,
+                               postprocessor=None, watermarks=None, output_dir=None):
+    """이미 열린 페이지로 상품 하나의 후기 이미지를 수집해서 다운로드 (브라우저/세션은 호출한 쪽 것을 씀)
+    
+    output_path 가 있으면 이미지 URL 목록을 JSON 으로도 저장
+    output_dir 가 있으면 output_dir(/dt=날짜)/상품ID.jsonl 에 이미지마다 한 줄씩 저장 (증분이면 이어 씀)
+    watermarks(WatermarkStore) 를 주면 이미 본 후기에서 멈추고 새 후기 이미지만 받음
+    (워터마크는 결과를 저장한 뒤 watermarks.commit() 해야 반영됨)
+    """
+    if capture_mode is None:
+        capture_mode = env_config.CAPTURE_MODE
+    if retry_queue is None:
+        retry_queue = RetryQueue(RetryPolicy(max_attempts=env_config.DOWNLOAD_MAX_ATTEMPTS))
+    
+    # 상품 정보 추출
+    product_info = await resolve_redirect_and_extract_product_info(page, product_url, tracker, metrics, resolver)
+    product_id = product_info['product_id']
+    review_url = product_info['review_url']
+    product_page_url = product_info['product_page_url']
+    watermark = watermarks.load(WATERMARK_SCOPE, product_id) if watermarks is not None else None
+    incremental = None
+    
+    # 후기 API 응답에서 이미지 URL 수집 (응답이 없으면 화면에서)
+    reviews = []
+    scroll_stats = None  # 멈춘 이유가 든 요약 (API 면 capture_reviews_from_api, 화면이면 scroll_until_idle)
+    if capture_mode == 'api':
+        stop_at = (lambda review: watermark.should_stop(review_key(review))) if watermark is not None else None
+        reviews, scroll_stats = await capture_reviews_from_api(page, review_url, tracker, metrics, stop_at=stop_at)
+        count(metrics, 'pages')
+        if not reviews:
+            print("🤔 후기 API 응답을 찾지 못했습니다. 화면에서 다시 읽을게요...")
+    if reviews:
+        if watermark is not None:
+            # 새 후기의 이미지만 (후기 ID 로 구분)
+            reviews, incremental = watermarks.track(watermark, reviews, review_key)
+        image_urls = image_urls_from_reviews(reviews)
     else:
-        return '기타'
+        # 후기 페이지로 이동 및 스크롤
+        with timed(metrics, STAGE_NAVIGATION):
+            await page.goto(review_url, wait_until='domcontentloaded')
+        count(metrics, 'pages')
+        await wait_for_selector(page, 'review_list', REVIEW_TEXT_SELECTOR, tracker=tracker)
+        until = seen_images_in_page(watermark) if watermark is not None else None
+        scroll_stats = await scroll_to_load_all_reviews(page, tracker, metrics, until)
+        
+        # 이미지 URL 추출
+        with timed(metrics, STAGE_EXTRACTION):
+            image_urls = await extract_review_image_urls(page)
+        if watermark is not None:
+            # 화면에서는 후기와 이미지를 짝지을 수 없으므로 이미지 URL 로 구분
+            image_urls, incremental = watermarks.track(watermark, image_urls, lambda url: url)
+    limited = image_urls[:env_config.IMAGE_LIMIT]
+    
+    if incremental is not None:
+        count(metrics, 'reviews_seen', incremental['seen'])
+        print(f"🔖 새 후기 이미지 {len(limited)}장 (이미 본 항목 {incremental['seen']}개 제외"
+              f"{', 이미 본 후기에서 멈춤' if incremental['caught_up'] else ''})")
+    elif not limited:
+        raise Exception("🥲 후기 이미지가 존재하지 않습니다")
+    
+    # JSON 저장 및 이미지 다운로드
+    if output_path:
+        await save_image_urls_to_json(output_path, limited, metrics)
+    if output_dir is not None:
+        output_path = partition_path(output_dir, product_id, env_config.OUTPUT_PARTITION)
+        save_image_urls_to_jsonl(output_path, product_id, limited, metrics, append=watermark is not None)
+    manifest = await download_images(product_id, limited, limiter=limiter, metrics=metrics,
+                                     retry_queue=retry_queue, store=store, session=session)
+    processed = await postprocess_images(postprocessor, manifest, metrics)
+    
+    print(f"🖼️ 지그재그 후기 이미지 {len(limited)}장 크롤링 완료 ({product_id})")
+    
+    # 제목 및 카테고리 추출
+    title = await extract_title_from_zigzag(page, product_page_url, tracker, metrics)
+    category = guess_category_from_title(title)
+    
+    return {
+        'success': True,
+        'product_id': product_id,
+        'category': category,
+        'imageCount': len(limited),
+        'images': limited,
+        'downloaded': len(manifest),
+        'imageHashes': {url: entry['hash'] for url, entry in manifest.items()},
+        'failedImages': [entry['key'] for entry in retry_queue.dead_letters],
+        'perceptualHashes': {url: entry['phash'] for url, entry in processed.items()},
+        'thumbnails': {url: entry['thumbnail'] for url, entry in processed.items()},
+        'scroll': scroll_stats,
+        'incremental': incremental,
+        'output': output_path,
+    }
 
-async def crawl_zigzag_review_images(product_url, output_path="data/review-images.json"):
-    """지그재그 후기 이미지를 크롤링하는 메인 함수"""
+async def crawl_zigzag_review_images(product_url, output_path="data/review-images.json",
+                                     metrics_path=None, prometheus_path=None, block_resources=None,
+                                     capture_mode=None, incremental=None, output_mode=None):
+    """지그재그 후기 이미지를 크롤링하는 메인 함수 (상품 하나, 브라우저를 직접 띄움)
+    
+    끝나면 단계별 시간 요약을 metrics_path(기본 data/metrics/)에, prometheus_path 가 있으면 textfile 로도 저장
+    block_resources / capture_mode / incremental / output_mode 가 None 이면 env_config 설정을 따름
+    output_mode='jsonl' 이면 output_path 대신 IMAGE_OUTPUT_DIR 아래 상품별 JSONL 로 저장
+    여러 상품은 zigzag_batch.py 로 (브라우저/세션 하나를 같이 씀)
+    """
+    if block_resources is None:
+        block_resources = env_config.BLOCK_RESOURCES
+    if incremental is None:
+        incremental = env_config.INCREMENTAL
+    if output_mode is None:
+        output_mode = env_config.OUTPUT_MODE
+    if output_mode not in ('json', 'jsonl'):
+        raise ValueError(f"지원하지 않는 출력 방식: {output_mode} ('json', 'jsonl' 중 선택)")
+    output_dir = env_config.IMAGE_OUTPUT_DIR if output_mode == 'jsonl' else None
+    if output_dir is not None:
+        output_path = None
+    metrics = RunMetrics('zigzag_img')  # 단계별 시간/카운터
+    blocking = BlockingPolicy() if block_resources else None
+    traffic = PageTraffic()  # 페이지 전송량 (차단 켬/끔 비교용)
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+        with timed(metrics, STAGE_BROWSER_LAUNCH):
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+            await install_replay_routing(page.context)  # 재생 모드일 때만 (차단 규칙보다 먼저)
+            if blocking is not None:
+                await install_route_blocking(page, blocking)
+            traffic.attach(page)
+        tracker = ReadinessTracker(metrics)  # 단계별 실제 대기 시간
+        resolver = ShortLinkResolver()  # 단축 링크 → 상품 ID 캐시
+        postprocessor = create_postprocessor()
+        watermarks = WatermarkStore() if incremental else None
         
         try:
-            # 상품 정보 추출
-            product_info = await resolve_redirect_and_extract_product_info(page, product_url)
-            product_id = product_info['product_id']
-            review_url = product_info['review_url']
-            product_page_url = product_info['product_page_url']
-            
-            # 후기 페이지로 이동 및 스크롤
-            await page.goto(review_url, wait_until='networkidle')
-            await scroll_to_load_all_reviews(page)
-            
-            # 이미지 URL 추출
-            image_urls = await extract_review_image_urls(page)
-            limited = image_urls[:env_config.IMAGE_LIMIT]
-            
-            if not limited:
-                raise Exception("🥲 후기 이미지가 존재하지 않습니다")
-            
-            # JSON 저장 및 이미지 다운로드
-            await save_image_urls_to_json(output_path, limited)
-            await download_images(product_id, limited)
-            
-            print(f"🖼️ 지그재그 후기 이미지 {len(limited)}장 크롤링 완료 ({product_id})")
-            
-            # 제목 및 카테고리 추출
-            title = await extract_title_from_zigzag(page, product_page_url)
-            category = guess_category_from_title(title)
-            
-            return {
-                'success': True,
-                'product_id': product_id,
-                'category': category,
-                'imageCount': len(limited),
-                'images': limited
-            }
+            retry_queue = RetryQueue(RetryPolicy(max_attempts=env_config.DOWNLOAD_MAX_ATTEMPTS))
+            result = await crawl_product_images(page, product_url, retry_queue=retry_queue, tracker=tracker,
+                                                metrics=metrics, output_path=output_path,
+                                                capture_mode=capture_mode, resolver=resolver,
+                                                postprocessor=postprocessor, watermarks=watermarks,
+                                                output_dir=output_dir)
+            if watermarks is not None:
+                watermarks.commit(result['product_id'], result['scroll'])  # 이미지 목록을 저장한 뒤에 반영
+            retry_queue.print_summary('zigzag_img')
+            if postprocessor is not None:
+                postprocessor.print_summary()
+            tracker.print_summary()
+            result['waits'] = tracker.summary()
+            result['metrics'] = metrics.summary()
+            return result
             
         except Exception as err:
+            count(metrics, 'failures')
             print(f"🥲 지그재그 크롤링 실패: {err}")
             raise err
         finally:
+            count(metrics, 'bytes_transferred', await traffic.settle())
+            count(metrics, 'requests', traffic.requests)
+            if blocking is not None:
+                count(metrics, 'requests_blocked', blocking.blocked_total)
+            resolver.close()
+            if postprocessor is not None:
+                postprocessor.close()
+            if watermarks is not None:
+                watermarks.close()
             await browser.close()
+            metrics.report(metrics_path, prometheus_path, extra={
+                'product_url': product_url,
+                'block_resources': block_resources,
+                'waits': tracker.summary(),
+            })
 
 # 추가 유틸리티 함수들
 
@@ -191,22 +463,34 @@ def is_match_site(url, keywords=None):
         keywords = []
     return any(keyword in url for keyword in keywords)
 
-async def send_images_to_server(product_id, source, image_urls, server_api_url):
-    """서버로 이미지 정보 전송"""
+def image_upload_record(product_id, source, image_urls):
+    """서버로 보내는 상품 하나의 이미지 정보 (send_images_to_server, BatchUploader 공통)"""
+    return {
+        "product_id": product_id,
+        "source": source,
+        "image_urls": image_urls
+    }
+
+async def send_images_to_server(product_id, source, image_urls, server_api_url, session=None):
+    """서버로 이미지 정보 전송 (session 을 주면 그 연결 풀을 같이 씀)
+
+    상품이 많으면 common.uploader.BatchUploader 로 모아서 보내는 편이 훨씬 빠름 (zigzag_batch.py)
+    """
+    async def post(session):
+        async with session.post(server_api_url, json=data) as response:
+            if response.status == 200:
+                print("서버 전송 성공")
+                return await response.json()
+            else:
+                raise Exception(f"HTTP {response.status}")
+    
     try:
-        data = {
-            "product_id": product_id,
-            "source": source,
-            "image_urls": image_urls
-        }
+        data = image_upload_record(product_id, source, image_urls)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(server_api_url, json=data) as response:
-                if response.status == 200:
-                    print("서버 전송 성공")
-                    return await response.json()
-                else:
-                    raise Exception(f"HTTP {response.status}")
+        if session is not None:
+            return await post(session)
+        async with aiohttp.ClientSession() as own_session:
+            return await post(own_session)
                     
     except Exception as error:
         print(f"서버 전송 실패: {error}")
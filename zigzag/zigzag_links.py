@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+# 지그재그 단축 링크(s.zigzag.kr, zigzag.kr/p/) → 상품 ID 변환 (브라우저 없이) + 캐시
+#
+# 단축 링크는 몇 번의 HTTP 리디렉션(Location 헤더) 끝에 deeplink_url=... 이나
+# /catalog/products/<ID> 주소로 갑니다. 페이지를 그리지 않고 헤더만 따라가서 상품 ID를 찾고,
+# 결과는 SQLite 캐시에 저장합니다 (마케팅 피드의 수천 개 링크가 대부분 같은 상품으로 감).
+# 헤더로 못 찾으면(자바스크립트 리디렉션) None 을 돌려주고, 그때만 브라우저로 엽니다.
+import asyncio
+import html  # meta refresh 주소의 &amp;
+import os  # 파일 시스템 관련 기능
+import re
+import sqlite3  # 캐시 저장
+import time  # 시간 관련 기능
+from urllib.parse import unquote, urljoin
+
+import aiohttp
+
+from common.replay import site_url
+
+SHORT_LINK_CACHE_PATH = 'data/short_links.sqlite3'
+CACHE_TTL_SEC = 7 * 24 * 3600  # 캐시 유효 기간 (상품이 바뀌는 일은 드묾)
+CACHE_MAX_ENTRIES = 100000  # 넘으면 오래 안 쓴 것부터 삭제
+MAX_REDIRECTS = 10
+RESOLVE_TIMEOUT_SEC = 10
+RESOLVE_CONCURRENCY = 16  # 한꺼번에 변환할 때 동시 요청 수
+BODY_SCAN_BYTES = 64 * 1024  # 리디렉션이 없을 때 본문에서 찾아볼 크기
+
+PRODUCT_ID_PATTERN = re.compile(r'products/(\d+)')
+DEEPLINK_PATTERN = re.compile(r'deeplink_url=([^&"\'\s]+)')
+# 리디렉션이 없는 200 응답 본문에서 인정하는 이동 주소 (본문의 아무 products/ 링크는 다른 상품일 수 있음)
+META_REFRESH_PATTERN = re.compile(
+    r'<meta[^>]+http-equiv=["\']?refresh["\']?[^>]*content=["\'][^"\']*?url=([^"\'>\s]+)', re.IGNORECASE)
+SCRIPT_REDIRECT_PATTERN = re.compile(
+    r'location(?:\.href)?\s*=\s*["\']([^"\']+)["\']|location\.(?:replace|assign)\(\s*["\']([^"\']+)["\']')
+
+
+def is_short_link(url):
+    """브라우저/HTTP 로 따라가야 상품 주소를 알 수 있는 단축 링크인지"""
+    return "s.zigzag.kr" in url or "zigzag.kr/p/" in url
+
+
+def redirect_target_in_body(body):
+    """본문 속 리디렉션 주소 (deeplink_url= 파라미터, meta refresh, location 이동만 - 없으면 None)"""
+    body = body.replace('\\/', '/')  # 스크립트 안의 https:\/\/ 형태
+    deeplink = DEEPLINK_PATTERN.search(body)
+    if deeplink:
+        return unquote(deeplink.group(1))
+    match = META_REFRESH_PATTERN.search(body) or SCRIPT_REDIRECT_PATTERN.search(body)
+    if match:
+        return html.unescape(next(group for group in match.groups() if group))  # &amp; → &
+    return None
+
+
+def product_id_from_url(url):
+    """주소(또는 deeplink_url 파라미터)에서 상품 ID 추출 (없으면 None)"""
+    deeplink = DEEPLINK_PATTERN.search(url)
+    if deeplink:
+        url = unquote(deeplink.group(1))
+    match = PRODUCT_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+class ShortLinkResolver:
+    """단축 링크 → 상품 ID (HTTP 리디렉션만 따라감, SQLite 캐시 + TTL + 개수 제한)"""
+
+    def __init__(self, cache_path=SHORT_LINK_CACHE_PATH, ttl=CACHE_TTL_SEC, max_entries=CACHE_MAX_ENTRIES):
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.timeout = aiohttp.ClientTimeout(total=RESOLVE_TIMEOUT_SEC)  # 링크 하나당 (세션을 빌려 쓸 때도)
+        self.conn = sqlite3.connect(cache_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')  # 여러 크롤러 프로세스가 같이 사용
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS short_links (
+                url TEXT PRIMARY KEY,
+                product_id TEXT NOT NULL,
+                resolved_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS short_links_last_used ON short_links (last_used)')
+        self.conn.commit()
+        self.cache_hits = 0
+        self.http_resolved = 0
+        self.unresolved = 0
+        self.evicted = 0
+        self._touched = {}  # url → 마지막 사용 시각 (flush 때 한 번에 반영)
+        self._remembered = {}  # url → (상품 ID, 변환 시각) - 아직 저장하지 않은 변환 결과 (flush 때 한 번에 반영)
+        self._entries = self.conn.execute('SELECT COUNT(*) FROM short_links').fetchone()[0]  # 대략적인 개수
+
+    def lookup(self, url):
+        """캐시에 있고 유효 기간이 남았으면 상품 ID, 아니면 None"""
+        now = time.time()
+        if url in self._remembered:
+            self.cache_hits += 1
+            return self._remembered[url][0]
+        row = self.conn.execute('SELECT product_id, resolved_at FROM short_links WHERE url = ?', (url,)).fetchone()
+        if row is None or now - row[1] > self.ttl:
+            return None
+        self._touched[url] = now  # 캐시 적중마다 커밋하지 않고 모아 둠
+        self.cache_hits += 1
+        return row[0]
+
+    def flush(self):
+        """모아 둔 변환 결과와 사용 시각(오래 안 쓴 것부터 지울 때 쓰는 값)을 한 번에 저장"""
+        if not self._touched and not self._remembered:
+            return
+        remembered = [(url, product_id, at, at) for url, (product_id, at) in self._remembered.items()]
+        touched = [(used, url) for url, used in self._touched.items()]
+        self._remembered = {}
+        self._touched = {}
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO short_links (url, product_id, resolved_at, last_used) VALUES (?, ?, ?, ?)',
+            remembered,
+        )
+        self.conn.executemany('UPDATE short_links SET last_used = ? WHERE url = ?', touched)
+        self.conn.commit()
+
+    def remember(self, url, product_id):
+        """변환 결과 기록 (flush 때 저장, 메모리에서 센 개수가 상한을 넘을 때만 정리)"""
+        now = time.time()
+        self._remembered[url] = (product_id, now)
+        self._touched.pop(url, None)
+        self._entries += 1  # 덮어쓴 경우도 세므로 실제보다 많을 수 있음 → 넘으면 정확히 다시 셈
+        if self._entries > self.max_entries:
+            self.evict(now)
+
+    def evict(self, now=None):
+        """개수가 넘으면 만료된 것, 오래 안 쓴 것 순서로 삭제"""
+        now = now or time.time()
+        self.flush()  # 최근 사용 시각을 반영한 뒤에 고름
+        total = self.conn.execute('SELECT COUNT(*) FROM short_links').fetchone()[0]
+        removed = 0
+        if total > self.max_entries:
+            removed = self.conn.execute('DELETE FROM short_links WHERE resolved_at < ?', (now - self.ttl,)).rowcount
+            overflow = total - removed - self.max_entries
+            if overflow > 0:
+                removed += self.conn.execute(
+                    'DELETE FROM short_links WHERE url IN '
+                    '(SELECT url FROM short_links ORDER BY last_used LIMIT ?)', (overflow,),
+                ).rowcount
+            self.evicted += removed
+            self.conn.commit()
+        self._entries = total - removed
+
+    async def follow(self, session, url):
+        """Location 헤더만 따라가서 상품 ID 찾기 (본문은 리디렉션이 없을 때 앞부분만 확인)"""
+        current = url
+        for _hop in range(MAX_REDIRECTS):
+            product_id = product_id_from_url(current)
+            if product_id:
+                return product_id
+            async with session.get(site_url(current), allow_redirects=False, timeout=self.timeout) as response:
+                location = response.headers.get('Location')
+                if response.status in (301, 302, 303, 307, 308) and location:
+                    current = urljoin(current, location)
+                    continue
+                if response.status != 200:
+                    return None
+                # 자바스크립트/메타 리디렉션이면 본문 앞부분에 주소가 있는 경우가 많음
+                body = await response.content.read(BODY_SCAN_BYTES)
+            target = redirect_target_in_body(body.decode('utf-8', errors='ignore'))
+            if target is None:
+                return None  # 브라우저로 열어서 확인
+            current = urljoin(current, target)
+        return product_id_from_url(current)
+
+    async def resolve(self, url, session=None):
+        """단축 링크 → 상품 ID (캐시 → HTTP 순서, 못 찾으면 None)"""
+        if not is_short_link(url):
+            return product_id_from_url(url)
+        cached = self.lookup(url)
+        if cached is not None:
+            return cached
+        try:
+            if session is None:
+                async with aiohttp.ClientSession() as own_session:
+                    product_id = await self.follow(own_session, url)
+            else:
+                product_id = await self.follow(session, url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"🔗 단축 링크 변환 실패 ({url}): {e}")
+            product_id = None
+        if product_id is None:
+            self.unresolved += 1
+            return None
+        self.http_resolved += 1
+        self.remember(url, product_id)
+        return product_id
+
+    async def resolve_many(self, urls, session=None, concurrency=RESOLVE_CONCURRENCY):
+        """여러 링크를 동시에 변환 (같은 링크는 한 번만) - URL → 상품 ID 또는 None"""
+        unique = list(dict.fromkeys(urls))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(url, session):
+            async with semaphore:
+                return url, await self.resolve(url, session)
+
+        try:
+            if session is None:
+                connector = aiohttp.TCPConnector(limit=concurrency)
+                async with aiohttp.ClientSession(connector=connector) as own_session:
+                    resolved = await asyncio.gather(*(run(url, own_session) for url in unique))
+            else:
+                resolved = await asyncio.gather(*(run(url, session) for url in unique))
+        finally:
+            self.flush()  # 변환 결과와 캐시 적중 사용 시각은 여기서 한 번만 커밋
+        return dict(resolved)
+
+    def summary(self):
+        return {
+            'cache_hits': self.cache_hits,
+            'http_resolved': self.http_resolved,
+            'unresolved': self.unresolved,
+            'evicted': self.evicted,
+        }
+
+    def print_summary(self):
+        stats = self.summary()
+        print(f"🔗 단축 링크: 캐시 {stats['cache_hits']}개, HTTP 변환 {stats['http_resolved']}개, "
+              f"실패 {stats['unresolved']}개 (브라우저로 처리), 캐시 정리 {stats['evicted']}개")
+
+    def close(self):
+        self.flush()
+        self.conn.close()
@@ -1,88 +1,350 @@
 import asyncio
 import json
+import re
+import sys
 from pathlib import Path
 from playwright.async_api import async_playwright
 
-async def complete_crawl(product_url):
-    """리뷰 텍스트 크롤링"""
+sys.path.append(str(Path(__file__).resolve().parent.parent))  # 공통 모듈(common) 경로
+from common.blocking import BlockingPolicy, PageTraffic, install_route_blocking
+from common.metrics import (
+    STAGE_BROWSER_LAUNCH, STAGE_EXTRACTION, STAGE_FILE_WRITE, STAGE_NAVIGATION, RunMetrics, count, timed,
+)
+from common.readiness import ReadinessTracker, wait_for_selector
+from common.replay import install_replay_routing
+from common.scroll import format_scroll_stats, scroll_until_idle
+from common.watermarks import WatermarkStore
+from common.writers import JsonlStreamWriter, partition_path
+from zigzag_api import capture_reviews_from_api, review_key  # 리뷰 API 응답 수집
+
+REVIEW_CONTAINER_SELECTOR = "div.css-1j47pg4.eimmef70"
+SCROLL_QUIET_SEC = 1.0  # 스크롤 후 이 시간 안에 새 리뷰가 없으면 끝으로 판단
+SCROLL_MAX_ITEMS = None  # 리뷰 몇 개까지 불러올지 (None 이면 끝까지)
+SCROLL_TIME_BUDGET_SEC = 60  # 상품 하나에 쓸 최대 스크롤 시간
+BLOCK_RESOURCES = True  # 리뷰 텍스트만 읽으므로 이미지/폰트/광고 요청 차단
+CAPTURE_MODE = 'api'  # 'api': 리뷰 API 응답에서 읽기, 'dom': 화면에서 읽기
+INCREMENTAL = False  # True: 이미 본 리뷰에서 멈추고 새 리뷰만 저장 (워터마크: data/watermarks.sqlite3)
+WATERMARK_SCOPE = 'zigzag_reviews'
+OUTPUT_MODE = 'json'  # 'json': data/review-data.json 하나에 저장, 'jsonl': 리뷰마다 한 줄씩 바로 기록 (상품별 파일)
+REVIEW_OUTPUT_DIR = 'data/reviews'  # jsonl 출력 폴더
+OUTPUT_PARTITION = 'date'  # 'date': REVIEW_OUTPUT_DIR/dt=날짜/상품ID.jsonl, None: REVIEW_OUTPUT_DIR/상품ID.jsonl
+EXTRACT_BATCH_SIZE = 200  # 화면에서 한 번에 꺼내는 리뷰 수 (리뷰가 수천 개여도 메모리 일정)
+
+# jsonl 출력 열 (원문 innerText 대신 나눠 둔 필드만)
+REVIEW_COLUMNS = ['product_id', 'id', 'rating', 'option', 'size', 'date', 'body', 'images']
+
+# 리뷰 영역 하나의 텍스트를 별점/옵션/사이즈/작성일/본문으로 나누기 (브라우저 안에서)
+# - 별점은 aria-label/title("별점 5점") 이 있으면 그것부터, 없으면 "별점 4" 같은 줄
+# - 작성일은 "2024.05.12", "24.05.12", "2024-05-12" 로 시작하는 짧은 줄 → "2024-05-12"
+# - "구매옵션: 블랙 / M", "옵션 블랙/M", "사이즈 정사이즈예요" 같은 줄은 옵션/사이즈로
+# - 나머지 줄은 본문
+PARSE_REVIEW_FUNCTION = r'''
+    function parseReview(container, id) {
+        const text = container.innerText || "";
+        if (text.length <= 10) return null;
+        const review = {id: id, text: text, rating: null, option: null, size: null, date: null, body: ""};
+        const rated = container.querySelector('[aria-label*="별점"], [aria-label*="점 만점"], [title*="별점"]');
+        if (rated) {
+            const label = rated.getAttribute("aria-label") || rated.getAttribute("title") || "";
+            const m = label.match(/([0-5](?:\.\d)?)\s*점/);
+            if (m) review.rating = parseFloat(m[1]);
+        }
+        const body = [];
+        for (const raw of text.split("\n")) {
+            const line = raw.trim();
+            if (!line) continue;
+            let m;
+            if (review.date === null && line.length <= 30
+                    && (m = line.match(/^(\d{4}|\d{2})[.\-\/]\s?(\d{1,2})[.\-\/]\s?(\d{1,2})/))) {
+                const year = m[1].length === 2 ? "20" + m[1] : m[1];
+                review.date = `${year}-${m[2].padStart(2, "0")}-${m[3].padStart(2, "0")}`;
+            } else if (review.option === null && (m = line.match(/^(?:구매\s*)?옵션\s*[:：]?\s*(.+)$/))) {
+                review.option = m[1].trim();
+            } else if (review.size === null && (m = line.match(/^(?:사이즈|size)\s*[:：]?\s*(.+)$/i))) {
+                review.size = m[1].trim();
+            } else if (review.rating === null && (m = line.match(/^(?:별점|평점)\s*[:：]?\s*([0-5](?:\.\d)?)/))) {
+                review.rating = parseFloat(m[1]);
+            } else {
+                body.push(line);
+            }
+        }
+        review.body = body.join("\n");
+        return review;
+    }
+'''
+
+# start 번째부터 limit 개 리뷰 영역을 나눈 필드로 (id 는 전체 순번)
+REVIEW_PARSE_JS = '''(args) => {''' + PARSE_REVIEW_FUNCTION + '''
+    const reviews = [];
+    const containers = Array.from(document.querySelectorAll(args.selector)).slice(args.start, args.start + args.limit);
+    containers.forEach((container, offset) => {
+        const review = parseReview(container, args.start + offset + 1);
+        if (review) reviews.push(review);
+    });
+    return reviews;
+}'''
+
+# start 번째부터의 리뷰 영역 텍스트 (스크롤로 새로 붙은 것만)
+REVIEW_TEXTS_FROM_JS = '''(args) => Array.from(
+    document.querySelectorAll(args.selector), (el) => el.innerText || ""
+).slice(args.start)'''
+
+def seen_reviews_in_page(selector, watermark):
+    """화면에 이미 본 리뷰가 나왔는지 확인하는 scroll_until_idle 의 until 함수 (새로 붙은 리뷰만 확인)"""
+    checked = 0
+    
+    async def until(page, state):
+        nonlocal checked
+        texts = await page.evaluate(REVIEW_TEXTS_FROM_JS, {'selector': selector, 'start': checked})
+        checked += len(texts)
+        return any(watermark.should_stop(review_key({'text': text}, by_id=False))
+                   for text in texts if len(text) > 10)
+    return until
+
+def review_row(product_id, review):
+    """jsonl 한 줄 (API 리뷰는 text 가 곧 본문)"""
+    return {
+        'product_id': product_id,
+        'id': review['id'],
+        'rating': review.get('rating'),
+        'option': review.get('option'),
+        'size': review.get('size'),
+        'date': review.get('date'),
+        'body': review['body'] if 'body' in review else review.get('text'),
+        'images': review.get('images', []),
+    }
+
+class ReviewSink:
+    """상품 하나의 리뷰를 받는 곳 (writer 가 있으면 한 줄씩 바로 기록, 없으면 목록으로 모음)
+    
+    watermark 가 있으면 이미 본 리뷰는 빼고, 워터마크에 남길 키와 최신 작성일은 따로 모음
+    """
+    
+    def __init__(self, product_id, writer=None, watermark=None):
+        self.product_id = product_id
+        self.writer = writer
+        self.watermark = watermark
+        self.by_id = True  # API 리뷰는 ID, 화면 리뷰는 내용 해시로 구분
+        self.reviews = []
+        self.keys = []
+        self.newest_date = None
+        self.received = 0
+        self.written = 0
+        self.seen = 0
+    
+    def add(self, review):
+        self.received += 1
+        if self.watermark is not None:
+            key = review_key(review, self.by_id)
+            self.keys.append(key)
+            date = review.get('date')
+            if date and (self.newest_date is None or date > self.newest_date):
+                self.newest_date = date
+            if self.watermark.seen(key):
+                self.seen += 1
+                return
+        if self.writer is not None:
+            self.writer.write(review_row(self.product_id, review))
+        else:
+            self.reviews.append(review)
+        self.written += 1
+
+async def extract_reviews_in_batches(page, selector, on_review, batch_size=EXTRACT_BATCH_SIZE):
+    """화면의 리뷰를 batch_size 개씩 나눈 필드로 꺼내서 on_review 로 넘김 (꺼낸 리뷰 수 반환)"""
+    total = await page.evaluate('(selector) => document.querySelectorAll(selector).length', selector)
+    extracted = 0
+    for start in range(0, total, batch_size):
+        reviews = await page.evaluate(REVIEW_PARSE_JS, {'selector': selector, 'start': start, 'limit': batch_size})
+        for review in reviews:
+            on_review(review)
+        extracted += len(reviews)
+    return extracted
+
+async def scrape_reviews_from_dom(page, review_url, tracker=None, metrics=None, until=None, on_review=None):
+    """화면(DOM)에서 리뷰 읽기 (스크롤해서 더 불러온 뒤 리뷰 영역을 별점/옵션/작성일/본문으로 나눠서 추출)
+    
+    until 이 참이 되면(이미 본 리뷰에 도달) 스크롤을 멈춤
+    on_review 를 주면 리뷰를 꺼내는 대로 넘기고 모으지 않음 (반환 목록은 비어 있음)
+    (리뷰 목록, 스크롤 통계) 반환
+    """
+    with timed(metrics, STAGE_NAVIGATION):
+        await page.goto(review_url, wait_until='domcontentloaded')
+    count(metrics, 'pages')
+    await wait_for_selector(page, 'review_list', REVIEW_CONTAINER_SELECTOR, tracker=tracker)
+    
+    print("📜 스크롤하여 모든 리뷰 로드...")
+    # 새 리뷰가 더 붙지 않을 때까지만 스크롤
+    scroll_stats = await scroll_until_idle(
+        page, REVIEW_CONTAINER_SELECTOR, quiet_window=SCROLL_QUIET_SEC,
+        max_items=SCROLL_MAX_ITEMS, time_budget=SCROLL_TIME_BUDGET_SEC, tracker=tracker, until=until,
+    )
+    count(metrics, 'scrolls', scroll_stats['scrolls'])
+    print(format_scroll_stats(scroll_stats))
+    
+    print("🔍 리뷰 데이터 추출 중...")
+    review_data = []
+    with timed(metrics, STAGE_EXTRACTION):
+        await extract_reviews_in_batches(page, REVIEW_CONTAINER_SELECTOR,
+                                         on_review if on_review is not None else review_data.append)
+    return review_data, scroll_stats
+
+async def crawl_product_reviews(page, product_url, tracker=None, metrics=None, mode=CAPTURE_MODE, watermarks=None,
+                                output_dir=None, partition=OUTPUT_PARTITION):
+    """이미 열린 페이지로 상품 하나의 리뷰 수집 ({product_id, reviews, reviewCount, scroll, incremental, output} 반환)
+    
+    output_dir 가 있으면 리뷰를 받는 대로 output_dir(/dt=날짜)/상품ID.jsonl 에 한 줄씩 기록하고
+    reviews 는 빈 목록으로 돌려줌 (리뷰가 수천 개여도 메모리 일정), 없으면 파일 저장 없이 목록으로
+    watermarks(WatermarkStore) 를 주면 이미 본 리뷰에서 멈추고 새 리뷰만 돌려줌
+    (워터마크는 결과를 저장한 뒤 watermarks.commit() 해야 반영됨)
+    """
+    # 상품 ID 추출
+    match = re.search(r'products/(\d+)', product_url)
+    if not match:
+        raise Exception("상품 ID를 찾을 수 없습니다")
+    
+    product_id = match.group(1)
+    review_url = f"https://zigzag.kr/review/list/{product_id}"
+    
+    print(f"📦 상품 ID: {product_id}")
+    print("📄 리뷰 페이지 접속...")
+    watermark = watermarks.load(WATERMARK_SCOPE, product_id) if watermarks is not None else None
+    writer = None
+    if output_dir is not None:
+        # 증분이면 같은 파일(같은 날)에 이어 쓰고, 아니면 새로 씀
+        writer = JsonlStreamWriter(partition_path(output_dir, product_id, partition), REVIEW_COLUMNS,
+                                   append=watermark is not None)
+    sink = ReviewSink(product_id, writer, watermark)
+    scroll_stats = None  # 멈춘 이유가 든 요약 (API 면 capture_reviews_from_api, 화면이면 scroll_until_idle)
+    try:
+        if mode == 'api':
+            # 리뷰 API 응답에서 바로 읽기 (내용/별점/옵션/작성일/이미지)
+            stop_at = (lambda review: watermark.should_stop(review_key(review))) if watermark is not None else None
+            _reviews, scroll_stats = await capture_reviews_from_api(page, review_url, tracker, metrics,
+                                                                    stop_at=stop_at, on_review=sink.add)
+            count(metrics, 'pages')
+            if not sink.received:
+                print("🤔 리뷰 API 응답을 찾지 못했습니다. 화면에서 다시 읽을게요...")
+        if not sink.received:
+            sink.by_id = False
+            until = seen_reviews_in_page(REVIEW_CONTAINER_SELECTOR, watermark) if watermark is not None else None
+            _reviews, scroll_stats = await scrape_reviews_from_dom(page, review_url, tracker, metrics, until,
+                                                                   on_review=sink.add)
+    finally:
+        if writer is not None:
+            with timed(metrics, STAGE_FILE_WRITE):
+                writer.close()
+    
+    incremental = None
+    if watermark is not None:
+        watermarks.stage(watermark, sink.keys, sink.newest_date, sink.written, sink.seen)
+        incremental = watermark.summary(sink.written, sink.seen)
+        count(metrics, 'reviews_seen', sink.seen)
+        print(f"🔖 새 리뷰 {sink.written}개 (이미 본 리뷰 {sink.seen}개 제외"
+              f"{', 이미 본 리뷰에서 멈춤' if watermark.caught_up else ''})")
+    return {
+        'product_id': product_id,
+        'reviews': sink.reviews,
+        'reviewCount': sink.written,
+        'scroll': scroll_stats,
+        'incremental': incremental,
+        'output': writer.path if writer is not None else None,
+    }
+
+async def complete_crawl(product_url, metrics_path=None, prometheus_path=None, block_resources=BLOCK_RESOURCES,
+                         mode=CAPTURE_MODE, incremental=INCREMENTAL, output_mode=OUTPUT_MODE):
+    """리뷰 텍스트 크롤링 (단계별 시간 요약은 data/metrics/ 에 저장)
+    
+    mode='api' 이면 리뷰 API 응답에서 읽고 (응답이 없으면 화면에서), 'dom' 이면 화면에서 읽음
+    incremental=True 면 지난번에 본 리뷰에서 멈추고 새 리뷰만 저장
+    output_mode='jsonl' 이면 리뷰마다 한 줄씩 REVIEW_OUTPUT_DIR 아래 상품별 파일에 바로 기록
+    """
+    if output_mode not in ('json', 'jsonl'):
+        raise ValueError(f"지원하지 않는 출력 방식: {output_mode} ('json', 'jsonl' 중 선택)")
+    metrics = RunMetrics('zigzag_text')  # 단계별 시간/카운터
+    blocking = BlockingPolicy() if block_resources else None
+    traffic = PageTraffic()  # 페이지 전송량 (차단 켬/끔 비교용)
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+        with timed(metrics, STAGE_BROWSER_LAUNCH):
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+            await install_replay_routing(page.context)  # 재생 모드일 때만 (차단 규칙보다 먼저)
+            if blocking is not None:
+                await install_route_blocking(page, blocking)
+            traffic.attach(page)
+        tracker = ReadinessTracker(metrics)  # 단계별 실제 대기 시간
+        watermarks = WatermarkStore() if incremental else None
         
         try:
             print("🐛🐛🐛 지그재그 리뷰 크롤링 시작...")
+            output_dir = REVIEW_OUTPUT_DIR if output_mode == 'jsonl' else None
+            crawled = await crawl_product_reviews(page, product_url, tracker, metrics, mode, watermarks, output_dir)
+            product_id = crawled['product_id']
+            review_data = crawled['reviews']
+            review_count = crawled['reviewCount']
+            scroll_stats = crawled['scroll']
+            count(metrics, 'reviews', review_count)
             
-            # 상품 ID 추출
-            import re
-            match = re.search(r'products/(\d+)', product_url)
-            if not match:
-                raise Exception("상품 ID를 찾을 수 없습니다")
-            
-            product_id = match.group(1)
-            review_url = f"https://zigzag.kr/review/list/{product_id}"
-            
-            print(f"📦 상품 ID: {product_id}")
-            print("📄 리뷰 페이지 접속...")
-            await page.goto(review_url, wait_until='networkidle')
+            print(f"📝 발견된 리뷰: {review_count}개")
             
-            print("📜 스크롤하여 모든 리뷰 로드...")
-            for i in range(5):
-                await page.evaluate('() => window.scrollBy(0, window.innerHeight)')
-                await asyncio.sleep(1)
-            
-            print("🔍 리뷰 데이터 추출 중...")
-            review_data = await page.evaluate('''() => {
-                const reviews = [];
-                const containers = document.querySelectorAll("div.css-1j47pg4.eimmef70");
-                
-                containers.forEach((container, index) => {
-                    const text = container.innerText || "";
-                    if (text.length > 10) {
-                        reviews.push({
-                            id: index + 1,
-                            text: text
-                        });
-                    }
-                });
+            if output_dir is not None:
+                output_path = crawled['output']  # 수집하면서 이미 기록함
+            else:
+                # JSON 파일로 저장
+                output_path = "data/review-data.json"
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
                 
-                return reviews;
-            }''')
-            
-            print(f"📝 발견된 리뷰: {len(review_data)}개")
-            
-            # JSON 파일로 저장
-            output_path = "data/review-data.json"
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(review_data, f, ensure_ascii=False, indent=2)
+                with timed(metrics, STAGE_FILE_WRITE):
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        json.dump(review_data, f, ensure_ascii=False, indent=2)
             
             print(f"💾 리뷰 데이터 저장 완료: {output_path}")
+            if watermarks is not None:
+                watermarks.commit(product_id, scroll_stats)  # 저장한 뒤에 워터마크 반영
             
             print("\n🎉 크롤링 완료!")
             print(f"📊 결과 요약:")
             print(f"   - 상품 ID: {product_id}")
-            print(f"   - 리뷰 개수: {len(review_data)}개")
+            print(f"   - 리뷰 개수: {review_count}개")
             print(f"   - 데이터 파일: {output_path}")
+            tracker.print_summary()
             
             # 첫 번째 리뷰 샘플 출력
             if review_data:
+                sample = review_data[0]
                 print(f"\n📝 첫 번째 리뷰 샘플:")
-                print(f"ID: {review_data[0]['id']}")
-                print(f"텍스트: {review_data[0]['text'][:150]}...")
+                print(f"ID: {sample['id']}")
+                print(f"별점: {sample.get('rating')} / 옵션: {sample.get('option')} / 작성일: {sample.get('date')}")
+                print(f"텍스트: {(sample.get('body') or sample.get('text') or '')[:150]}...")
             
             return {
                 'success': True,
                 'product_id': product_id,
-                'reviewCount': len(review_data),
-                'reviews': review_data
+                'reviewCount': review_count,
+                'reviews': review_data,
+                'output': output_path,
+                'scroll': scroll_stats,
+                'incremental': crawled['incremental'],
+                'waits': tracker.summary(),
+                'metrics': metrics.summary()
             }
             
         except Exception as e:
+            count(metrics, 'failures')
             print(f"❌ 오류 발생: {e}")
             raise e
         finally:
+            count(metrics, 'bytes_transferred', await traffic.settle())
+            count(metrics, 'requests', traffic.requests)
+            if blocking is not None:
+                count(metrics, 'requests_blocked', blocking.blocked_total)
+            if watermarks is not None:
+                watermarks.close()
             await browser.close()
+            metrics.report(metrics_path, prometheus_path, extra={
+                'product_url': product_url,
+                'block_resources': block_resources,
+                'waits': tracker.summary(),
+            })
 
 async def main():
     """메인 함수"""